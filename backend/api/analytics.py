@@ -0,0 +1,371 @@
+# Standard library imports
+from datetime import date, timedelta
+
+# Django imports
+from django.db.models import Count, IntegerField, Sum, Value
+from django.db.models.functions import TruncMonth, TruncWeek, TruncYear
+from django.utils import timezone
+
+# Django REST Framework imports
+from rest_framework.exceptions import ValidationError
+
+# Local imports
+from .models import HardwareIncident, SoftwareIncident, IncidentDailyRollup
+
+UNSPECIFIED = 'Non spécifié'
+
+PERIOD_TRUNCS = {
+    'week': TruncWeek,
+    'month': TruncMonth,
+    'year': TruncYear,
+}
+
+MAINTENANCE_TYPES = ('preventive', 'corrective')
+
+# Pivot row dimension -> incident types that carry it. Partitions come from
+# the daily rollup, the software-only columns from the incident table.
+PIVOT_ROWS = {
+    'partition': ('hardware', 'software'),
+    'server': ('software',),
+    'nom_radar': ('software',),
+}
+
+PIVOT_LAYOUTS = ('compact', 'records')
+
+
+def parse_analytics_params(params):
+    """
+    Validate the dashboard query parameters.
+
+    ``year`` defaults to the current year, ``period`` to month; ``partition``
+    and ``maintenance_type`` (hardware only) are optional.
+    """
+    today = timezone.now().date()
+    try:
+        year = int(params.get('year') or today.year)
+    except ValueError:
+        raise ValidationError({'year': 'Année invalide'})
+    if not 1900 <= year <= 9999:
+        raise ValidationError({'year': 'Année invalide'})
+
+    period = params.get('period') or 'month'
+    if period not in PERIOD_TRUNCS:
+        raise ValidationError({'period': 'Période invalide. Valeurs possibles: week, month, year'})
+
+    maintenance_type = params.get('maintenance_type') or None
+    if maintenance_type is not None and maintenance_type not in MAINTENANCE_TYPES:
+        raise ValidationError({'maintenance_type': 'Type de maintenance invalide'})
+
+    return {
+        'year': year,
+        'period': period,
+        'partition': (params.get('partition') or '').strip() or None,
+        'maintenance_type': maintenance_type,
+    }
+
+
+def _year_range(year):
+    return date(year, 1, 1), date(year + 1, 1, 1)
+
+
+def _rollup(incident_type, filters):
+    """Rollup rows of one incident type within the selected year and partition"""
+    start, end = _year_range(filters['year'])
+    queryset = IncidentDailyRollup.objects.filter(
+        incident_type=incident_type, day__gte=start, day__lt=end
+    )
+    if filters['partition']:
+        queryset = queryset.filter(partition=filters['partition'])
+    if incident_type == 'hardware' and filters['maintenance_type']:
+        queryset = queryset.filter(maintenance_type=filters['maintenance_type'])
+    return queryset.order_by()
+
+
+def _incidents(model, filters):
+    """Raw incidents within the selected year and partition, for columns the rollup lacks"""
+    start, end = _year_range(filters['year'])
+    queryset = model.objects.filter(date__gte=start, date__lt=end)
+    if filters['partition']:
+        queryset = queryset.filter(partition=filters['partition'])
+    if model is HardwareIncident and filters['maintenance_type']:
+        queryset = queryset.filter(maintenance_type=filters['maintenance_type'])
+    return queryset.order_by()
+
+
+def _ranked(rows, limit=None):
+    """[(label, count)] -> [{'name', 'value'}] sorted by count, blanks grouped as unspecified"""
+    counts = {}
+    for label, count in rows:
+        label = label or UNSPECIFIED
+        counts[label] = counts.get(label, 0) + count
+    ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+    if limit is not None:
+        ranked = ranked[:limit]
+    return [{'name': name, 'value': value} for name, value in ranked]
+
+
+def available_years(filters, include_hardware=True, include_software=True):
+    """Years with at least one visible incident, most recent first"""
+    incident_types = [
+        incident_type for incident_type, included in
+        (('hardware', include_hardware), ('software', include_software)) if included
+    ]
+    years = (
+        IncidentDailyRollup.objects.filter(incident_type__in=incident_types)
+        .annotate(year=TruncYear('day')).values_list('year', flat=True).distinct().order_by('-year')
+    )
+    return [year.year for year in years]
+
+
+def summary(filters, include_hardware=True, include_software=True):
+    """Partition/server breakdowns, maintenance types and downtime counts for the year"""
+    data = {
+        'hardware_by_partition': [],
+        'software_by_server': [],
+        'maintenance_types': {maintenance_type: 0 for maintenance_type in MAINTENANCE_TYPES},
+        'hardware_incidents_with_downtime': 0,
+    }
+    if include_hardware:
+        rollup = _rollup('hardware', filters)
+        data['hardware_by_partition'] = _ranked(
+            rollup.values('partition').annotate(count=Sum('incident_count')).values_list('partition', 'count')
+        )
+        for maintenance_type, count in (
+            rollup.filter(maintenance_type__in=MAINTENANCE_TYPES)
+            .values('maintenance_type').annotate(count=Sum('incident_count'))
+            .values_list('maintenance_type', 'count')
+        ):
+            data['maintenance_types'][maintenance_type] = count
+        data['hardware_incidents_with_downtime'] = rollup.aggregate(total=Sum('downtime_count'))['total'] or 0
+    if include_software:
+        data['software_by_server'] = _ranked(
+            _incidents(SoftwareIncident, filters).exclude(server__isnull=True).exclude(server='')
+            .values('server').annotate(count=Count('id')).values_list('server', 'count')
+        )
+    return data
+
+
+def incidents_by_day(filters, days=30, include_hardware=True, include_software=True):
+    """Daily hardware/software counts over the last ``days`` days, gap-filled"""
+    today = timezone.now().date()
+    start = today - timedelta(days=days - 1)
+    counts = {}
+    for incident_type, included in (('hardware', include_hardware), ('software', include_software)):
+        if not included:
+            continue
+        rows = (
+            _rollup(incident_type, filters).filter(day__gte=start, day__lte=today)
+            .values('day').annotate(count=Sum('incident_count')).values_list('day', 'count')
+        )
+        for day, count in rows:
+            counts[(day, incident_type)] = count
+
+    series = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        hardware = counts.get((day, 'hardware'), 0)
+        software = counts.get((day, 'software'), 0)
+        series.append({'date': day, 'hardware': hardware, 'software': software, 'total': hardware + software})
+    return series
+
+
+def incidents_by_period(filters, period=None, include_hardware=True, include_software=True):
+    """Hardware/software counts per week, month or year (``period``), oldest first"""
+    trunc = PERIOD_TRUNCS[period or filters['period']]
+    periods = {}
+    for incident_type, included in (('hardware', include_hardware), ('software', include_software)):
+        if not included:
+            continue
+        rows = (
+            _rollup(incident_type, filters).annotate(period=trunc('day'))
+            .values('period').annotate(count=Sum('incident_count')).values_list('period', 'count')
+        )
+        for period_start, count in rows:
+            entry = periods.setdefault(period_start, {'period': period_start, 'hardware': 0, 'software': 0})
+            entry[incident_type] += count
+    return [
+        {**entry, 'total': entry['hardware'] + entry['software']}
+        for _, entry in sorted(periods.items())
+    ]
+
+
+def monthly_trend(filters, months=6, include_hardware=True, include_software=True):
+    """Last ``months`` months with incidents in the selected year"""
+    return incidents_by_period(
+        filters, period='month', include_hardware=include_hardware, include_software=include_software
+    )[-months:]
+
+
+def incidents_by_equipment(filters, limit=15, include_hardware=True, include_software=True):
+    """Hardware incident counts per equipment name, top ``limit``"""
+    if not include_hardware:
+        return []
+    return _ranked(
+        _incidents(HardwareIncident, filters)
+        .values('nom_de_equipement').annotate(count=Count('id'))
+        .values_list('nom_de_equipement', 'count'),
+        limit=limit
+    )
+
+
+def software_by_anomaly(filters, include_hardware=True, include_software=True):
+    """Software incident counts per anomaly type and period, plus totals per type"""
+    if not include_software:
+        return {'chart_data': [], 'anomaly_types': [], 'anomaly_counts': []}
+    trunc = PERIOD_TRUNCS[filters['period']]
+    rows = (
+        _incidents(SoftwareIncident, filters).annotate(period=trunc('date'))
+        .values('type_d_anomalie', 'period').annotate(count=Count('id'))
+        .values_list('type_d_anomalie', 'period', 'count')
+    )
+    by_period = {}
+    totals = {}
+    for anomaly_type, period_start, count in rows:
+        anomaly_type = anomaly_type or UNSPECIFIED
+        entry = by_period.setdefault(period_start, {})
+        entry[anomaly_type] = entry.get(anomaly_type, 0) + count
+        totals[anomaly_type] = totals.get(anomaly_type, 0) + count
+
+    anomaly_types = sorted(totals)
+    return {
+        'chart_data': [
+            {'period': period_start, **{
+                anomaly_type: counts.get(anomaly_type, 0) for anomaly_type in anomaly_types
+            }}
+            for period_start, counts in sorted(by_period.items())
+        ],
+        'anomaly_types': anomaly_types,
+        'anomaly_counts': [
+            {'type': anomaly_type, 'total': total}
+            for anomaly_type, total in sorted(totals.items(), key=lambda item: (-item[1], item[0]))
+        ],
+    }
+
+
+def corrective_by_year(filters, include_hardware=True, include_software=True):
+    """Corrective hardware incidents per year, across all years"""
+    if not include_hardware:
+        return []
+    rollup = IncidentDailyRollup.objects.filter(incident_type='hardware', maintenance_type='corrective')
+    if filters['partition']:
+        rollup = rollup.filter(partition=filters['partition'])
+    rows = (
+        rollup.annotate(year=TruncYear('day')).values('year').annotate(count=Sum('incident_count'))
+        .order_by('year').values_list('year', 'count')
+    )
+    return [{'year': year.year, 'count': count} for year, count in rows]
+
+
+def corrective_by_partition(filters, limit=15, include_hardware=True, include_software=True):
+    """Corrective hardware incidents per partition, across all years, top ``limit``"""
+    if not include_hardware:
+        return []
+    ranked = _ranked(
+        IncidentDailyRollup.objects.filter(incident_type='hardware', maintenance_type='corrective')
+        .values('partition').annotate(count=Sum('incident_count')).order_by()
+        .values_list('partition', 'count'),
+        limit=limit
+    )
+    return [{'server': row['name'], 'count': row['value']} for row in ranked]
+
+
+def parse_pivot_params(params):
+    """Validate the pivot-only parameters (``rows``, ``layout``, ``incident_type``)"""
+    rows = params.get('rows') or 'partition'
+    if rows not in PIVOT_ROWS:
+        raise ValidationError({'rows': f'Dimension invalide. Valeurs possibles: {", ".join(PIVOT_ROWS)}'})
+    layout = params.get('layout') or 'compact'
+    if layout not in PIVOT_LAYOUTS:
+        raise ValidationError({'layout': 'Format invalide. Valeurs possibles: compact, records'})
+    incident_type = params.get('incident_type') or None
+    if incident_type not in (None, 'hardware', 'software'):
+        raise ValidationError({'incident_type': 'Type invalide. Valeurs possibles: hardware, software'})
+    return {'rows': rows, 'layout': layout, 'incident_type': incident_type}
+
+
+def _pivot_cells(filters, options, incident_types):
+    """(row label, month, count, downtime) for every non-empty cell"""
+    if options['rows'] == 'partition':
+        # One grouped query on the rollup covers both incident types
+        start, end = _year_range(filters['year'])
+        rollup = IncidentDailyRollup.objects.filter(
+            incident_type__in=incident_types, day__gte=start, day__lt=end
+        )
+        if filters['partition']:
+            rollup = rollup.filter(partition=filters['partition'])
+        if filters['maintenance_type']:
+            rollup = rollup.filter(maintenance_type=filters['maintenance_type'])
+        return (
+            rollup.annotate(month=TruncMonth('day')).values('partition', 'month')
+            .annotate(count=Sum('incident_count'), downtime=Sum('downtime_minutes'))
+            .order_by().values_list('partition', 'month', 'count', 'downtime')
+        )
+
+    if 'software' not in incident_types:
+        return []
+    return (
+        _incidents(SoftwareIncident, filters).annotate(month=TruncMonth('date'))
+        .values(options['rows'], 'month')
+        .annotate(count=Count('id'), downtime=Value(0, output_field=IntegerField()))
+        .order_by().values_list(options['rows'], 'month', 'count', 'downtime')
+    )
+
+
+def incident_pivot(filters, options, include_hardware=True, include_software=True):
+    """
+    Row dimension x month matrix of incident counts and downtime for one year.
+
+    The ``compact`` layout returns row and column labels with 2-D arrays
+    (rows x 12 months) plus totals; ``records`` returns one object per
+    non-empty cell. A ``maintenance_type`` filter only counts hardware
+    incidents.
+    """
+    incident_types = [
+        incident_type for incident_type, included in
+        (('hardware', include_hardware), ('software', include_software))
+        if included and incident_type in PIVOT_ROWS[options['rows']]
+        and options['incident_type'] in (None, incident_type)
+        # Software incidents have no maintenance type: the filter excludes them
+        and not (incident_type == 'software' and filters['maintenance_type'])
+    ]
+    cells = list(_pivot_cells(filters, options, incident_types)) if incident_types else []
+
+    if options['layout'] == 'records':
+        records = {}
+        for label, month, count, downtime in cells:
+            key = (label or UNSPECIFIED, month)
+            record = records.setdefault(key, {
+                'row': key[0], 'month': month.strftime('%Y-%m'), 'count': 0, 'downtime_minutes': 0
+            })
+            record['count'] += count
+            record['downtime_minutes'] += downtime or 0
+        return {'results': [records[key] for key in sorted(records)]}
+
+    columns = [date(filters['year'], month, 1) for month in range(1, 13)]
+    row_labels = sorted({label or UNSPECIFIED for label, _, _, _ in cells})
+    row_index = {label: index for index, label in enumerate(row_labels)}
+    counts = [[0] * 12 for _ in row_labels]
+    downtime_minutes = [[0] * 12 for _ in row_labels]
+    for label, month, count, downtime in cells:
+        row = row_index[label or UNSPECIFIED]
+        counts[row][month.month - 1] += count
+        downtime_minutes[row][month.month - 1] += downtime or 0
+
+    return {
+        'rows': row_labels,
+        'columns': [column.strftime('%Y-%m') for column in columns],
+        'count': counts,
+        'downtime_minutes': downtime_minutes,
+        'row_totals': {
+            'count': [sum(row) for row in counts],
+            'downtime_minutes': [sum(row) for row in downtime_minutes],
+        },
+        'column_totals': {
+            'count': [sum(column) for column in zip(*counts)] if counts else [0] * 12,
+            'downtime_minutes': [sum(column) for column in zip(*downtime_minutes)] if counts else [0] * 12,
+        },
+        'total': {
+            'count': sum(map(sum, counts)),
+            'downtime_minutes': sum(map(sum, downtime_minutes)),
+        },
+    }
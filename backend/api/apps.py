@@ -7,3 +7,6 @@ class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
 
+    def ready(self):
+        # Register signal handlers
+        from . import signals  # noqa: F401
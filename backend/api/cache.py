@@ -0,0 +1,96 @@
+# Standard library imports
+import hashlib
+import time
+from urllib.parse import urlencode
+
+# Django imports
+from django.conf import settings
+from django.core.cache import caches
+
+# Django REST Framework imports
+from rest_framework.response import Response
+
+CACHE_HEADER = 'X-Cache'
+
+
+def get_cache():
+    return caches[getattr(settings, 'API_CACHE_ALIAS', 'default')]
+
+
+def _generation_key(model):
+    return f'api:generation:{model._meta.label_lower}'
+
+
+def get_generations(models):
+    """
+    Current generation of each model's data, in one cache round trip.
+
+    A missing generation (first use, eviction) is seeded with the current
+    time so that it can never match a generation used by older entries.
+    """
+    cache = get_cache()
+    keys = [_generation_key(model) for model in models]
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            cache.add(key, time.time_ns(), None)
+            generations[key] = cache.get(key)
+    return [generations[key] for key in keys]
+
+
+def bump_generation(model):
+    """Invalidate every cached response built from ``model`` rows"""
+    cache = get_cache()
+    key = _generation_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def canonical_query(params):
+    """
+    ``params`` (a dict or QueryDict) encoded in sorted order.
+
+    Parameters sent in a different order share a cache entry, and the
+    warmer (api.warmup) can build the keys of the requests it precomputes.
+    """
+    items = params.lists() if hasattr(params, 'lists') else params.items()
+    return urlencode(sorted(items), doseq=True)
+
+
+def cache_key(name, role, query_string, models):
+    """
+    Key of a cached response for a role and query string.
+
+    The key embeds the generation of every model the response is built
+    from, so a write to any of them (see api.signals) makes the entry
+    unreachable instead of having to delete it.
+    """
+    generations = '.'.join(str(generation) for generation in get_generations(models))
+    query = hashlib.md5(query_string.encode('utf-8')).hexdigest()
+    return f'api:{name}:{role}:{generations}:{query}'
+
+
+def get_or_build(name, role, query_string, models, build, refresh=False):
+    """Return ``(data, hit)``, calling ``build()`` and storing its result on a miss"""
+    cache = get_cache()
+    key = cache_key(name, role, query_string, models)
+    if not refresh:
+        data = cache.get(key)
+        if data is not None:
+            return data, True
+
+    data = build()
+    cache.set(key, data, getattr(settings, 'API_CACHE_TIMEOUT', 300))
+    return data, False
+
+
+def cached_response(request, name, models, build):
+    """
+    Return ``build()`` wrapped in a Response, cached per role and query string.
+
+    The ``X-Cache`` header reports HIT or MISS.
+    """
+    data, hit = get_or_build(name, request.user.role, canonical_query(request.GET), models, build)
+    return Response(data, headers={CACHE_HEADER: 'HIT' if hit else 'MISS'})
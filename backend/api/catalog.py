@@ -0,0 +1,79 @@
+# Standard library imports
+import copy
+import threading
+
+# Django imports
+from django.db.models import Case, IntegerField, Subquery, Value, When
+from django.db.models.functions import Coalesce
+
+# Local imports
+from .models import DataVersion, Equipement, normalize_serial
+from .versions import get_versions, version_name
+
+
+def serial_versions(num_serie):
+    """
+    Every version of a serial, the one to link incidents to first.
+
+    That is the most recent 'actuel' version, else the most recent version
+    of any etat, in one query ordered by a CASE on etat.
+    """
+    return Equipement.objects.filter(serial_key=normalize_serial(num_serie)).annotate(
+        etat_rank=Case(When(etat='actuel', then=Value(0)), default=Value(1), output_field=IntegerField())
+    ).order_by('etat_rank', '-created_at', '-id')
+
+
+class EquipmentCatalog:
+    """
+    Per-process map of normalized serial -> equipment to link incidents to.
+
+    Entries are filled on demand with serial_versions() (unknown serials are
+    remembered too) and dropped as a whole when the Equipement DataVersion
+    moves, i.e. after any equipment write in any worker. A resolution costs
+    the version check; the first time a serial is seen, one query reads the
+    equipment and the version together (two for a serial without equipment).
+    Callers get their own copy of the cached instance, which threads share.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.version = None
+        self.entries = {}
+
+    def clear(self):
+        with self.lock:
+            self.version = None
+            self.entries = {}
+
+    def resolve(self, num_serie):
+        """The 'actuel' version of a serial, else its latest version, else None"""
+        serial_key = normalize_serial(num_serie)
+        if not serial_key:
+            return None
+        with self.lock:
+            known = serial_key in self.entries
+        if known:
+            version, = get_versions([Equipement])
+            with self.lock:
+                if version != self.version:
+                    self.version = version
+                    self.entries = {}
+                elif serial_key in self.entries:
+                    return copy.copy(self.entries[serial_key])
+
+        equipment = serial_versions(serial_key).annotate(data_version=Coalesce(Subquery(
+            DataVersion.objects.filter(name=version_name(Equipement)).values('version')
+        ), 0)).first()
+        if equipment is not None:
+            version = equipment.data_version
+        else:
+            version, = get_versions([Equipement])
+        with self.lock:
+            if version != self.version:
+                self.version = version
+                self.entries = {}
+            self.entries[serial_key] = equipment
+        return copy.copy(equipment)
+
+
+equipment_catalog = EquipmentCatalog()
@@ -0,0 +1,136 @@
+# Standard library imports
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+# Django imports
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, Count, DateTimeField, F, IntegerField, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+
+# Local imports
+from .models import Equipement, HardwareIncident
+
+COUNTERS = ('incident_count', 'corrective_count', 'total_downtime')
+COUNTER_FIELDS = (*COUNTERS, 'last_incident_at')
+
+
+def _instant(day, time):
+    # Same instant as api.versioning.incident_instant
+    if day is None or time is None:
+        return None
+    return datetime.combine(day, time, tzinfo=ZoneInfo(settings.TIME_ZONE))
+
+
+def _contribution(values):
+    """Equipment id, counter values and instant of one incident, or None when unlinked"""
+    if not values.get('equipement_id'):
+        return None
+    downtime = values.get('duree_arret') or 0
+    if downtime < 0:
+        downtime = 0
+    corrective = 1 if values.get('maintenance_type') == 'corrective' else 0
+    return values['equipement_id'], (1, corrective, downtime), _instant(values.get('date'), values.get('time'))
+
+
+def _latest_instant(equipment_id, using):
+    latest = (
+        HardwareIncident._base_manager.using(using).filter(equipement_id=equipment_id)
+        .order_by('-date', '-time').values_list('date', 'time').first()
+    )
+    return _instant(*latest) if latest else None
+
+
+def _apply(contribution, sign, using):
+    equipment_id, counts, instant = contribution
+    updates = {name: F(name) + sign * count for name, count in zip(COUNTERS, counts)}
+    if instant is not None:
+        if sign > 0:
+            latest = instant
+            keep = Q(last_incident_at__gte=instant)
+        else:
+            # The incident is already gone from the equipment in the database
+            latest = _latest_instant(equipment_id, using)
+            keep = Q(last_incident_at__gt=instant)
+        # A later incident recorded meanwhile keeps its timestamp
+        updates['last_incident_at'] = Case(
+            When(keep, then=F('last_incident_at')),
+            default=Value(latest, output_field=DateTimeField()),
+        )
+    Equipement.objects.using(using).filter(pk=equipment_id).update(**updates)
+
+
+def _current_values(instance):
+    # to_python: create() and assignments may hold strings (e.g. date='2026-03-02')
+    meta = instance._meta
+    return {name: meta.get_field(name).to_python(getattr(instance, name)) for name in type(instance).tracked_fields}
+
+
+def record_equipment_incident_saved(instance, created, using):
+    """
+    Move a hardware incident's counts from its previous equipment to the current one.
+
+    Reads ``instance._loaded_values`` (see api.rollup.load_previous_values),
+    so it must run before record_incident_saved() replaces them.
+    """
+    previous = None
+    if not created and getattr(instance, '_loaded_values', None):
+        previous = _contribution(instance._loaded_values)
+    current = _contribution(_current_values(instance))
+    if previous != current:
+        if previous is not None:
+            _apply(previous, -1, using)
+        if current is not None:
+            _apply(current, 1, using)
+
+
+def record_equipment_incident_deleted(instance, using):
+    values = getattr(instance, '_loaded_values', None) or _current_values(instance)
+    contribution = _contribution(values)
+    if contribution is not None:
+        _apply(contribution, -1, using)
+
+
+def counted_equipment(using='default'):
+    """Equipment annotated with the counter values recomputed from the incident table"""
+    incidents = HardwareIncident._base_manager.using(using).filter(equipement_id=OuterRef('pk')).order_by()
+    totals = incidents.values('equipement_id')
+    latest = incidents.order_by('-date', '-time')
+    return Equipement.objects.using(using).annotate(
+        actual_incident_count=Coalesce(Subquery(totals.annotate(total=Count('id')).values('total')), 0),
+        actual_corrective_count=Coalesce(Subquery(
+            totals.annotate(total=Count('id', filter=Q(maintenance_type='corrective'))).values('total')
+        ), 0),
+        actual_total_downtime=Coalesce(Subquery(
+            totals.annotate(total=Sum('duree_arret', filter=Q(duree_arret__gt=0))).values('total'),
+            output_field=IntegerField(),
+        ), 0),
+        latest_date=Subquery(latest.values('date')[:1]),
+        latest_time=Subquery(latest.values('time')[:1]),
+    )
+
+
+def reconcile_counters(using='default', dry_run=False):
+    """
+    Repair equipment counters that drifted from the incident table.
+
+    Returns the ids of the repaired equipment. Rows are rewritten with
+    bulk_update, which bypasses save() and the Equipement signals: counters
+    are not part of the equipment versions or the catalog.
+    """
+    repaired = []
+    with transaction.atomic(using=using):
+        for equipment in counted_equipment(using).order_by('id').iterator(chunk_size=1000):
+            actual = {
+                'incident_count': equipment.actual_incident_count,
+                'corrective_count': equipment.actual_corrective_count,
+                'total_downtime': equipment.actual_total_downtime,
+                'last_incident_at': _instant(equipment.latest_date, equipment.latest_time),
+            }
+            if any(getattr(equipment, name) != value for name, value in actual.items()):
+                for name, value in actual.items():
+                    setattr(equipment, name, value)
+                repaired.append(equipment)
+        if repaired and not dry_run:
+            Equipement.objects.using(using).bulk_update(repaired, COUNTER_FIELDS, batch_size=1000)
+    return [equipment.pk for equipment in repaired]
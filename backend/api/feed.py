@@ -0,0 +1,54 @@
+# Django imports
+from django.db.models import CharField, F, Value
+
+# Local imports
+from .models import HardwareIncident, SoftwareIncident
+from .search import RANK_FIELD
+from .serializers import HardwareIncidentSerializer, SoftwareIncidentSerializer
+
+# Common column set shared by both branches of the feed UNION ALL.
+# "incident_type" is the discriminator, "label" the equipment name or subject.
+FEED_COLUMNS = ('id', 'incident_type', 'date', 'time', 'partition', 'label', 'description', 'created_at')
+FEED_ORDERING = ('-created_at', '-id', '-incident_type')
+
+FEED_LABELS = {
+    'hardware': 'nom_de_equipement',
+    'software': 'sujet',
+}
+
+
+def project_feed(queryset, incident_type):
+    """Project an incident queryset onto the common feed columns (and the rank of search hits)"""
+    columns = FEED_COLUMNS
+    if RANK_FIELD in queryset.query.annotations:
+        columns += (RANK_FIELD,)
+    return queryset.order_by().annotate(
+        incident_type=Value(incident_type, output_field=CharField()),
+        label=F(FEED_LABELS[incident_type]),
+    ).values(*columns)
+
+
+def hydrate_feed(rows):
+    """
+    Serialize the full incidents behind a page of feed rows, keeping feed order.
+
+    Costs one primary-key lookup per incident type present in the page.
+    """
+    hardware_ids = [row['id'] for row in rows if row['incident_type'] == 'hardware']
+    software_ids = [row['id'] for row in rows if row['incident_type'] == 'software']
+
+    serialized = {}
+    if hardware_ids:
+        incidents = HardwareIncident.objects.select_related('equipement').in_bulk(hardware_ids)
+        for data in HardwareIncidentSerializer(list(incidents.values()), many=True).data:
+            serialized[('hardware', data['id'])] = data
+    if software_ids:
+        incidents = SoftwareIncident.objects.in_bulk(software_ids)
+        for data in SoftwareIncidentSerializer(list(incidents.values()), many=True).data:
+            serialized[('software', data['id'])] = data
+
+    return [
+        serialized[(row['incident_type'], row['id'])]
+        for row in rows
+        if (row['incident_type'], row['id']) in serialized
+    ]
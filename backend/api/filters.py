@@ -0,0 +1,86 @@
+# Django imports
+from django.db.models import Q
+from django.utils.dateparse import parse_date
+
+# Django REST Framework imports
+from rest_framework.exceptions import ValidationError
+
+# Local imports
+from .models import HardwareIncident, SoftwareIncident
+from .search import search_queryset
+
+BOOLEAN_VALUES = {'true': True, '1': True, 'false': False, '0': False}
+
+
+def _parse_date(name, value):
+    try:
+        parsed = parse_date(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValidationError({name: 'Date invalide. Format attendu: AAAA-MM-JJ'})
+    return parsed
+
+
+def _parse_bool(name, value):
+    try:
+        return BOOLEAN_VALUES[value.lower()]
+    except KeyError:
+        raise ValidationError({name: 'Valeur invalide. Utilisez "true" ou "false"'})
+
+
+def _parse_text(name, value):
+    return value.strip()
+
+
+def _downtime_condition(has_downtime):
+    if has_downtime:
+        return Q(duree_arret__gt=0)
+    return Q(duree_arret__isnull=True) | Q(duree_arret__lte=0)
+
+
+# Query parameter -> (parser, {model: lookup or condition builder}).
+# A condition builder returning None excludes the whole table.
+INCIDENT_FILTERS = {
+    'date_from': (_parse_date, {HardwareIncident: 'date__gte', SoftwareIncident: 'date__gte'}),
+    'date_to': (_parse_date, {HardwareIncident: 'date__lte', SoftwareIncident: 'date__lte'}),
+    'partition': (_parse_text, {HardwareIncident: 'partition', SoftwareIncident: 'partition'}),
+    'maintenance_type': (_parse_text, {HardwareIncident: 'maintenance_type'}),
+    'server': (_parse_text, {SoftwareIncident: 'server'}),
+    'type_d_anomalie': (_parse_text, {SoftwareIncident: 'type_d_anomalie'}),
+    'nom_radar': (_parse_text, {SoftwareIncident: 'nom_radar'}),
+    'simulateur': (_parse_bool, {SoftwareIncident: 'simulateur'}),
+    'salle_operationnelle': (_parse_bool, {SoftwareIncident: 'salle_operationnelle'}),
+    # Software incidents never record downtime
+    'has_downtime': (_parse_bool, {
+        HardwareIncident: _downtime_condition,
+        SoftwareIncident: lambda has_downtime: None if has_downtime else Q(),
+    }),
+}
+
+
+def filter_incidents(queryset, params):
+    """
+    Apply the incident filter query parameters to a hardware or software queryset.
+
+    Every filter becomes a plain WHERE clause on an indexed column. A filter
+    on a column the table does not have (e.g. ``server`` for hardware
+    incidents) excludes that table from the result. ``q`` runs a full-text
+    search (see api.search).
+    """
+    for name, (parser, lookups) in INCIDENT_FILTERS.items():
+        value = params.get(name)
+        if value is None or value == '':
+            continue
+        value = parser(name, value)
+        lookup = lookups.get(queryset.model)
+        if lookup is None:
+            return queryset.none()
+        if callable(lookup):
+            condition = lookup(value)
+            if condition is None:
+                return queryset.none()
+            queryset = queryset.filter(condition)
+        else:
+            queryset = queryset.filter(**{lookup: value})
+    return search_queryset(queryset, params.get('q'))
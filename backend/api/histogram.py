@@ -0,0 +1,200 @@
+# Standard library imports
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+# Django imports
+from django.conf import settings
+from django.db import NotSupportedError
+from django.db.models import Count, DateField, DateTimeField, Func, IntegerField, Q, Sum, Value
+from django.db.models.functions import Trunc
+from django.utils import timezone
+
+# Django REST Framework imports
+from rest_framework.exceptions import ValidationError
+
+# Local imports
+from .filters import _parse_date
+from .models import HardwareIncident, SoftwareIncident, IncidentDailyRollup
+
+BUCKETS = ('hour', 'day', 'week', 'month')
+
+# Default span of the histogram when ``from`` is omitted
+DEFAULT_SPANS = {
+    'hour': timedelta(days=2),
+    'day': timedelta(days=30),
+    'week': timedelta(weeks=26),
+    'month': timedelta(days=365),
+}
+
+MAX_BUCKETS = 2000
+
+
+class CombinedTimestamp(Func):
+    """
+    The ``date`` and ``time`` columns of an incident as one timestamp.
+
+    Incident dates and times are stored as wall-clock values in
+    settings.TIME_ZONE; the expression turns them into an aware timestamp so
+    that Trunc(..., tzinfo=...) can bucket them in any time zone.
+    """
+    output_field = DateTimeField()
+
+    def __init__(self, date_field='date', time_field='time', **extra):
+        super().__init__(date_field, time_field, **extra)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        raise NotSupportedError('CombinedTimestamp is only implemented for PostgreSQL and SQLite')
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        sql, params = super().as_sql(compiler, connection, template='(%(expressions)s)', arg_joiner=' + ')
+        return f'({sql} AT TIME ZONE %s)', (*params, settings.TIME_ZONE)
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return super().as_sql(compiler, connection, function='datetime', arg_joiner=" || ' ' || ")
+
+
+def parse_histogram_params(params):
+    """Validate ``bucket``, ``tz``, ``from``, ``to`` and ``partition``"""
+    bucket = params.get('bucket') or 'day'
+    if bucket not in BUCKETS:
+        raise ValidationError({'bucket': f'Intervalle invalide. Valeurs possibles: {", ".join(BUCKETS)}'})
+
+    tz_name = params.get('tz') or settings.TIME_ZONE
+    try:
+        tzinfo = ZoneInfo(tz_name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValidationError({'tz': 'Fuseau horaire inconnu'})
+
+    date_to = _parse_date('to', params['to']) if params.get('to') else timezone.now().astimezone(tzinfo).date()
+    date_from = _parse_date('from', params['from']) if params.get('from') else date_to - DEFAULT_SPANS[bucket]
+    if date_from > date_to:
+        raise ValidationError({'from': 'La date de début doit précéder la date de fin'})
+
+    options = {
+        'bucket': bucket,
+        'tz': tz_name,
+        'tzinfo': tzinfo,
+        'date_from': date_from,
+        'date_to': date_to,
+        'partition': (params.get('partition') or '').strip() or None,
+    }
+    if len(bucket_starts(options)) > MAX_BUCKETS:
+        raise ValidationError({'bucket': f'Période trop longue pour cet intervalle (maximum {MAX_BUCKETS} valeurs)'})
+    return options
+
+
+def bucket_starts(options):
+    """Every bucket start between ``date_from`` and ``date_to``, as aware datetimes"""
+    bucket, tzinfo = options['bucket'], options['tzinfo']
+    first, last = options['date_from'], options['date_to']
+
+    if bucket == 'hour':
+        # Step in UTC so that DST changes neither skip nor repeat an hour
+        start = datetime.combine(first, time(), tzinfo=tzinfo).astimezone(ZoneInfo('UTC'))
+        end = datetime.combine(last + timedelta(days=1), time(), tzinfo=tzinfo).astimezone(ZoneInfo('UTC'))
+        starts = []
+        while start < end:
+            starts.append(start.astimezone(tzinfo))
+            start += timedelta(hours=1)
+        return starts
+
+    if bucket == 'week':
+        first -= timedelta(days=first.weekday())
+        step = lambda day: day + timedelta(weeks=1)
+    elif bucket == 'month':
+        first = first.replace(day=1)
+        step = lambda day: date(day.year + day.month // 12, day.month % 12 + 1, 1)
+    else:
+        step = lambda day: day + timedelta(days=1)
+
+    starts = []
+    day = first
+    while day <= last:
+        starts.append(datetime.combine(day, time(), tzinfo=tzinfo))
+        day = step(day)
+    return starts
+
+
+def _uses_rollup(options):
+    """Day, week and month buckets in the storage time zone can be read from the daily rollup"""
+    return options['bucket'] != 'hour' and options['tzinfo'].key == settings.TIME_ZONE
+
+
+def _rollup_counts(incident_type, options):
+    queryset = IncidentDailyRollup.objects.filter(
+        incident_type=incident_type, day__gte=options['date_from'], day__lte=options['date_to']
+    )
+    if options['partition']:
+        queryset = queryset.filter(partition=options['partition'])
+    rows = (
+        queryset.annotate(bucket=Trunc('day', options['bucket'], output_field=DateField()))
+        .values('bucket')
+        .annotate(count=Sum('incident_count'), downtime=Sum('downtime_minutes'))
+        .order_by()
+        .values_list('bucket', 'count', 'downtime')
+    )
+    return {
+        datetime.combine(bucket, time(), tzinfo=options['tzinfo']): (count, downtime or 0)
+        for bucket, count, downtime in rows
+    }
+
+
+def _incident_counts(model, options):
+    queryset = model.objects.filter(date__gte=options['date_from'], date__lte=options['date_to'])
+    if options['partition']:
+        queryset = queryset.filter(partition=options['partition'])
+    if model is HardwareIncident:
+        downtime = Sum('duree_arret', filter=Q(duree_arret__gt=0))
+    else:
+        # Software incidents never record downtime
+        downtime = Value(0, output_field=IntegerField())
+    rows = (
+        queryset.annotate(bucket=Trunc(CombinedTimestamp(), options['bucket'], tzinfo=options['tzinfo']))
+        .values('bucket')
+        .annotate(count=Count('id'), downtime=downtime)
+        .order_by()
+        .values_list('bucket', 'count', 'downtime')
+    )
+    return {bucket: (count, downtime or 0) for bucket, count, downtime in rows}
+
+
+def incident_histogram(options, include_hardware=True, include_software=True):
+    """
+    Gap-filled hardware and software counts (and hardware downtime) per bucket.
+
+    Bucketing is done in the database. Hours, and any bucket in a time zone
+    other than the storage one, are truncated from the combined date + time
+    of each incident; other histograms are read from the daily rollup. Empty
+    buckets are filled in here rather than with generate_series, so the same
+    code runs on every database backend.
+    """
+    series = {}
+    for incident_type, model, included in (
+        ('hardware', HardwareIncident, include_hardware),
+        ('software', SoftwareIncident, include_software),
+    ):
+        if not included:
+            series[incident_type] = {}
+        elif _uses_rollup(options):
+            series[incident_type] = _rollup_counts(incident_type, options)
+        else:
+            series[incident_type] = _incident_counts(model, options)
+
+    results = []
+    for start in bucket_starts(options):
+        hardware, hardware_downtime = series['hardware'].get(start, (0, 0))
+        software, _ = series['software'].get(start, (0, 0))
+        results.append({
+            'start': start.isoformat(),
+            'hardware': hardware,
+            'software': software,
+            'total': hardware + software,
+            'hardware_downtime_minutes': int(hardware_downtime),
+        })
+    return {
+        'bucket': options['bucket'],
+        'tz': options['tz'],
+        'from': options['date_from'],
+        'to': options['date_to'],
+        'results': results,
+    }
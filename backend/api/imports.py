@@ -0,0 +1,278 @@
+# Standard library imports
+import codecs
+import csv
+import json
+from itertools import chain, islice
+
+# Django imports
+from django.db import transaction
+from django.utils import timezone
+
+# Local imports
+from .cache import bump_generation
+from .catalog import equipment_catalog
+from .models import Equipement, normalize_serial
+from .search import add_serial_trigrams
+from .versions import bump_version
+
+IMPORT_FORMATS = ('csv', 'json', 'ndjson')
+IMPORT_BATCH_SIZE = 1000
+IMPORT_FIELDS = ('num_serie', 'nom_equipement', 'partition')
+# Longer error lists are truncated; error_count still has the total
+MAX_REPORTED_ERRORS = 500
+_READ_SIZE = 64 * 1024
+
+
+class ImportFormatError(ValueError):
+    """The file itself cannot be read (as opposed to a row being invalid)"""
+
+
+def import_format_for(filename='', content_type=''):
+    """Guess the import format from a file name or content type, or None"""
+    filename = (filename or '').lower()
+    content_type = (content_type or '').split(';')[0].strip().lower()
+    if filename.endswith('.csv') or content_type in ('text/csv', 'application/csv'):
+        return 'csv'
+    if filename.endswith(('.ndjson', '.jsonl')) or content_type in ('application/x-ndjson', 'application/jsonl'):
+        return 'ndjson'
+    if filename.endswith('.json') or content_type == 'application/json':
+        return 'json'
+    return None
+
+
+def _iter_csv(text):
+    # Spreadsheets exported with a French locale separate columns with ';'
+    header = text.readline()
+    try:
+        delimiter = csv.Sniffer().sniff(header, delimiters=',;\t').delimiter
+    except csv.Error:
+        delimiter = ','
+    reader = csv.DictReader(chain([header], text), delimiter=delimiter)
+    if not reader.fieldnames:
+        raise ImportFormatError('Fichier CSV vide')
+    reader.fieldnames = [(name or '').strip().lower() for name in reader.fieldnames]
+    if 'nom_equipement' not in reader.fieldnames or 'partition' not in reader.fieldnames:
+        raise ImportFormatError('Colonnes attendues: num_serie, nom_equipement, partition')
+    for row in reader:
+        yield reader.line_num, row
+
+
+def _iter_ndjson(text):
+    for line_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError:
+            yield line_number, None
+
+
+def _iter_json(text):
+    """Items of a top-level JSON array, decoded one at a time"""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    index = 0
+    started = False
+    while True:
+        buffer = buffer.lstrip()
+        if not buffer:
+            more = text.read(_READ_SIZE)
+            if not more:
+                raise ImportFormatError('JSON incomplet: tableau non terminé')
+            buffer = more
+            continue
+        if not started:
+            if buffer[0] != '[':
+                raise ImportFormatError('Un tableau JSON d\'équipements est attendu')
+            started = True
+            buffer = buffer[1:]
+            continue
+        if buffer[0] == ']':
+            return
+        if buffer[0] == ',' and index:
+            buffer = buffer[1:]
+            continue
+        try:
+            item, end = decoder.raw_decode(buffer)
+        except ValueError:
+            more = text.read(_READ_SIZE)
+            if not more:
+                raise ImportFormatError(f'JSON invalide après l\'élément {index}')
+            buffer += more
+            continue
+        index += 1
+        yield index, item
+        buffer = buffer[end:]
+
+
+def iter_import_rows(stream, import_format):
+    """
+    ``(line, row)`` pairs read from a binary stream, without loading it whole.
+
+    ``line`` is the CSV line, the NDJSON line or the position in the JSON
+    array; ``row`` is a dict, or something else for a malformed entry.
+    """
+    text = codecs.getreader('utf-8-sig')(stream, errors='strict')
+    readers = {'csv': _iter_csv, 'json': _iter_json, 'ndjson': _iter_ndjson}
+    try:
+        yield from readers[import_format](text)
+    except UnicodeDecodeError:
+        raise ImportFormatError('Le fichier doit être encodé en UTF-8')
+    except csv.Error as exc:
+        raise ImportFormatError(f'CSV invalide: {exc}')
+
+
+def _clean_row(row):
+    """``(values, errors)`` for one input row"""
+    if not isinstance(row, dict):
+        return None, {'non_field_errors': 'Ligne invalide: un objet est attendu'}
+    values = {}
+    errors = {}
+    for field in IMPORT_FIELDS:
+        value = row.get(field)
+        if value is None:
+            value = ''
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            value = str(value)
+        elif not isinstance(value, str):
+            errors[field] = 'Texte attendu'
+            continue
+        value = value.strip()
+        if len(value) > Equipement._meta.get_field(field).max_length:
+            errors[field] = 'Au plus 255 caractères'
+        values[field] = value
+    # Without a serial a row cannot be matched on a later import
+    if not errors.get('num_serie') and not values.get('num_serie'):
+        errors['num_serie'] = 'Le numéro de série est requis'
+    if not errors.get('nom_equipement') and not values.get('nom_equipement'):
+        errors['nom_equipement'] = 'Le nom de l\'équipement est requis'
+    if not errors.get('partition') and not values.get('partition'):
+        errors['partition'] = 'La partition est requise'
+    return values, errors
+
+
+class _ImportReport:
+
+    def __init__(self, dry_run):
+        self.dry_run = dry_run
+        self.created = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.errors = []
+        self.error_count = 0
+        self.serials = set()
+
+    def error(self, line, row, errors):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            num_serie = row.get('num_serie') if isinstance(row, dict) else None
+            self.errors.append({'line': line, 'num_serie': num_serie, 'errors': errors})
+
+    def as_dict(self):
+        return {
+            'created': self.created,
+            'updated': self.updated,
+            'unchanged': self.unchanged,
+            'error_count': self.error_count,
+            'errors': self.errors,
+            'dry_run': self.dry_run,
+        }
+
+
+def _apply_batch(batch, at, seen, report, using):
+    """Validate a batch of rows, then close and create versions in bulk"""
+    valid = []
+    for line, row in batch:
+        values, errors = _clean_row(row)
+        serial_key = normalize_serial(values.get('num_serie', '')) if values else ''
+        if not errors and serial_key in seen:
+            errors = {'num_serie': f'Numéro de série déjà présent ligne {seen[serial_key]}'}
+        if errors:
+            report.error(line, row, errors)
+            continue
+        seen[serial_key] = line
+        valid.append((serial_key, values))
+
+    # Current version of each serial in the batch, locked like in
+    # api.versioning.create_version; a serial created concurrently makes
+    # bulk_create hit the one-'actuel' constraint and the import roll back
+    keys = {serial_key for serial_key, _ in valid}
+    current = {}
+    actuel = (
+        Equipement.objects.using(using).select_for_update()
+        .filter(serial_key__in=keys, etat='actuel').order_by('-created_at', '-id')
+    )
+    for equipment in actuel:
+        current.setdefault(equipment.serial_key, equipment)
+
+    replaced = set()
+    created = []
+    for serial_key, values in valid:
+        previous = current.get(serial_key)
+        if previous is not None and all(
+            (getattr(previous, field) or '') == values[field] for field in IMPORT_FIELDS
+        ):
+            report.unchanged += 1
+            continue
+        if previous is not None:
+            replaced.add(serial_key)
+            report.updated += 1
+        else:
+            report.created += 1
+        created.append(Equipement(
+            num_serie=values['num_serie'],
+            serial_key=serial_key,
+            nom_equipement=values['nom_equipement'],
+            partition=values['partition'],
+            etat='actuel',
+            valid_from=at,
+            created_at=at,
+        ))
+        report.serials.add(values['num_serie'])
+
+    if replaced:
+        # Same closing values for every row: one UPDATE instead of bulk_update's CASE
+        Equipement.objects.using(using).filter(serial_key__in=replaced, etat='actuel').update(
+            etat='historique', valid_to=at, updated_at=at
+        )
+    Equipement.objects.using(using).bulk_create(created, batch_size=IMPORT_BATCH_SIZE)
+
+
+def _batches(rows, size):
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+def import_equipment(rows, dry_run=False, batch_size=IMPORT_BATCH_SIZE, using='default'):
+    """
+    Create or version equipment from ``(line, row)`` pairs, in one transaction.
+
+    A serial that is new gets an 'actuel' version; one whose name, partition
+    or spelling differs from its 'actuel' version gets a new version and the
+    old one is closed, as in EquipmentViewSet.update; identical rows are left
+    alone, so re-importing a file is a no-op. Invalid rows (including rows
+    without a serial, which could not be matched again) and repeated
+    serials are reported with their line and skipped. ``dry_run`` validates
+    and counts, then rolls back.
+
+    Bulk writes skip save() and the model signals: serial_key, the validity
+    period, the DataVersion counter, the cache generation, the equipment
+    catalog and the trigram table are handled here.
+    """
+    if batch_size < 1:
+        raise ValueError('batch_size must be a positive integer')
+    report = _ImportReport(dry_run)
+    at = timezone.now()
+    seen = {}
+    with transaction.atomic(using=using):
+        for batch in _batches(rows, batch_size):
+            _apply_batch(batch, at, seen, report, using)
+        if report.created or report.updated:
+            add_serial_trigrams(report.serials, using=using)
+            bump_version(Equipement, using=using)
+            transaction.on_commit(lambda: bump_generation(Equipement), using=using)
+            transaction.on_commit(equipment_catalog.clear, using=using)
+        if dry_run:
+            transaction.set_rollback(True, using=using)
+    return report.as_dict()
@@ -0,0 +1,57 @@
+# Standard library imports
+import re
+
+# Django REST Framework imports
+from rest_framework.exceptions import ValidationError
+
+# Local imports
+from .models import HardwareIncident, SoftwareIncident
+
+INCIDENT_MODELS = {
+    'hardware': HardwareIncident,
+    'software': SoftwareIncident,
+}
+
+PUBLIC_ID_PATTERN = re.compile(
+    r'^(?P<prefix>%s)-(?P<pk>[0-9]+)$' % '|'.join(model.public_id_prefix for model in INCIDENT_MODELS.values()),
+    re.IGNORECASE,
+)
+
+PREFIXES = {model.public_id_prefix: model for model in INCIDENT_MODELS.values()}
+
+
+def incident_candidates(lookup, incident_type=None):
+    """
+    Tables to look an incident up in, as ``(model, pk)`` pairs in order.
+
+    - "HW-12" / "SW-12" (public ids) name their table.
+    - A numeric id with ``incident_type`` ("hardware" or "software", the
+      ``?type=`` parameter) too.
+    - A bare numeric id is the legacy form: hardware first, then software.
+      It stays ambiguous when both tables hold that id.
+
+    Returns an empty list when ``lookup`` cannot be an incident id.
+    """
+    match = PUBLIC_ID_PATTERN.match(str(lookup))
+    if match:
+        return [(PREFIXES[match['prefix'].upper()], int(match['pk']))]
+
+    if incident_type and incident_type not in INCIDENT_MODELS:
+        raise ValidationError({'type': 'Type d\'incident invalide. Utilisez "hardware" ou "software".'})
+    if not re.fullmatch(r'[0-9]+', str(lookup)):
+        return []
+    if incident_type:
+        return [(INCIDENT_MODELS[incident_type], int(lookup))]
+    return [(HardwareIncident, int(lookup)), (SoftwareIncident, int(lookup))]
+
+
+def get_incident(lookup, incident_type=None):
+    """The incident behind ``lookup`` (see incident_candidates), or None"""
+    for model, pk in incident_candidates(lookup, incident_type):
+        queryset = model.objects.all()
+        if model is HardwareIncident:
+            queryset = queryset.select_related('equipement')
+        incident = queryset.filter(pk=pk).first()
+        if incident is not None:
+            return incident
+    return None
@@ -0,0 +1,77 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from datetime import timedelta
+from api.models import Equipement, HardwareIncident, SoftwareIncident, Report, normalize_serial
+
+
+class Command(BaseCommand):
+    help = 'Print EXPLAIN (ANALYZE on PostgreSQL) plans for the hot API queries'
+
+    models_with_indexes = [Equipement, HardwareIncident, SoftwareIncident, Report]
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--compare',
+            action='store_true',
+            help=(
+                'Also print each plan with the declared model indexes dropped. '
+                'The drop happens inside a transaction that is rolled back, but it '
+                'locks the tables while the command runs: avoid on a busy server.'
+            ),
+        )
+        parser.add_argument(
+            '--serial',
+            help='Serial number used for the equipment lookups (defaults to the first one found)',
+        )
+
+    def get_hot_queries(self, serial, equipment_id):
+        thirty_days_ago = timezone.now().date() - timedelta(days=30)
+        return [
+            ('Liste incidents matériels (page keyset)',
+             HardwareIncident.objects.order_by('-created_at', '-id')[:51]),
+            ('Liste incidents logiciels (page keyset)',
+             SoftwareIncident.objects.order_by('-created_at', '-id')[:51]),
+            ('Stats: incidents matériels des 30 derniers jours',
+             HardwareIncident.objects.filter(date__gte=thirty_days_ago).order_by().values('id')),
+            ('Stats: incidents logiciels des 30 derniers jours',
+             SoftwareIncident.objects.filter(date__gte=thirty_days_ago).order_by().values('id')),
+            ('Équipement actuel par numéro de série',
+             Equipement.objects.filter(serial_key=normalize_serial(serial), etat='actuel').order_by('-created_at')[:1]),
+            ('Historique des incidents d\'un équipement (première page)',
+             HardwareIncident.objects.filter(
+                 Q(equipement_id=equipment_id) | Q(serial_key=normalize_serial(serial))
+             ).order_by('-date', '-time', '-id')[:51]),
+            ('Liste rapports (page keyset)',
+             Report.objects.order_by('-created_at', '-id')[:51]),
+        ]
+
+    def explain(self, queryset):
+        if connection.vendor == 'postgresql':
+            return queryset.explain(analyze=True, buffers=True)
+        return queryset.explain()
+
+    def print_plans(self, title, queries):
+        self.stdout.write(self.style.MIGRATE_HEADING(f'\n=== {title} ==='))
+        for name, queryset in queries:
+            self.stdout.write(self.style.SUCCESS(f'\n-- {name}'))
+            self.stdout.write(self.explain(queryset))
+
+    def handle(self, *args, **options):
+        equipment = Equipement.objects.exclude(num_serie__isnull=True).exclude(num_serie='').first()
+        serial = options['serial'] or (equipment.num_serie if equipment else '')
+        equipment_id = equipment.id if equipment else 0
+        self.stdout.write(f'Database: {connection.vendor} - serial: {serial or "(aucun)"}')
+
+        self.print_plans('Avec index', self.get_hot_queries(serial, equipment_id))
+
+        if options['compare']:
+            schema_editor = connection.schema_editor()
+            with transaction.atomic(), connection.cursor() as cursor:
+                for model in self.models_with_indexes:
+                    for index in model._meta.indexes:
+                        cursor.execute(str(index.remove_sql(model, schema_editor)))
+                self.print_plans('Sans index (annulé à la fin)', self.get_hot_queries(serial, equipment_id))
+                transaction.set_rollback(True)
+            self.stdout.write(self.style.SUCCESS('\n✅ Index restaurés (transaction annulée)'))
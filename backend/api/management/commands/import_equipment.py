@@ -0,0 +1,59 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+from api.imports import IMPORT_BATCH_SIZE, IMPORT_FORMATS, ImportFormatError, import_equipment, import_format_for, iter_import_rows
+
+
+class Command(BaseCommand):
+    help = 'Import equipment from a CSV, JSON or NDJSON file, versioning serials that changed'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File to import, or - for standard input')
+        parser.add_argument('--format', choices=IMPORT_FORMATS, dest='import_format',
+                            help='File format (default: from the file extension)')
+        parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE,
+                            help='Rows validated and written per batch')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Validate and count without writing')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size doit être un entier positif')
+        path = options['path']
+        import_format = options['import_format'] or import_format_for(path)
+        if import_format is None:
+            raise CommandError('Format inconnu: précisez --format csv|json|ndjson')
+
+        started = time.monotonic()
+        stream = sys.stdin.buffer if path == '-' else open(path, 'rb')
+        try:
+            report = import_equipment(
+                iter_import_rows(stream, import_format),
+                dry_run=options['dry_run'],
+                batch_size=options['batch_size'],
+            )
+        except ImportFormatError as exc:
+            raise CommandError(str(exc))
+        except IntegrityError:
+            raise CommandError('Des équipements du fichier ont été créés en parallèle: relancez l\'import')
+        finally:
+            if stream is not sys.stdin.buffer:
+                stream.close()
+
+        for error in report['errors']:
+            messages = '; '.join(f'{field}: {message}' for field, message in error['errors'].items())
+            self.stdout.write(self.style.WARNING(f'  ligne {error["line"]}: {messages}'))
+        if report['error_count'] > len(report['errors']):
+            self.stdout.write(self.style.WARNING(f'  ... {report["error_count"] - len(report["errors"])} autres erreurs'))
+
+        summary = (
+            f'{report["created"]} créés, {report["updated"]} nouvelles versions, '
+            f'{report["unchanged"]} inchangés, {report["error_count"]} erreurs '
+            f'en {time.monotonic() - started:.2f}s'
+        )
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f'✅ Simulation (rien n\'est enregistré): {summary}'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'✅ Import terminé: {summary}'))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from api.cache import bump_generation
+from api.models import HardwareIncident, SoftwareIncident
+from api.rollup import rebuild_rollup
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the incident_daily_rollup table from the incident tables'
+
+    def handle(self, *args, **options):
+        rows = rebuild_rollup()
+        # Cached stats were computed from the previous rollup
+        bump_generation(HardwareIncident)
+        bump_generation(SoftwareIncident)
+        self.stdout.write(self.style.SUCCESS(f'✅ Rollup reconstruit: {rows} lignes'))
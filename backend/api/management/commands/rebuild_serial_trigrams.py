@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from api.models import Equipement, EquipementSerialTrigram
+from api.search import serial_trigrams
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the serial number trigram table used for autocomplete outside PostgreSQL'
+
+    def handle(self, *args, **options):
+        if connection.vendor == 'postgresql':
+            self.stdout.write('PostgreSQL: l\'autocomplétion utilise l\'index pg_trgm, rien à reconstruire')
+            return
+
+        serials = set(
+            Equipement.objects.filter(num_serie__isnull=False)
+            .exclude(num_serie='')
+            .values_list('num_serie', flat=True)
+        )
+        with transaction.atomic():
+            EquipementSerialTrigram.objects.all().delete()
+            EquipementSerialTrigram.objects.bulk_create([
+                EquipementSerialTrigram(trigram=trigram, num_serie=num_serie)
+                for num_serie in serials
+                for trigram in serial_trigrams(num_serie)
+            ], batch_size=1000)
+
+        self.stdout.write(self.style.SUCCESS(f'✅ Trigrammes reconstruits pour {len(serials)} numéros de série'))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from api.cache import bump_generation
+from api.counters import reconcile_counters
+from api.models import Equipement
+
+
+class Command(BaseCommand):
+    help = 'Recompute the per-equipment incident counters and repair the ones that drifted'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only report the equipment whose counters drifted')
+
+    def handle(self, *args, **options):
+        repaired = reconcile_counters(dry_run=options['dry_run'])
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f'✅ {len(repaired)} équipements à corriger: {repaired[:50]}'))
+            return
+        if repaired:
+            # Cached responses were built from the drifted counters
+            bump_generation(Equipement)
+        self.stdout.write(self.style.SUCCESS(f'✅ Compteurs corrigés pour {len(repaired)} équipements'))
@@ -0,0 +1,74 @@
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from api.models import Equipement, normalize_serial
+from api.versioning import create_version
+
+
+class Command(BaseCommand):
+    help = 'Edit one serial number from parallel threads and check that its versions stay consistent'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8, help='Concurrent workers')
+        parser.add_argument('--updates', type=int, default=50, help='Edits in total')
+        parser.add_argument('--i-know-this-writes', action='store_true', dest='allow_writes',
+                            help='Run even with DEBUG off: the run writes to the configured database')
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options['allow_writes']:
+            raise CommandError(
+                f'DEBUG est désactivé: la base {connection.settings_dict["NAME"]} serait modifiée. '
+                'Relancez avec --i-know-this-writes pour confirmer'
+            )
+        if connection.vendor != 'postgresql':
+            self.stdout.write(self.style.WARNING(
+                f'  {connection.vendor}: un seul écrivain à la fois, attendez-vous à des échecs '
+                '"database is locked"; lancez la vérification sur PostgreSQL'
+            ))
+
+        # Unique per run, so the edits never touch a real serial
+        serial = f'STRESS-{uuid.uuid4().hex[:12].upper()}'
+        versions = Equipement.objects.filter(serial_key=normalize_serial(serial))
+
+        def edit(number):
+            # The serial has no version yet: the first edits also race on the insert
+            try:
+                return create_version(serial, f'Stress {number}', f'P{number % options["threads"]}')
+            finally:
+                connections.close_all()
+
+        failures = []
+        try:
+            with ThreadPoolExecutor(max_workers=options['threads']) as pool:
+                futures = [pool.submit(edit, number) for number in range(options['updates'])]
+                for future in futures:
+                    if future.exception() is not None:
+                        failures.append(future.exception())
+            history = list(versions.order_by('valid_from', 'id'))
+        finally:
+            for equipment in versions:
+                equipment.delete()
+
+        problems = []
+        current = [equipment for equipment in history if equipment.etat == 'actuel']
+        if len(current) != 1:
+            problems.append(f'{len(current)} versions actuelles au lieu d\'une')
+        elif current[0] is not history[-1] or current[0].valid_to is not None:
+            problems.append('La version actuelle n\'est pas la dernière période ouverte')
+        if len(history) != options['updates'] - len(failures):
+            problems.append(f'{len(history)} versions pour {options["updates"] - len(failures)} modifications réussies')
+        for equipment, successor in zip(history, history[1:]):
+            if equipment.valid_to != successor.valid_from:
+                problems.append(f'Période de la version {equipment.pk} non contiguë avec {successor.pk}')
+
+        for failure in failures[:10]:
+            self.stdout.write(self.style.WARNING(f'  échec: {type(failure).__name__}: {failure}'))
+        if problems:
+            raise CommandError('Invariants non respectés:\n  ' + '\n  '.join(problems))
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {len(history)} versions de {serial}, une seule actuelle, périodes contiguës '
+            f'({options["threads"]} threads, {len(failures)} échecs, versions supprimées)'
+        ))
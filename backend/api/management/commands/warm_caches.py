@@ -0,0 +1,45 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from api.models import User
+from api.warmup import cache_is_process_local, warm_caches, warm_targets
+
+
+class Command(BaseCommand):
+    help = 'Precompute the cached dashboard responses (stats, facets, analytics) for every role'
+
+    @staticmethod
+    def cached_names():
+        # recent lives in a per-process buffer, only warmed inside the web workers
+        return [name for name, models, _, _ in warm_targets() if models is not None]
+
+    def add_arguments(self, parser):
+        roles = [role for role, _ in User.ROLE_CHOICES]
+        names = self.cached_names()
+        parser.add_argument('--role', action='append', choices=roles, dest='roles',
+                            help='Only warm this role (repeatable)')
+        parser.add_argument('--only', action='append', choices=names, dest='names',
+                            help='Only warm this entry (repeatable)')
+        parser.add_argument('--interval', type=int, default=0,
+                            help='Repeat every INTERVAL seconds instead of running once')
+        parser.add_argument('--allow-local-cache', action='store_true',
+                            help='Run with a per-process cache, only to measure build times')
+
+    def handle(self, *args, **options):
+        if cache_is_process_local() and not options['allow_local_cache']:
+            raise CommandError(
+                f'Le cache {settings.CACHES[settings.API_CACHE_ALIAS]["BACKEND"]} est propre à chaque processus: '
+                'les serveurs web ne liraient pas ces entrées. Configurez CACHE_BACKEND (ex. Redis) ou '
+                'API_CACHE_WARM_INTERVAL, ou passez --allow-local-cache pour mesurer les temps'
+            )
+        names = options['names'] or self.cached_names()
+        while True:
+            timings = warm_caches(roles=options['roles'], names=names)
+            for name, role, seconds in sorted(timings, key=lambda timing: -timing[2]):
+                self.stdout.write(f'  {seconds * 1000:8.1f} ms  {name} ({role})')
+            total = sum(seconds for _, _, seconds in timings)
+            self.stdout.write(self.style.SUCCESS(f'✅ {len(timings)} entrées préchargées en {total:.2f}s'))
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,79 @@
+# Turn HardwareIncident.equipement_id into a real, indexed foreign key
+
+from django.db import migrations, models, transaction
+import django.db.models.deletion
+
+BATCH_SIZE = 1000
+
+
+def clear_dangling_equipement_ids(apps, schema_editor):
+    """
+    Prepare equipement_id for the foreign key constraint, one batch at a time.
+
+    Only rows that already carry an equipement_id are touched: ids pointing
+    at equipment that no longer exists are cleared. Incidents without a link
+    are left alone, the constraint does not need them to change.
+    """
+    HardwareIncident = apps.get_model('api', 'HardwareIncident')
+    Equipement = apps.get_model('api', 'Equipement')
+
+    existing_ids = set(Equipement.objects.values_list('id', flat=True))
+
+    last_pk = 0
+    while True:
+        rows = list(
+            HardwareIncident.objects.filter(pk__gt=last_pk, equipement_id__isnull=False)
+            .order_by('pk')
+            .values_list('pk', 'equipement_id')[:BATCH_SIZE]
+        )
+        if not rows:
+            break
+        last_pk = rows[-1][0]
+
+        orphans = [pk for pk, equipement_id in rows if equipement_id not in existing_ids]
+        if orphans:
+            with transaction.atomic(using=schema_editor.connection.alias):
+                HardwareIncident.objects.filter(pk__in=orphans).update(equipement_id=None)
+
+
+class Migration(migrations.Migration):
+
+    # Each backfill batch commits on its own
+    atomic = False
+
+    dependencies = [
+        ('api', '0003_update_roles_and_add_lockout'),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_dangling_equipement_ids, migrations.RunPython.noop),
+        # Pin the existing column name, then rename the field in the model
+        # state only so the database column stays "equipement_id"
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='hardwareincident',
+                    name='equipement_id',
+                    field=models.IntegerField(blank=True, null=True, db_column='equipement_id'),
+                ),
+                migrations.RenameField(
+                    model_name='hardwareincident',
+                    old_name='equipement_id',
+                    new_name='equipement',
+                ),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='hardwareincident',
+            name='equipement',
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                db_column='equipement_id',
+                db_index=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name='hardware_incidents',
+                to='api.equipement',
+            ),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.0.1 on 2026-10-16 23:09
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_hardwareincident_equipement_fk'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='equipement',
+            index=models.Index(fields=['-created_at', '-id'], name='equipement_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipement',
+            index=models.Index(django.db.models.functions.text.Upper('num_serie'), models.F('etat'), name='equipement_serie_etat_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipement',
+            index=models.Index(django.db.models.functions.text.Upper('num_serie'), condition=models.Q(('etat', 'actuel')), name='equipement_serie_actuel_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hardwareincident',
+            index=models.Index(fields=['-created_at', '-id'], name='hw_incident_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hardwareincident',
+            index=models.Index(fields=['date', 'time'], name='hw_incident_date_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hardwareincident',
+            index=models.Index(django.db.models.functions.text.Upper('numero_de_serie'), name='hw_incident_serie_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='report',
+            index=models.Index(fields=['-created_at', '-id'], name='report_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='softwareincident',
+            index=models.Index(fields=['-created_at', '-id'], name='sw_incident_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='softwareincident',
+            index=models.Index(fields=['date', 'time'], name='sw_incident_date_time_idx'),
+        ),
+    ]
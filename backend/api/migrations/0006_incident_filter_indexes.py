@@ -0,0 +1,41 @@
+# Generated by Django 5.0.1 on 2026-10-16 23:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='hardwareincident',
+            index=models.Index(fields=['partition', 'date'], name='hw_incident_partition_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hardwareincident',
+            index=models.Index(fields=['maintenance_type', 'date'], name='hw_incident_maint_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hardwareincident',
+            index=models.Index(condition=models.Q(('duree_arret__gt', 0)), fields=['date'], name='hw_incident_downtime_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='softwareincident',
+            index=models.Index(fields=['partition', 'date'], name='sw_incident_partition_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='softwareincident',
+            index=models.Index(fields=['server', 'date'], name='sw_incident_server_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='softwareincident',
+            index=models.Index(fields=['type_d_anomalie', 'date'], name='sw_incident_anomalie_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='softwareincident',
+            index=models.Index(fields=['nom_radar', 'date'], name='sw_incident_radar_idx'),
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Full-text search over incident and report narratives (PostgreSQL only)
+#
+# Each table gets a stored generated "search_vector" tsvector column with a
+# GIN index, built with a french configuration that also strips accents.
+# The columns live outside the Django model state: api.search queries them
+# with raw SQL and falls back to icontains on other database backends.
+
+from django.db import migrations
+
+SEARCH_CONFIG = 'enna_french'
+
+SEARCH_VECTORS = [
+    ('hardware_incidents', 'hw_incident_search_idx', [
+        ('description', 'A'), ('anomalie_observee', 'B'), ('action_realisee', 'C'),
+    ]),
+    ('software_incidents', 'sw_incident_search_idx', [
+        ('description', 'A'), ('commentaires', 'B'),
+    ]),
+    ('reports', 'report_search_idx', [
+        ('anomaly', 'A'), ('analysis', 'B'), ('conclusion', 'B'),
+    ]),
+]
+
+
+def create_search_vectors(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS unaccent')
+    schema_editor.execute(f"""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = '{SEARCH_CONFIG}') THEN
+                CREATE TEXT SEARCH CONFIGURATION {SEARCH_CONFIG} (COPY = french);
+                ALTER TEXT SEARCH CONFIGURATION {SEARCH_CONFIG}
+                    ALTER MAPPING FOR hword, hword_part, word WITH unaccent, french_stem;
+            END IF;
+        END
+        $$
+    """)
+    for table, index, columns in SEARCH_VECTORS:
+        vector = ' || '.join(
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce({column}, '')), '{weight}')"
+            for column, weight in columns
+        )
+        schema_editor.execute(
+            f'ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector '
+            f'GENERATED ALWAYS AS ({vector}) STORED'
+        )
+        schema_editor.execute(f'CREATE INDEX IF NOT EXISTS {index} ON {table} USING gin (search_vector)')
+
+
+def drop_search_vectors(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table, index, columns in SEARCH_VECTORS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {index}')
+        schema_editor.execute(f'ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector')
+    schema_editor.execute(f'DROP TEXT SEARCH CONFIGURATION IF EXISTS {SEARCH_CONFIG}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_incident_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_vectors, drop_search_vectors),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.0.1 on 2026-10-16 23:14
+
+from django.db import migrations, models
+
+
+def create_serial_index(apps, schema_editor):
+    """pg_trgm GIN index on PostgreSQL, trigram table backfill elsewhere"""
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS equipement_serie_trgm_idx '
+            'ON equipement USING gin (UPPER(num_serie) gin_trgm_ops)'
+        )
+        return
+
+    Equipement = apps.get_model('api', 'Equipement')
+    EquipementSerialTrigram = apps.get_model('api', 'EquipementSerialTrigram')
+    serials = set(
+        Equipement.objects.filter(num_serie__isnull=False)
+        .exclude(num_serie='')
+        .values_list('num_serie', flat=True)
+    )
+    trigrams = []
+    for num_serie in serials:
+        padded = num_serie.strip().upper() + '  '
+        trigrams.extend(
+            EquipementSerialTrigram(trigram=trigram, num_serie=num_serie)
+            for trigram in {padded[i:i + 3] for i in range(len(padded) - 2)}
+        )
+    EquipementSerialTrigram.objects.bulk_create(trigrams, batch_size=1000)
+
+
+def drop_serial_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS equipement_serie_trgm_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_full_text_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EquipementSerialTrigram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('trigram', models.CharField(max_length=3)),
+                ('num_serie', models.CharField(max_length=255)),
+            ],
+            options={
+                'db_table': 'equipement_serial_trigrams',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='equipementserialtrigram',
+            constraint=models.UniqueConstraint(fields=('trigram', 'num_serie'), name='equipement_trigram_unique'),
+        ),
+        migrations.RunPython(create_serial_index, drop_serial_index),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 5.0.1 on 2026-10-16 23:17
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, Q, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def populate_rollup(apps, schema_editor):
+    """Fill the rollup from the existing incidents (see api.rollup.rebuild_rollup)"""
+    HardwareIncident = apps.get_model('api', 'HardwareIncident')
+    SoftwareIncident = apps.get_model('api', 'SoftwareIncident')
+    IncidentDailyRollup = apps.get_model('api', 'IncidentDailyRollup')
+    db_alias = schema_editor.connection.alias
+
+    downtime = Q(duree_arret__gt=0)
+    sources = [
+        ('hardware', HardwareIncident, Coalesce('maintenance_type', Value('')), {
+            'downtime_minutes': Coalesce(Sum('duree_arret', filter=downtime), 0),
+            'downtime_count': Count('id', filter=downtime),
+        }),
+        ('software', SoftwareIncident, Value(''), {
+            'downtime_minutes': Value(0, output_field=IntegerField()),
+            'downtime_count': Value(0, output_field=IntegerField()),
+        }),
+    ]
+    rows = []
+    for incident_type, model, maintenance_type, counters in sources:
+        groups = (
+            model.objects.using(db_alias)
+            .filter(date__isnull=False)
+            .annotate(rollup_partition=Coalesce('partition', Value('')), rollup_maintenance_type=maintenance_type)
+            .values('date', 'rollup_partition', 'rollup_maintenance_type')
+            .annotate(incident_count=Count('id'), **counters)
+            .order_by()
+        )
+        rows.extend(
+            IncidentDailyRollup(
+                day=group['date'],
+                incident_type=incident_type,
+                partition=group['rollup_partition'],
+                maintenance_type=group['rollup_maintenance_type'],
+                incident_count=group['incident_count'],
+                downtime_minutes=group['downtime_minutes'],
+                downtime_count=group['downtime_count'],
+            )
+            for group in groups
+        )
+    IncidentDailyRollup.objects.using(db_alias).bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_serial_trigram_autocomplete'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IncidentDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('incident_type', models.CharField(choices=[('hardware', 'Matériel'), ('software', 'Logiciel')], max_length=10)),
+                ('partition', models.CharField(blank=True, default='', max_length=255)),
+                ('maintenance_type', models.CharField(blank=True, default='', max_length=20)),
+                ('incident_count', models.IntegerField(default=0)),
+                ('downtime_minutes', models.BigIntegerField(default=0)),
+                ('downtime_count', models.IntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'incident_daily_rollup',
+                'ordering': ['day'],
+                'indexes': [models.Index(fields=['incident_type', 'day'], name='incident_rollup_type_day_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='incidentdailyrollup',
+            constraint=models.UniqueConstraint(fields=('day', 'incident_type', 'partition', 'maintenance_type'), name='incident_rollup_unique'),
+        ),
+        migrations.RunPython(populate_rollup, migrations.RunPython.noop),
+    ]
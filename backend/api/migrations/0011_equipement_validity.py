@@ -0,0 +1,96 @@
+# Generated by Django 5.0.1 on 2026-10-16 23:28
+
+from datetime import datetime, time
+from zoneinfo import ZoneInfo
+
+import django.db.models.functions.text
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Min
+from django.db.models.functions import Trim, Upper
+
+
+def backfill_validity(apps, schema_editor):
+    """
+    Derive validity periods from the existing versions.
+
+    A version is valid from its creation until the next version of the same
+    serial was created; the last one is still valid if it is 'actuel', and
+    was closed when last updated otherwise. Equipment registered after its
+    first incidents is made valid from the day of the first one.
+    """
+    Equipement = apps.get_model('api', 'Equipement')
+    HardwareIncident = apps.get_model('api', 'HardwareIncident')
+    db_alias = schema_editor.connection.alias
+    tzinfo = ZoneInfo(settings.TIME_ZONE)
+
+    first_incidents = dict(
+        HardwareIncident.objects.using(db_alias)
+        .annotate(serial=Upper(Trim('numero_de_serie')))
+        .exclude(serial__isnull=True).exclude(serial='')
+        .values('serial').annotate(first=Min('date'))
+        .values_list('serial', 'first')
+    )
+
+    versions = {}
+    for equipment in Equipement.objects.using(db_alias).order_by('created_at', 'id'):
+        serial = (equipment.num_serie or '').strip().upper() or f'#{equipment.pk}'
+        versions.setdefault(serial, []).append(equipment)
+
+    updated = []
+    for serial, history in versions.items():
+        for equipment, successor in zip(history, history[1:] + [None]):
+            equipment.valid_from = equipment.created_at
+            if equipment is history[0] and serial in first_incidents:
+                first = datetime.combine(first_incidents[serial], time(), tzinfo=tzinfo)
+                equipment.valid_from = min(equipment.created_at, first)
+            if successor is not None:
+                equipment.valid_to = successor.created_at
+            elif equipment.etat != 'actuel':
+                equipment.valid_to = equipment.updated_at
+            else:
+                equipment.valid_to = None
+            updated.append(equipment)
+    Equipement.objects.using(db_alias).bulk_update(updated, ['valid_from', 'valid_to'], batch_size=1000)
+
+
+def create_validity_index(apps, schema_editor):
+    """GiST index on (serial, validity range) for as-of lookups on PostgreSQL"""
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS equipement_validity_gist_idx ON equipement '
+            'USING gist (UPPER(num_serie), tstzrange(valid_from, valid_to))'
+        )
+
+
+def drop_validity_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS equipement_validity_gist_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_data_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='equipement',
+            name='valid_from',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='equipement',
+            name='valid_to',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='equipement',
+            index=models.Index(django.db.models.functions.text.Upper('num_serie'), models.OrderBy(models.F('valid_from'), descending=True), name='equipement_serie_valid_idx'),
+        ),
+        migrations.RunPython(backfill_validity, migrations.RunPython.noop),
+        migrations.RunPython(create_validity_index, drop_validity_index),
+    ]
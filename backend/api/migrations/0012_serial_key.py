@@ -0,0 +1,86 @@
+# Generated by Django 5.0.1 on 2026-10-16 23:31
+
+from django.db import migrations, models
+from django.db.models import Value
+from django.db.models.functions import Coalesce, Trim, Upper
+
+
+def backfill_serial_keys(apps, schema_editor):
+    """serial_key = UPPER(TRIM(serial)) for the existing rows (see SerialKeyMixin)"""
+    db_alias = schema_editor.connection.alias
+    for model_name, serial_field in (('Equipement', 'num_serie'), ('HardwareIncident', 'numero_de_serie')):
+        model = apps.get_model('api', model_name)
+        model.objects.using(db_alias).update(serial_key=Upper(Trim(Coalesce(serial_field, Value('')))))
+
+
+def rebuild_validity_index(apps, schema_editor):
+    """Key the GiST index of migration 0011 on serial_key"""
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS equipement_validity_gist_idx')
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS equipement_validity_gist_idx ON equipement '
+            'USING gist (serial_key, tstzrange(valid_from, valid_to))'
+        )
+
+
+def restore_validity_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS equipement_validity_gist_idx')
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS equipement_validity_gist_idx ON equipement '
+            'USING gist (UPPER(num_serie), tstzrange(valid_from, valid_to))'
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_equipement_validity'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='equipement',
+            name='equipement_serie_etat_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='equipement',
+            name='equipement_serie_actuel_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='equipement',
+            name='equipement_serie_valid_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='hardwareincident',
+            name='hw_incident_serie_idx',
+        ),
+        migrations.AddField(
+            model_name='equipement',
+            name='serial_key',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='hardwareincident',
+            name='serial_key',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255),
+        ),
+        migrations.RunPython(backfill_serial_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='equipement',
+            index=models.Index(fields=['serial_key', 'etat'], name='equipement_key_etat_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipement',
+            index=models.Index(condition=models.Q(('etat', 'actuel')), fields=['serial_key'], name='equipement_key_actuel_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipement',
+            index=models.Index(fields=['serial_key', '-valid_from'], name='equipement_key_valid_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hardwareincident',
+            index=models.Index(fields=['serial_key', '-date', '-time', '-id'], name='hw_incident_key_date_idx'),
+        ),
+        migrations.RunPython(rebuild_validity_index, restore_validity_index),
+    ]
@@ -0,0 +1,113 @@
+# Generated by Django 5.0.1 on 2026-10-16 23:39
+
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max, Q, Sum
+from django.db.models.functions import Coalesce
+
+
+def populate_counters(apps, schema_editor):
+    """Fill the counters from the existing incidents (see api.counters.reconcile_counters)"""
+    Equipement = apps.get_model('api', 'Equipement')
+    HardwareIncident = apps.get_model('api', 'HardwareIncident')
+    db_alias = schema_editor.connection.alias
+    tzinfo = ZoneInfo(settings.TIME_ZONE)
+
+    linked = HardwareIncident.objects.using(db_alias).filter(equipement__isnull=False)
+    groups = {
+        group['equipement_id']: group
+        for group in linked.values('equipement_id').annotate(
+            incident_count=Count('id'),
+            corrective_count=Count('id', filter=Q(maintenance_type='corrective')),
+            total_downtime=Coalesce(Sum('duree_arret', filter=Q(duree_arret__gt=0)), 0),
+            last_date=Max('date'),
+        ).order_by()
+    }
+    last_times = {
+        (equipment_id, day): last_time
+        for equipment_id, day, last_time in linked.values('equipement_id', 'date').annotate(
+            last_time=Max('time')
+        ).order_by().values_list('equipement_id', 'date', 'last_time')
+    }
+
+    updated = []
+    for equipment in Equipement.objects.using(db_alias).filter(pk__in=list(groups)):
+        group = groups[equipment.pk]
+        equipment.incident_count = group['incident_count']
+        equipment.corrective_count = group['corrective_count']
+        equipment.total_downtime = group['total_downtime']
+        last_time = last_times[(equipment.pk, group['last_date'])]
+        equipment.last_incident_at = datetime.combine(group['last_date'], last_time, tzinfo=tzinfo)
+        updated.append(equipment)
+    Equipement.objects.using(db_alias).bulk_update(
+        updated, ['incident_count', 'corrective_count', 'total_downtime', 'last_incident_at'], batch_size=1000
+    )
+
+
+def create_last_incident_index(apps, schema_editor):
+    """
+    Index for the ``sort=-last_incident_at`` list, NULLs (never failed) last.
+
+    PostgreSQL sorts NULLs first in descending order and needs NULLS LAST,
+    which SQLite rejects in an index; there NULLs are already the smallest.
+    """
+    nulls = ' NULLS LAST' if schema_editor.connection.vendor == 'postgresql' else ''
+    schema_editor.execute(
+        'CREATE INDEX equipement_last_incident_idx ON equipement '
+        f'(last_incident_at DESC{nulls}, id DESC)'
+    )
+
+
+def drop_last_incident_index(apps, schema_editor):
+    schema_editor.execute('DROP INDEX IF EXISTS equipement_last_incident_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_serial_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='equipement',
+            name='corrective_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='equipement',
+            name='incident_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='equipement',
+            name='last_incident_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='equipement',
+            name='total_downtime',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='equipement',
+            index=models.Index(fields=['-incident_count', '-id'], name='equipement_incident_count_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipement',
+            index=models.Index(fields=['-corrective_count', '-id'], name='equipement_corrective_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipement',
+            index=models.Index(fields=['-total_downtime', '-id'], name='equipement_downtime_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hardwareincident',
+            index=models.Index(fields=['equipement', '-date', '-time'], name='hw_incident_equipment_date_idx'),
+        ),
+        migrations.RunPython(create_last_incident_index, drop_last_incident_index),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.0.1 on 2026-10-16 23:44
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def close_duplicate_versions(apps, schema_editor):
+    """
+    Keep one 'actuel' version per serial before the constraint is added.
+
+    Concurrent edits could leave several; the most recent one stays current
+    and each older one is closed when the next one started.
+    """
+    Equipement = apps.get_model('api', 'Equipement')
+    db_alias = schema_editor.connection.alias
+
+    current = Equipement.objects.using(db_alias).filter(etat='actuel').exclude(serial_key='')
+    duplicated = (
+        current.values('serial_key').annotate(versions=Count('id')).filter(versions__gt=1)
+        .values_list('serial_key', flat=True).order_by()
+    )
+    closed = []
+    versions = {}
+    for equipment in current.filter(serial_key__in=list(duplicated)).order_by('created_at', 'id'):
+        versions.setdefault(equipment.serial_key, []).append(equipment)
+    for history in versions.values():
+        for equipment, successor in zip(history, history[1:]):
+            equipment.etat = 'historique'
+            equipment.valid_to = max(successor.valid_from, equipment.valid_from)
+            closed.append(equipment)
+    Equipement.objects.using(db_alias).bulk_update(closed, ['etat', 'valid_to'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_equipment_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(close_duplicate_versions, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='equipement',
+            constraint=models.UniqueConstraint(condition=models.Q(('etat', 'actuel'), models.Q(('serial_key', ''), _negated=True)), fields=('serial_key',), name='equipement_one_actuel_per_serial'),
+        ),
+        migrations.RemoveIndex(
+            model_name='equipement',
+            name='equipement_key_actuel_idx',
+        ),
+    ]
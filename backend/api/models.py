@@ -1,9 +1,60 @@
 from django.db import models
+from django.db.models import Q
 from django.contrib.auth.models import AbstractUser
 from django.utils import timezone
 from datetime import timedelta
 
 
+class LoadedValuesMixin:
+    """Remember the database values of ``tracked_fields`` when an instance is loaded"""
+    tracked_fields = ()
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {
+            name: getattr(instance, name) for name in cls.tracked_fields if name in field_names
+        }
+        return instance
+
+
+def normalize_serial(num_serie):
+    """Serial numbers compare trimmed and case-insensitively"""
+    return (num_serie or '').strip().upper()
+
+
+class SerialKeyMixin:
+    """
+    Keep ``serial_key`` equal to the normalized ``serial_field`` on save.
+    
+    Lookups compare serial_key with = instead of UPPER(...) = UPPER(...), so
+    plain B-tree indexes apply. QuerySet.update() and bulk operations bypass
+    save() and must set serial_key themselves.
+    """
+    serial_field = None
+    
+    def save(self, *args, **kwargs):
+        self.serial_key = normalize_serial(getattr(self, self.serial_field))
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and self.serial_field in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'serial_key'}
+        super().save(*args, **kwargs)
+
+
+class PublicIdMixin:
+    """
+    Type-prefixed id ("HW-12", "SW-12") of an incident.
+    
+    Both incident tables have their own sequence, so the numeric id alone is
+    ambiguous; the prefix names the table (see api.incident_ids).
+    """
+    public_id_prefix = None
+    
+    @property
+    def public_id(self):
+        return f"{self.public_id_prefix}-{self.pk}"
+
+
 class User(AbstractUser):
     """Custom user model with role field"""
     ROLE_CHOICES = [
@@ -52,22 +103,80 @@ class User(AbstractUser):
         self.save(update_fields=['failed_login_attempts', 'locked_until'])
 
 
-class Equipement(models.Model):
+class Equipement(SerialKeyMixin, LoadedValuesMixin, models.Model):
     """Equipment model"""
+    tracked_fields = ('num_serie',)
+    serial_field = 'num_serie'
+    
     num_serie = models.CharField(max_length=255, null=True, blank=True)
+    # Trimmed, upper-cased num_serie ('' without serial)
+    serial_key = models.CharField(max_length=255, blank=True, default='', editable=False)
     nom_equipement = models.CharField(max_length=255)
     partition = models.CharField(max_length=255)
     etat = models.CharField(max_length=50, default='actuel')
+    # When this version became / stopped being the current one of its serial
+    # (valid_to is null while etat='actuel', see api.versioning)
+    valid_from = models.DateTimeField(default=timezone.now)
+    valid_to = models.DateTimeField(null=True, blank=True)
+    # Hardware incidents linked to this version, kept in step by the incident
+    # signals with F() updates (see api.counters)
+    incident_count = models.IntegerField(default=0)
+    corrective_count = models.IntegerField(default=0)
+    total_downtime = models.IntegerField(default=0)
+    last_incident_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         db_table = 'equipement'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='equipement_created_id_idx'),
+            models.Index(fields=['serial_key', 'etat'], name='equipement_key_etat_idx'),
+            # As-of lookups: latest version of a serial starting before an instant
+            models.Index(fields=['serial_key', '-valid_from'], name='equipement_key_valid_idx'),
+            # Equipment list sorts (see EquipmentPagination); the last_incident_at
+            # one is created by migration 0013, NULLS LAST on PostgreSQL
+            models.Index(fields=['-incident_count', '-id'], name='equipement_incident_count_idx'),
+            models.Index(fields=['-corrective_count', '-id'], name='equipement_corrective_idx'),
+            models.Index(fields=['-total_downtime', '-id'], name='equipement_downtime_idx'),
+        ]
+        constraints = [
+            # One current version per serial (see api.versioning.create_version);
+            # also serves the 'actuel' lookups
+            models.UniqueConstraint(
+                fields=['serial_key'],
+                condition=Q(etat='actuel') & ~Q(serial_key=''),
+                name='equipement_one_actuel_per_serial',
+            ),
+        ]
+
+
+class EquipementSerialTrigram(models.Model):
+    """
+    Trigram index of equipment serial numbers.
+    
+    Backs serial autocomplete on databases without pg_trgm; on PostgreSQL a
+    GIN trigram index on equipement is used instead and this table stays empty.
+    """
+    trigram = models.CharField(max_length=3)
+    num_serie = models.CharField(max_length=255)
+    
+    class Meta:
+        db_table = 'equipement_serial_trigrams'
+        constraints = [
+            models.UniqueConstraint(fields=['trigram', 'num_serie'], name='equipement_trigram_unique'),
+        ]
 
 
-class HardwareIncident(models.Model):
+class HardwareIncident(SerialKeyMixin, PublicIdMixin, LoadedValuesMixin, models.Model):
     """Hardware incident model"""
+    public_id_prefix = 'HW'
+    # Values the daily rollup and the equipment counters are keyed on
+    # (see api.rollup and api.counters)
+    tracked_fields = ('date', 'time', 'partition', 'maintenance_type', 'duree_arret', 'equipement_id')
+    serial_field = 'numero_de_serie'
+    
     MAINTENANCE_TYPE_CHOICES = [
         ('preventive', 'Préventive'),
         ('corrective', 'Corrective'),
@@ -78,7 +187,17 @@ class HardwareIncident(models.Model):
     nom_de_equipement = models.CharField(max_length=255)
     partition = models.CharField(max_length=255, null=True, blank=True)
     numero_de_serie = models.CharField(max_length=255, null=True, blank=True)
-    equipement_id = models.IntegerField(null=True, blank=True)
+    # Trimmed, upper-cased numero_de_serie ('' without serial)
+    serial_key = models.CharField(max_length=255, blank=True, default='', editable=False)
+    equipement = models.ForeignKey(
+        Equipement,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        db_column='equipement_id',
+        db_index=True,
+        related_name='hardware_incidents'
+    )
     description = models.TextField()
     anomalie_observee = models.TextField(null=True, blank=True)
     action_realisee = models.TextField(null=True, blank=True)
@@ -93,10 +212,26 @@ class HardwareIncident(models.Model):
     class Meta:
         db_table = 'hardware_incidents'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='hw_incident_created_id_idx'),
+            models.Index(fields=['date', 'time'], name='hw_incident_date_time_idx'),
+            # Equipment history, newest first
+            models.Index(fields=['serial_key', '-date', '-time', '-id'], name='hw_incident_key_date_idx'),
+            # Latest incident of an equipment (see api.counters)
+            models.Index(fields=['equipement', '-date', '-time'], name='hw_incident_equipment_date_idx'),
+            # List filters (see api.filters), combined with the date range
+            models.Index(fields=['partition', 'date'], name='hw_incident_partition_idx'),
+            models.Index(fields=['maintenance_type', 'date'], name='hw_incident_maint_type_idx'),
+            models.Index(fields=['date'], name='hw_incident_downtime_idx', condition=Q(duree_arret__gt=0)),
+        ]
 
 
-class SoftwareIncident(models.Model):
+class SoftwareIncident(PublicIdMixin, LoadedValuesMixin, models.Model):
     """Software incident model"""
+    public_id_prefix = 'SW'
+    # Values the daily rollup is keyed on (see api.rollup)
+    tracked_fields = ('date', 'partition')
+    
     date = models.DateField()
     time = models.TimeField()
     simulateur = models.BooleanField(default=False)
@@ -120,6 +255,15 @@ class SoftwareIncident(models.Model):
     class Meta:
         db_table = 'software_incidents'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='sw_incident_created_id_idx'),
+            models.Index(fields=['date', 'time'], name='sw_incident_date_time_idx'),
+            # List filters (see api.filters), combined with the date range
+            models.Index(fields=['partition', 'date'], name='sw_incident_partition_idx'),
+            models.Index(fields=['server', 'date'], name='sw_incident_server_idx'),
+            models.Index(fields=['type_d_anomalie', 'date'], name='sw_incident_anomalie_idx'),
+            models.Index(fields=['nom_radar', 'date'], name='sw_incident_radar_idx'),
+        ]
 
 
 class Report(models.Model):
@@ -140,4 +284,60 @@ class Report(models.Model):
     class Meta:
         db_table = 'reports'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='report_created_id_idx'),
+        ]
 
+
+class IncidentDailyRollup(models.Model):
+    """
+    Incident counters per day, incident type, partition and maintenance type.
+
+    Maintained on every incident write by api.rollup; rebuilt from scratch
+    with the rebuild_incident_rollup command. Missing partitions and
+    maintenance types are stored as empty strings.
+    """
+    INCIDENT_TYPE_CHOICES = [
+        ('hardware', 'Matériel'),
+        ('software', 'Logiciel'),
+    ]
+    
+    day = models.DateField()
+    incident_type = models.CharField(max_length=10, choices=INCIDENT_TYPE_CHOICES)
+    partition = models.CharField(max_length=255, blank=True, default='')
+    maintenance_type = models.CharField(max_length=20, blank=True, default='')
+    incident_count = models.IntegerField(default=0)
+    downtime_minutes = models.BigIntegerField(default=0)
+    downtime_count = models.IntegerField(default=0)
+    
+    class Meta:
+        db_table = 'incident_daily_rollup'
+        ordering = ['day']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['day', 'incident_type', 'partition', 'maintenance_type'],
+                name='incident_rollup_unique'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['incident_type', 'day'], name='incident_rollup_type_day_idx'),
+        ]
+
+
+class DataVersion(models.Model):
+    """
+    Write counter of a table, shared by every worker.
+
+    Bumped after each incident write commits, and inside each equipment
+    write (see api.signals), so a process holding data built at version N
+    can tell with one indexed read whether another worker changed the
+    table since.
+    """
+    name = models.CharField(max_length=100, unique=True)
+    version = models.BigIntegerField(default=0)
+    
+    class Meta:
+        db_table = 'data_versions'
+    
+    def __str__(self):
+        return f"{self.name} v{self.version}"
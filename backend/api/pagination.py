@@ -0,0 +1,272 @@
+# Standard library imports
+import base64
+import binascii
+import json
+
+# Django imports
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import connections
+from django.db.models import F, Q
+
+# Django REST Framework imports
+from rest_framework import exceptions
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+# Local imports
+from .search import RANK_FIELD, ranked_ordering
+
+
+def estimate_count(queryset):
+    """
+    Return a cheap row estimate for a queryset.
+
+    On PostgreSQL the planner estimate is read from EXPLAIN, which costs a
+    planning pass instead of a full scan. Other backends fall back to an
+    exact count (they are only used for small local databases).
+    """
+    if connections[queryset.db].vendor != 'postgresql':
+        return queryset.count()
+    plan = json.loads(queryset.order_by().explain(format='json'))
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class KeysetPagination(BasePagination):
+    """
+    Opaque cursor pagination ordered on a stable (-created_at, -id) key.
+
+    Each page is fetched with a ``WHERE (created_at, id) < (...)`` condition
+    followed by ``LIMIT page_size + 1``, so paging deep into a table costs
+    the same as reading the first page. Every list is paginated: a request
+    without ``cursor`` gets the first ``page_size`` rows (PAGE_SIZE unless
+    ``?page_size=`` asks for another size, at most ``max_page_size``) and
+    follows ``next`` for the rest. Full exports go through ``?stream=``.
+
+    ``count`` is omitted by default; ``?count=exact`` runs a COUNT(*) and
+    ``?count=estimate`` returns the planner estimate.
+
+    Search results (``?q=``, see api.search) are paged on their relevance
+    rank first, the rank being part of the cursor.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = api_settings.PAGE_SIZE or 50
+    max_page_size = 500
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    invalid_cursor_message = 'Curseur invalide'
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+            if page_size > 0:
+                return min(page_size, self.max_page_size)
+        except (KeyError, ValueError):
+            pass
+        return self.page_size
+
+    def decode_cursor(self, request):
+        """Return the (position, reverse) pair encoded in the cursor parameter"""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+            position = payload['p']
+            reverse = bool(payload.get('r'))
+            if not isinstance(position, list) or len(position) != len(self.ordering):
+                raise ValueError(position)
+        except (TypeError, ValueError, KeyError, UnicodeError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def encode_cursor(self, position, reverse=False):
+        payload = {
+            'p': [value.isoformat() if hasattr(value, 'isoformat') else value for value in position],
+            'r': 1 if reverse else 0,
+        }
+        encoded = base64.urlsafe_b64encode(
+            json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        ).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_ordering(self, reverse=False, model=None):
+        """
+        ORDER BY terms; nullable columns of ``model`` sort NULLs last, so
+        NULLs first when paging backwards.
+        """
+        ordering = []
+        for field in self.ordering:
+            name = field.lstrip('-')
+            descending = field.startswith('-') != reverse
+            if self._nullable(model, name):
+                nulls = {'nulls_first': True} if reverse else {'nulls_last': True}
+                ordering.append(F(name).desc(**nulls) if descending else F(name).asc(**nulls))
+            else:
+                ordering.append(('-' if descending else '') + name)
+        return ordering
+
+    def get_keyset_filter(self, model, position, reverse=False):
+        """
+        Build the lexicographic "strictly after this position" condition.
+
+        (a, b) after (x, y) is expanded to ``a after x OR (a = x AND b after y)``
+        so every branch stays a plain indexable comparison. On a nullable
+        column the NULL rows are a block of their own at the end (at the
+        start when paging backwards).
+        """
+        condition = None
+        for field, value in reversed(list(zip(self.ordering, position))):
+            name = field.lstrip('-')
+            descending = field.startswith('-') != reverse
+            value = self._to_python(model, name, value)
+            if value is None:
+                # Only NULLs sort level with a NULL; non-NULLs follow when reversed
+                after = Q(**{f'{name}__isnull': True}) & condition if condition is not None else Q(pk__in=[])
+                if reverse:
+                    after |= Q(**{f'{name}__isnull': False})
+            else:
+                after = Q(**{f'{name}__{"lt" if descending else "gt"}': value})
+                if not reverse and self._nullable(model, name):
+                    after |= Q(**{f'{name}__isnull': True})
+                if condition is not None:
+                    after |= Q(**{name: value}) & condition
+            condition = after
+        return condition
+
+    def get_count(self, querysets, request):
+        mode = request.query_params.get(self.count_query_param)
+        if mode == 'exact':
+            return sum(queryset.count() for queryset in querysets)
+        if mode == 'estimate':
+            return sum(estimate_count(queryset) for queryset in querysets)
+        return None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.paginate_querysets([queryset], request, view=view)
+
+    def paginate_querysets(self, querysets, request, view=None):
+        """
+        Paginate the UNION ALL of querysets projected onto the same columns.
+
+        The keyset condition is pushed into every branch, then the union is
+        ordered and limited in the database.
+        """
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = ranked_ordering(querysets[0], self.ordering)
+        position, reverse = self.decode_cursor(request)
+        self.count = self.get_count(querysets, request)
+
+        if position is not None:
+            querysets = [
+                queryset.filter(self.get_keyset_filter(queryset.model, position, reverse))
+                for queryset in querysets
+            ]
+        if len(querysets) > 1:
+            combined = querysets[0].order_by().union(
+                *[queryset.order_by() for queryset in querysets[1:]], all=True
+            )
+        else:
+            combined = querysets[0]
+        rows = list(combined.order_by(*self.get_ordering(reverse, querysets[0].model))[:self.page_size + 1])
+        return self.build_page(rows, position, reverse)
+
+    def build_page(self, rows, position, reverse):
+        has_more = len(rows) > self.page_size
+        page = rows[:self.page_size]
+        if reverse:
+            page.reverse()
+            has_next, has_previous = position is not None, has_more
+        else:
+            has_next, has_previous = has_more, position is not None
+
+        self.next_position = self._position(page[-1]) if has_next and page else None
+        self.previous_position = self._position(page[0]) if has_previous and page else None
+        return page
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        return self.encode_cursor(self.next_position)
+
+    def get_previous_link(self):
+        if self.previous_position is None:
+            return None
+        return self.encode_cursor(self.previous_position, reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'results': data,
+            'count': self.count,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+        })
+
+    def _position(self, row):
+        return [self._value(row, field.lstrip('-')) for field in self.ordering]
+
+    @staticmethod
+    def _value(row, name):
+        return row[name] if isinstance(row, dict) else getattr(row, name)
+
+    @staticmethod
+    def _nullable(model, name):
+        try:
+            return model is not None and model._meta.get_field(name).null
+        except FieldDoesNotExist:
+            return False
+
+    def _to_python(self, model, name, value):
+        if name == RANK_FIELD:
+            # An annotation, not a model field
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise NotFound(self.invalid_cursor_message)
+            return value
+        try:
+            return model._meta.get_field(name).to_python(value)
+        except FieldDoesNotExist:
+            return value
+        except ValidationError:
+            raise NotFound(self.invalid_cursor_message)
+
+
+class FeedPagination(KeysetPagination):
+    """Keyset pagination for the hardware + software feed (see api.feed)"""
+    # incident_type breaks ties between rows of the two tables
+    ordering = ('-created_at', '-id', '-incident_type')
+
+
+class HistoryPagination(KeysetPagination):
+    """Keyset pagination of an equipment's incidents, most recent occurrence first"""
+    ordering = ('-date', '-time', '-id')
+
+
+class EquipmentPagination(KeysetPagination):
+    """
+    Keyset pagination of the equipment list on ``?sort=[-]<field>``.
+
+    Each sort column has an index on (column, id) (see Equipement.Meta), ties
+    are broken by id in the same direction.
+    """
+    sort_query_param = 'sort'
+    sort_fields = ('created_at', 'incident_count', 'corrective_count', 'total_downtime', 'last_incident_at')
+    default_sort = '-created_at'
+
+    def set_ordering(self, request):
+        """Read ``sort`` from the request; raises ValidationError for unknown fields"""
+        sort = request.query_params.get(self.sort_query_param) or self.default_sort
+        if sort.lstrip('-') not in self.sort_fields:
+            raise exceptions.ValidationError({
+                self.sort_query_param: f'Tri invalide. Valeurs possibles: {", ".join(self.sort_fields)}'
+            })
+        self.ordering = (sort, '-id' if sort.startswith('-') else 'id')
+        return self.ordering
+
+    def paginate_querysets(self, querysets, request, view=None):
+        self.set_ordering(request)
+        return super().paginate_querysets(querysets, request, view=view)
@@ -2,6 +2,14 @@
 from rest_framework import permissions
 
 
+def incident_visibility(role):
+    """Incident types a role may see, as keyword arguments for the stats and analytics helpers"""
+    return {
+        'include_hardware': role != 'service_integration',
+        'include_software': role != 'service_maintenance',
+    }
+
+
 class RoleBasedPermission(permissions.BasePermission):
     """Base permission class for role-based access control"""
     allowed_roles = []
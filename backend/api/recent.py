@@ -0,0 +1,134 @@
+# Standard library imports
+import threading
+
+# Django imports
+from django.conf import settings
+
+# Local imports
+from .models import HardwareIncident, SoftwareIncident, Equipement
+from .serializers import HardwareIncidentSerializer, SoftwareIncidentSerializer
+from .versions import get_versions
+
+RECENT_LIMIT = 5
+
+# Incident type -> (model, serializer, models whose versions the serialized rows depend on).
+# Hardware rows embed their equipment, so an equipment write invalidates them too.
+RECENT_SOURCES = {
+    'hardware': (HardwareIncident, HardwareIncidentSerializer, (HardwareIncident, Equipement)),
+    'software': (SoftwareIncident, SoftwareIncidentSerializer, (SoftwareIncident,)),
+}
+
+INCIDENT_TYPES = {model: incident_type for incident_type, (model, _, _) in RECENT_SOURCES.items()}
+
+
+def _sort_key(incident):
+    # Same order as the feed: newest created_at first, then highest id
+    return (incident.created_at, incident.id)
+
+
+class RecentIncidents:
+    """
+    Per-process buffer of the latest serialized incidents of each type.
+
+    Each type keeps at most ``size`` rows, newest first, together with the
+    DataVersion values they were read at. Local writes are applied in place
+    after commit (see api.signals); a write from another worker shows up as
+    a version this process did not produce, and that type is reloaded.
+    Serving ``recent`` therefore costs one query on the versions table.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.lock = threading.Lock()
+        self.entries = {incident_type: [] for incident_type in RECENT_SOURCES}
+        # None until loaded, and again whenever a type must be reloaded
+        self.versions = {incident_type: None for incident_type in RECENT_SOURCES}
+        # True when the table holds no more rows than the buffer
+        self.complete = {incident_type: False for incident_type in RECENT_SOURCES}
+
+    def _load(self, incident_type, versions):
+        model, serializer_class, _ = RECENT_SOURCES[incident_type]
+        queryset = model.objects.order_by('-created_at', '-id')
+        if model is HardwareIncident:
+            queryset = queryset.select_related('equipement')
+        incidents = list(queryset[:self.size])
+        serialized = serializer_class(incidents, many=True).data
+        self.entries[incident_type] = [
+            (_sort_key(incident), data) for incident, data in zip(incidents, serialized)
+        ]
+        self.complete[incident_type] = len(incidents) < self.size
+        self.versions[incident_type] = versions
+
+    def latest(self, incident_types, limit=RECENT_LIMIT):
+        """Latest ``limit`` serialized incidents across ``incident_types``, newest first"""
+        models = [model for incident_type in incident_types for model in RECENT_SOURCES[incident_type][2]]
+        current = dict(zip(models, get_versions(models)))
+        with self.lock:
+            rows = []
+            for incident_type in incident_types:
+                versions = tuple(current[model] for model in RECENT_SOURCES[incident_type][2])
+                if self.versions[incident_type] != versions:
+                    self._load(incident_type, versions)
+                rows.extend((key, incident_type, data) for key, data in self.entries[incident_type])
+        # Ties on (created_at, id) are broken by type like FEED_ORDERING
+        rows.sort(key=lambda row: (row[0], row[1]), reverse=True)
+        return [data for _, _, data in rows[:limit]]
+
+    def _follows(self, incident_type, version):
+        """
+        Whether ``version`` is the one right after the buffered data.
+
+        If not, another worker wrote in between and the type is marked for
+        reload instead of being patched.
+        """
+        known = self.versions[incident_type]
+        if known is None:
+            return False
+        if version != known[0] + 1:
+            self.versions[incident_type] = None
+            return False
+        self.versions[incident_type] = (version, *known[1:])
+        return True
+
+    def _remove(self, incident_type, pk):
+        self.entries[incident_type] = [(key, data) for key, data in self.entries[incident_type] if key[1] != pk]
+
+    def _check_size(self, incident_type):
+        # A partial buffer that can no longer fill a response is reloaded
+        if not self.complete[incident_type] and len(self.entries[incident_type]) < RECENT_LIMIT:
+            self.versions[incident_type] = None
+
+    def record_saved(self, instance, version):
+        """Insert or move a committed incident, ``version`` being the one its write produced"""
+        incident_type = INCIDENT_TYPES[type(instance)]
+        if self.versions[incident_type] is None:
+            # Not loaded yet: the next read fetches the incident anyway
+            return
+        _, serializer_class, _ = RECENT_SOURCES[incident_type]
+        data = serializer_class(instance).data
+        key = _sort_key(instance)
+        with self.lock:
+            if not self._follows(incident_type, version):
+                return
+            self._remove(incident_type, instance.pk)
+            entries = self.entries[incident_type]
+            position = next((index for index, (other, _) in enumerate(entries) if key > other), len(entries))
+            # Past the last buffered row, unbuffered rows may come first
+            if position < len(entries) or self.complete[incident_type]:
+                entries.insert(position, (key, data))
+            if len(entries) > self.size:
+                entries.pop()
+                self.complete[incident_type] = False
+            self._check_size(incident_type)
+
+    def record_deleted(self, model, pk, version):
+        """Drop a committed deletion"""
+        incident_type = INCIDENT_TYPES[model]
+        with self.lock:
+            if not self._follows(incident_type, version):
+                return
+            self._remove(incident_type, pk)
+            self._check_size(incident_type)
+
+
+recent_incidents = RecentIncidents(getattr(settings, 'API_RECENT_BUFFER_SIZE', 20))
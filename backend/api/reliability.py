@@ -0,0 +1,177 @@
+# Standard library imports
+from datetime import timedelta
+
+# Django imports
+from django.db import connections
+from django.utils import timezone
+
+# Django REST Framework imports
+from rest_framework.exceptions import ValidationError
+
+# Local imports
+from .filters import _parse_date
+from .models import Equipement
+
+# Incident timestamp and the hours between two of them, per database vendor
+TIMESTAMP_SQL = {
+    'postgresql': ('(h.date + h.time)', 'EXTRACT(EPOCH FROM (ts - prev_ts)) / 3600.0'),
+    'sqlite': ("julianday(h.date || ' ' || h.time)", '(ts - prev_ts) * 24.0'),
+}
+
+# How failures are grouped: a single equipment row, or every version of a serial
+GROUP_KEYS = {
+    'equipment': ('h.equipement_id', 'h.equipement_id IS NOT NULL'),
+    'serial': ('h.serial_key', "h.serial_key <> ''"),
+}
+
+SORT_FIELDS = ('failures', 'mtbf_hours', 'mttr_minutes', 'downtime_minutes', 'availability')
+
+DEFAULT_WINDOW_DAYS = 365
+
+RELIABILITY_SQL = """
+WITH failures AS (
+    SELECT {key} AS group_key,
+           h.duree_arret,
+           h.nom_de_equipement,
+           h.partition,
+           {timestamp} AS ts,
+           LAG({timestamp}) OVER (PARTITION BY {key} ORDER BY h.date, h.time, h.id) AS prev_ts
+    FROM hardware_incidents h
+    WHERE h.maintenance_type = 'corrective'
+      AND {key_condition}
+      AND h.date >= %s AND h.date <= %s
+      {partition_condition}
+), metrics AS (
+    SELECT group_key,
+           COUNT(*) AS failures,
+           AVG({interval}) AS mtbf_hours,
+           AVG(CASE WHEN duree_arret > 0 THEN duree_arret END) AS mttr_minutes,
+           COALESCE(SUM(CASE WHEN duree_arret > 0 THEN duree_arret END), 0) AS downtime_minutes,
+           MAX(nom_de_equipement) AS nom_de_equipement,
+           MAX(partition) AS partition
+    FROM failures
+    GROUP BY group_key
+), ranked AS (
+    SELECT metrics.*,
+           CASE WHEN downtime_minutes >= %s THEN 0.0
+                ELSE 1.0 - downtime_minutes * 1.0 / %s END AS availability
+    FROM metrics
+), page AS (
+    SELECT ranked.*
+    FROM ranked
+    ORDER BY ({sort} IS NULL), {sort} {direction}, group_key
+    LIMIT %s OFFSET %s
+)
+-- Always one row for the count, even when the page is past the end
+SELECT page.*, total.total_count
+FROM (SELECT COUNT(*) AS total_count FROM metrics) total
+LEFT JOIN page ON 1 = 1
+ORDER BY (page.{sort} IS NULL), page.{sort} {direction}, page.group_key
+"""
+
+
+def parse_reliability_params(params):
+    """Validate the leaderboard query parameters"""
+    today = timezone.now().date()
+    date_to = _parse_date('to', params['to']) if params.get('to') else today
+    date_from = (
+        _parse_date('from', params['from']) if params.get('from')
+        else date_to - timedelta(days=DEFAULT_WINDOW_DAYS - 1)
+    )
+    if date_from > date_to:
+        raise ValidationError({'from': 'La date de début doit précéder la date de fin'})
+
+    group = params.get('group') or 'equipment'
+    if group not in GROUP_KEYS:
+        raise ValidationError({'group': 'Regroupement invalide. Valeurs possibles: equipment, serial'})
+
+    sort = params.get('sort') or '-failures'
+    if sort.lstrip('-') not in SORT_FIELDS:
+        raise ValidationError({'sort': f'Tri invalide. Valeurs possibles: {", ".join(SORT_FIELDS)}'})
+
+    return {
+        'date_from': date_from,
+        'date_to': date_to,
+        'group': group,
+        'sort': sort,
+        'partition': (params.get('partition') or '').strip() or None,
+    }
+
+
+def reliability_leaderboard(options, limit, offset, using='default'):
+    """
+    MTBF, MTTR and availability of corrective hardware failures, one row per group.
+
+    A single statement computes everything. LAG() pairs each corrective
+    incident with the previous one of the same equipment (or serial), then
+    the metrics are aggregated, sorted and paginated in the database.
+
+    - mtbf_hours: mean time between consecutive failures.
+    - mttr_minutes: mean downtime of the failures that stopped the equipment.
+    - availability: 1 - downtime / window length.
+
+    Returns ``(rows, total_count)``.
+    """
+    connection = connections[using]
+    if connection.vendor not in TIMESTAMP_SQL:
+        raise ValidationError({'detail': 'Indicateurs de fiabilité non disponibles sur cette base de données'})
+
+    timestamp, interval = TIMESTAMP_SQL[connection.vendor]
+    key, key_condition = GROUP_KEYS[options['group']]
+    sort = options['sort'].lstrip('-')
+    direction = 'DESC' if options['sort'].startswith('-') else 'ASC'
+    window_minutes = ((options['date_to'] - options['date_from']).days + 1) * 24 * 60
+
+    params = [options['date_from'], options['date_to']]
+    partition_condition = ''
+    if options['partition']:
+        partition_condition = 'AND h.partition = %s'
+        params.append(options['partition'])
+    params += [window_minutes, window_minutes, limit, offset]
+
+    sql = RELIABILITY_SQL.format(
+        key=key,
+        key_condition=key_condition,
+        timestamp=timestamp,
+        interval=interval,
+        partition_condition=partition_condition,
+        sort=sort,
+        direction=direction,
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        columns = [column[0] for column in cursor.description]
+        rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    total_count = rows[0]['total_count']
+    # An empty page comes back as the single count row
+    rows = [row for row in rows if row['group_key'] is not None]
+    equipment = {}
+    if options['group'] == 'equipment':
+        equipment = Equipement.objects.using(using).in_bulk([row['group_key'] for row in rows])
+
+    results = []
+    for row in rows:
+        item = {
+            'failures': row['failures'],
+            'mtbf_hours': round(float(row['mtbf_hours']), 2) if row['mtbf_hours'] is not None else None,
+            'mttr_minutes': round(float(row['mttr_minutes']), 1) if row['mttr_minutes'] is not None else None,
+            'downtime_minutes': int(row['downtime_minutes']),
+            'availability': round(float(row['availability']), 5),
+        }
+        if options['group'] == 'equipment':
+            equip = equipment.get(row['group_key'])
+            item.update({
+                'equipement_id': row['group_key'],
+                'nom_equipement': equip.nom_equipement if equip else row['nom_de_equipement'],
+                'num_serie': equip.num_serie if equip else None,
+                'partition': equip.partition if equip else row['partition'],
+            })
+        else:
+            item.update({
+                'num_serie': row['group_key'],
+                'nom_equipement': row['nom_de_equipement'],
+                'partition': row['partition'],
+            })
+        results.append(item)
+    return results, total_count
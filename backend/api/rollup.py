@@ -0,0 +1,139 @@
+# Django imports
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, IntegerField, Q, Sum, Value
+from django.db.models.functions import Coalesce
+
+# Local imports
+from .models import HardwareIncident, SoftwareIncident, IncidentDailyRollup
+
+ROLLUP_TYPES = {
+    HardwareIncident: 'hardware',
+    SoftwareIncident: 'software',
+}
+
+COUNTERS = ('incident_count', 'downtime_minutes', 'downtime_count')
+
+
+def _contribution(model, values):
+    """Rollup key and counter values of one incident, or None without a date"""
+    if values.get('date') is None:
+        return None
+    downtime = values.get('duree_arret') or 0
+    if downtime < 0:
+        downtime = 0
+    key = {
+        'day': values['date'],
+        'incident_type': ROLLUP_TYPES[model],
+        'partition': values.get('partition') or '',
+        'maintenance_type': values.get('maintenance_type') or '',
+    }
+    return key, (1, downtime, 1 if downtime else 0)
+
+
+def _apply(contribution, sign, using):
+    key, counts = contribution
+    deltas = {name: sign * count for name, count in zip(COUNTERS, counts)}
+    rows = IncidentDailyRollup.objects.using(using).filter(**key)
+    updated = rows.update(**{name: F(name) + delta for name, delta in deltas.items()})
+    if sign < 0:
+        rows.filter(incident_count__lte=0).delete()
+    elif not updated:
+        try:
+            with transaction.atomic(using=using):
+                IncidentDailyRollup.objects.using(using).create(**key, **deltas)
+        except IntegrityError:
+            # A concurrent write created the row first
+            rows.update(**{name: F(name) + delta for name, delta in deltas.items()})
+
+
+def _current_values(instance):
+    # to_python: create() and assignments may hold strings (e.g. date='2026-03-02')
+    meta = instance._meta
+    return {name: meta.get_field(name).to_python(getattr(instance, name)) for name in type(instance).tracked_fields}
+
+
+def load_previous_values(instance, using):
+    """
+    Make sure ``instance._loaded_values`` holds the stored rollup fields.
+
+    They are normally captured by from_db(); instances built by hand or
+    loaded with only()/defer() are read back from the database.
+    """
+    model = type(instance)
+    if instance._state.adding or instance.pk is None:
+        return
+    loaded = getattr(instance, '_loaded_values', {})
+    if all(name in loaded for name in model.tracked_fields):
+        return
+    stored = model._base_manager.using(using).filter(pk=instance.pk).values(*model.tracked_fields).first()
+    instance._loaded_values = stored or {}
+
+
+def record_incident_saved(instance, created, using):
+    """Move an incident's contribution from its previous rollup row to the current one"""
+    model = type(instance)
+    previous = None
+    if not created and getattr(instance, '_loaded_values', None):
+        previous = _contribution(model, instance._loaded_values)
+    current = _contribution(model, _current_values(instance))
+    if previous != current:
+        if previous is not None:
+            _apply(previous, -1, using)
+        if current is not None:
+            _apply(current, 1, using)
+    instance._loaded_values = _current_values(instance)
+
+
+def record_incident_deleted(instance, using):
+    model = type(instance)
+    values = getattr(instance, '_loaded_values', None) or _current_values(instance)
+    contribution = _contribution(model, values)
+    if contribution is not None:
+        _apply(contribution, -1, using)
+
+
+def _rollup_groups(model, using):
+    """Rollup rows of one incident table, grouped in the database"""
+    if model is HardwareIncident:
+        maintenance_type = Coalesce('maintenance_type', Value(''))
+        downtime = Q(duree_arret__gt=0)
+        counters = {
+            'downtime_minutes': Coalesce(Sum('duree_arret', filter=downtime), 0),
+            'downtime_count': Count('id', filter=downtime),
+        }
+    else:
+        # Software incidents never record downtime
+        maintenance_type = Value('')
+        counters = {
+            'downtime_minutes': Value(0, output_field=IntegerField()),
+            'downtime_count': Value(0, output_field=IntegerField()),
+        }
+    return (
+        model._base_manager.using(using)
+        .filter(date__isnull=False)
+        .annotate(rollup_partition=Coalesce('partition', Value('')), rollup_maintenance_type=maintenance_type)
+        .values('date', 'rollup_partition', 'rollup_maintenance_type')
+        .annotate(incident_count=Count('id'), **counters)
+        .order_by()
+    )
+
+
+def rebuild_rollup(using='default'):
+    """Recompute the whole rollup table from the incident tables, returns the row count"""
+    with transaction.atomic(using=using):
+        rows = [
+            IncidentDailyRollup(
+                day=group['date'],
+                incident_type=incident_type,
+                partition=group['rollup_partition'],
+                maintenance_type=group['rollup_maintenance_type'],
+                incident_count=group['incident_count'],
+                downtime_minutes=group['downtime_minutes'],
+                downtime_count=group['downtime_count'],
+            )
+            for model, incident_type in ROLLUP_TYPES.items()
+            for group in _rollup_groups(model, using)
+        ]
+        IncidentDailyRollup.objects.using(using).all().delete()
+        IncidentDailyRollup.objects.using(using).bulk_create(rows, batch_size=1000)
+    return len(rows)
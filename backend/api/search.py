@@ -0,0 +1,175 @@
+# Django imports
+from django.db import connections
+from django.db.models import BooleanField, Case, Count, FloatField, IntegerField, Max, Q, Value, When
+from django.db.models.constants import OnConflict
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Upper
+
+# Local imports
+from .models import HardwareIncident, SoftwareIncident, Report, Equipement, EquipementSerialTrigram
+
+# Text search configuration created by migration 0007 (french + unaccent)
+SEARCH_CONFIG = 'enna_french'
+
+# Columns folded into each table's generated "search_vector" column, with
+# their weight (see migration 0007). Also used by the non-PostgreSQL fallback.
+SEARCH_FIELDS = {
+    HardwareIncident: (('description', 'A'), ('anomalie_observee', 'B'), ('action_realisee', 'C')),
+    SoftwareIncident: (('description', 'A'), ('commentaires', 'B')),
+    Report: (('anomaly', 'A'), ('analysis', 'B'), ('conclusion', 'B')),
+}
+
+# ts_rank's default weight per label, reused to rank the fallback hits
+RANK_WEIGHTS = {'A': 1.0, 'B': 0.4, 'C': 0.2, 'D': 0.1}
+
+# Annotation holding the relevance of each hit
+RANK_FIELD = 'search_rank'
+
+
+def search_queryset(queryset, query):
+    """
+    Filter a queryset on a free-text query and order it by relevance.
+
+    On PostgreSQL the match runs against the GIN-indexed ``search_vector``
+    generated column and hits are ranked with ``ts_rank``. Other backends
+    (local SQLite test databases) fall back to requiring every word in at
+    least one of the searched columns, ranked by the weights of the columns
+    each word matched.
+    """
+    query = (query or '').strip()
+    if not query:
+        return queryset
+
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql':
+        vector = f'{connection.ops.quote_name(queryset.model._meta.db_table)}.search_vector'
+        tsquery = f"websearch_to_tsquery('{SEARCH_CONFIG}', %s)"
+        queryset = queryset.filter(
+            RawSQL(f'{vector} @@ {tsquery}', [query], output_field=BooleanField())
+        ).annotate(**{
+            # float8 so the rank survives a round trip through a keyset cursor
+            RANK_FIELD: RawSQL(f'ts_rank({vector}, {tsquery})::float8', [query], output_field=FloatField())
+        })
+        return queryset.order_by(*ranked_ordering(queryset, ('-created_at', '-id')))
+
+    condition = Q()
+    rank = Value(0.0, output_field=FloatField())
+    for word in query.split():
+        word_condition = Q()
+        for field, weight in SEARCH_FIELDS[queryset.model]:
+            word_condition |= Q(**{f'{field}__icontains': word})
+            rank += Case(
+                When(**{f'{field}__icontains': word}, then=Value(RANK_WEIGHTS[weight])),
+                default=Value(0.0),
+                output_field=FloatField(),
+            )
+        condition &= word_condition
+    queryset = queryset.filter(condition).annotate(**{RANK_FIELD: rank})
+    return queryset.order_by(*ranked_ordering(queryset, ('-created_at', '-id')))
+
+
+def ranked_ordering(queryset, ordering):
+    """
+    ``ordering`` preceded by the relevance rank when ``queryset`` comes from
+    search_queryset, so paginated and exported hits keep their ranked order.
+    """
+    if RANK_FIELD in queryset.query.annotations and f'-{RANK_FIELD}' not in ordering:
+        return (f'-{RANK_FIELD}', *ordering)
+    return tuple(ordering)
+
+
+def serial_trigrams(num_serie):
+    """
+    Trigrams of an upper-cased serial, padded so that every substring of up
+    to three characters is the prefix of one of them.
+    """
+    padded = num_serie.strip().upper() + '  '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def sync_serial_trigrams(serials, using='default'):
+    """Bring the trigram table in line with the equipment rows for the given serials"""
+    if connections[using].vendor == 'postgresql':
+        return
+    for num_serie in {serial for serial in serials if serial}:
+        if Equipement.objects.using(using).filter(num_serie=num_serie).exists():
+            add_serial_trigrams([num_serie], using=using)
+        else:
+            EquipementSerialTrigram.objects.using(using).filter(num_serie=num_serie).delete()
+
+
+def add_serial_trigrams(serials, using='default'):
+    """
+    Index serials known to exist (bulk writes that only add equipment rows).
+
+    Written with a single executemany: building a model instance per
+    trigram is what dominates large imports.
+    """
+    connection = connections[using]
+    if connection.vendor == 'postgresql':
+        return
+    quote = connection.ops.quote_name
+    sql = '{} {} ({}, {}) VALUES (%s, %s)'.format(
+        connection.ops.insert_statement(on_conflict=OnConflict.IGNORE),
+        quote(EquipementSerialTrigram._meta.db_table), quote('trigram'), quote('num_serie'),
+    )
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, [
+            (trigram, num_serie)
+            for num_serie in {serial for serial in serials if serial}
+            for trigram in serial_trigrams(num_serie)
+        ])
+
+
+def _similarity(needle, num_serie):
+    needle_trigrams = serial_trigrams(needle)
+    serial_trigram_set = serial_trigrams(num_serie)
+    return len(needle_trigrams & serial_trigram_set) / len(needle_trigrams | serial_trigram_set)
+
+
+def autocomplete_serials(query, limit=10, using='default'):
+    """
+    Serial numbers containing ``query``, prefix matches first, then by similarity.
+
+    PostgreSQL answers from the pg_trgm GIN index on UPPER(num_serie). Other
+    backends narrow the candidates with the equipement_serial_trigrams table
+    and rank them in Python.
+    """
+    needle = (query or '').strip().upper()
+    if not needle:
+        return []
+
+    if connections[using].vendor == 'postgresql':
+        return list(
+            Equipement.objects.using(using)
+            .annotate(serie_upper=Upper('num_serie'))
+            .filter(serie_upper__contains=needle)
+            .values('num_serie')
+            .annotate(
+                is_prefix=Max(Case(
+                    When(serie_upper__startswith=needle, then=Value(1)),
+                    default=Value(0),
+                    output_field=IntegerField(),
+                )),
+                similarity=Max(RawSQL('similarity(UPPER("equipement"."num_serie"), %s)', [needle])),
+            )
+            .order_by('-is_prefix', '-similarity', 'num_serie')
+            .values_list('num_serie', flat=True)[:limit]
+        )
+
+    trigrams = EquipementSerialTrigram.objects.using(using)
+    if len(needle) < 3:
+        candidates = trigrams.filter(trigram__startswith=needle)
+    else:
+        needle_trigrams = {needle[i:i + 3] for i in range(len(needle) - 2)}
+        candidates = trigrams.filter(trigram__in=needle_trigrams).values('num_serie').annotate(
+            matched=Count('trigram', distinct=True)
+        ).filter(matched=len(needle_trigrams))
+    serials = [
+        num_serie for num_serie in set(candidates.values_list('num_serie', flat=True))
+        if needle in num_serie.upper()
+    ]
+    serials.sort(key=lambda num_serie: (
+        not num_serie.upper().startswith(needle), -_similarity(needle, num_serie), num_serie
+    ))
+    return serials[:limit]
@@ -3,6 +3,8 @@ from datetime import datetime
 
 # Django imports
 from django.contrib.auth import authenticate
+from django.db import models
+from django.db.models import prefetch_related_objects
 from django.utils import timezone
 
 # Django REST Framework imports
@@ -80,18 +82,38 @@ class LoginSerializer(serializers.Serializer):
 class EquipmentSerializer(serializers.ModelSerializer):
     class Meta:
         model = Equipement
-        fields = ['id', 'num_serie', 'nom_equipement', 'partition', 'etat', 'created_at', 'updated_at']
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        fields = [
+            'id', 'num_serie', 'nom_equipement', 'partition', 'etat',
+            'valid_from', 'valid_to', 'incident_count', 'corrective_count',
+            'total_downtime', 'last_incident_at', 'created_at', 'updated_at'
+        ]
+        read_only_fields = [
+            'id', 'valid_from', 'valid_to', 'incident_count', 'corrective_count',
+            'total_downtime', 'last_incident_at', 'created_at', 'updated_at'
+        ]
+
+
+class HardwareIncidentListSerializer(serializers.ListSerializer):
+    """List serializer resolving the nested equipment of all incidents in one query"""
+    
+    def to_representation(self, data):
+        incidents = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        # No-op for rows already loaded with select_related('equipement')
+        prefetch_related_objects(incidents, 'equipement')
+        return super().to_representation(incidents)
 
 
 class HardwareIncidentSerializer(serializers.ModelSerializer):
+    public_id = serializers.CharField(read_only=True)
     incident_type = serializers.SerializerMethodField()
+    equipement_id = serializers.IntegerField(allow_null=True, required=False)
     equipment = serializers.SerializerMethodField()
     
     class Meta:
         model = HardwareIncident
+        list_serializer_class = HardwareIncidentListSerializer
         fields = [
-            'id', 'incident_type', 'date', 'time', 'nom_de_equipement', 'partition',
+            'id', 'public_id', 'incident_type', 'date', 'time', 'nom_de_equipement', 'partition',
             'numero_de_serie', 'equipement_id', 'equipment', 'description',
             'anomalie_observee', 'action_realisee', 'piece_de_rechange_utilisee',
             'etat_de_equipement_apres_intervention', 'recommendation', 'duree_arret',
@@ -103,18 +125,15 @@ class HardwareIncidentSerializer(serializers.ModelSerializer):
         return 'hardware'
     
     def get_equipment(self, obj):
-        if obj.equipement_id:
-            try:
-                equip = Equipement.objects.get(id=obj.equipement_id)
-                return {
-                    'id': equip.id,
-                    'nom_equipement': equip.nom_equipement,
-                    'partition': equip.partition,
-                    'num_serie': equip.num_serie
-                }
-            except Equipement.DoesNotExist:
-                return None
-        return None
+        equip = obj.equipement
+        if equip is None:
+            return None
+        return {
+            'id': equip.id,
+            'nom_equipement': equip.nom_equipement,
+            'partition': equip.partition,
+            'num_serie': equip.num_serie
+        }
     
     def validate(self, attrs):
         # Set default date and time if not provided (using UTC/GMT)
@@ -146,12 +165,13 @@ class HardwareIncidentSerializer(serializers.ModelSerializer):
 
 
 class SoftwareIncidentSerializer(serializers.ModelSerializer):
+    public_id = serializers.CharField(read_only=True)
     incident_type = serializers.SerializerMethodField()
     
     class Meta:
         model = SoftwareIncident
         fields = [
-            'id', 'incident_type', 'date', 'time', 'simulateur', 'salle_operationnelle',
+            'id', 'public_id', 'incident_type', 'date', 'time', 'simulateur', 'salle_operationnelle',
             'server', 'partition', 'position_STA', 'type_d_anomalie', 'indicatif',
             'nom_radar', 'FL', 'longitude', 'latitude', 'code_SSR', 'sujet',
             'description', 'commentaires', 'created_at', 'updated_at'
@@ -173,7 +193,7 @@ class SoftwareIncidentSerializer(serializers.ModelSerializer):
 
 
 class ReportSerializer(serializers.ModelSerializer):
-    incident = serializers.IntegerField(source='software_incident.id', read_only=True)
+    incident = serializers.IntegerField(source='software_incident_id', read_only=True)
     incident_type = serializers.SerializerMethodField()
     
     class Meta:
@@ -0,0 +1,111 @@
+# Django imports
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+# Local imports
+from .cache import bump_generation
+from .catalog import equipment_catalog
+from .counters import record_equipment_incident_deleted, record_equipment_incident_saved
+from .models import Equipement, HardwareIncident, SoftwareIncident, Report
+from .recent import recent_incidents
+from .rollup import ROLLUP_TYPES, load_previous_values, record_incident_deleted, record_incident_saved
+from .search import add_serial_trigrams, sync_serial_trigrams
+from .versions import bump_version
+
+# Models whose writes invalidate the cached responses (see api.cache)
+CACHED_MODELS = (HardwareIncident, SoftwareIncident, Report, Equipement)
+
+
+def invalidate_cache(sender, using, **kwargs):
+    # Bump after commit, so a concurrent request cannot cache the old rows
+    # under the new generation
+    transaction.on_commit(lambda: bump_generation(sender), using=using)
+
+
+for model in CACHED_MODELS:
+    post_save.connect(invalidate_cache, sender=model, dispatch_uid=f'invalidate_cache_save_{model.__name__}')
+    post_delete.connect(invalidate_cache, sender=model, dispatch_uid=f'invalidate_cache_delete_{model.__name__}')
+
+
+@receiver(post_save, sender=Equipement)
+def equipement_saved(sender, instance, created, using, update_fields, **kwargs):
+    """Keep the serial trigram table in sync (no-op on PostgreSQL, see api.search)"""
+    if update_fields is not None and 'num_serie' not in update_fields:
+        return
+    loaded = getattr(instance, '_loaded_values', {})
+    if created:
+        add_serial_trigrams([instance.num_serie], using=using)
+    elif 'num_serie' not in loaded:
+        # Saved without being loaded first: the previous serial is unknown
+        sync_serial_trigrams([instance.num_serie], using=using)
+    elif loaded['num_serie'] != instance.num_serie:
+        sync_serial_trigrams([loaded['num_serie']], using=using)
+        add_serial_trigrams([instance.num_serie], using=using)
+    instance._loaded_values = {**loaded, 'num_serie': instance.num_serie}
+
+
+@receiver(post_delete, sender=Equipement)
+def equipement_deleted(sender, instance, using, **kwargs):
+    sync_serial_trigrams([instance.num_serie], using=using)
+
+
+def incident_pre_save(sender, instance, using, raw, **kwargs):
+    if not raw:
+        load_previous_values(instance, using)
+
+
+def incident_saved(sender, instance, created, using, raw, **kwargs):
+    """Keep the daily rollup and equipment counters in step (same transaction as the incident write)"""
+    if not raw:
+        if sender is HardwareIncident:
+            # Before the rollup, which moves _loaded_values to the new values
+            record_equipment_incident_saved(instance, created, using)
+        record_incident_saved(instance, created, using)
+
+
+def incident_deleted(sender, instance, using, **kwargs):
+    if sender is HardwareIncident:
+        record_equipment_incident_deleted(instance, using)
+    record_incident_deleted(instance, using)
+
+
+for model in ROLLUP_TYPES:
+    pre_save.connect(incident_pre_save, sender=model, dispatch_uid=f'rollup_pre_save_{model.__name__}')
+    post_save.connect(incident_saved, sender=model, dispatch_uid=f'rollup_save_{model.__name__}')
+    post_delete.connect(incident_deleted, sender=model, dispatch_uid=f'rollup_delete_{model.__name__}')
+
+
+def incident_version_saved(sender, instance, using, raw, **kwargs):
+    """Once committed, bump the table version and patch this process's recent buffer"""
+    def committed():
+        version = bump_version(sender, using=using)
+        if not raw:
+            recent_incidents.record_saved(instance, version)
+    transaction.on_commit(committed, using=using)
+
+
+def incident_version_deleted(sender, instance, using, **kwargs):
+    # The collector clears instance.pk after deleting
+    pk = instance.pk
+
+    def committed():
+        version = bump_version(sender, using=using)
+        recent_incidents.record_deleted(sender, pk, version)
+    transaction.on_commit(committed, using=using)
+
+
+def equipement_version_changed(sender, using, **kwargs):
+    # Hardware incidents embed their equipment: other buffers reload on the next read.
+    # Other workers drop their equipment catalog the same way; this one right away.
+    # Bumped inside the write (equipment writes are rare): a catalog entry read
+    # from a version that is rolled back is then dropped with it.
+    bump_version(sender, using=using)
+    transaction.on_commit(equipment_catalog.clear, using=using)
+
+
+for model in (HardwareIncident, SoftwareIncident):
+    post_save.connect(incident_version_saved, sender=model, dispatch_uid=f'version_save_{model.__name__}')
+    post_delete.connect(incident_version_deleted, sender=model, dispatch_uid=f'version_delete_{model.__name__}')
+post_save.connect(equipement_version_changed, sender=Equipement, dispatch_uid='version_save_Equipement')
+post_delete.connect(equipement_version_changed, sender=Equipement, dispatch_uid='version_delete_Equipement')
@@ -0,0 +1,107 @@
+# Standard library imports
+from datetime import timedelta
+
+# Django imports
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+# Local imports
+from .filters import filter_incidents
+from .models import HardwareIncident, SoftwareIncident, IncidentDailyRollup
+
+# Facet name -> columns it is read from, per incident table
+INCIDENT_FACETS = {
+    'partition': {HardwareIncident: 'partition', SoftwareIncident: 'partition'},
+    'maintenance_type': {HardwareIncident: 'maintenance_type'},
+    'server': {SoftwareIncident: 'server'},
+    'type_d_anomalie': {SoftwareIncident: 'type_d_anomalie'},
+    'nom_radar': {SoftwareIncident: 'nom_radar'},
+}
+
+
+def rollup_stats(incident_types, since_7, since_30):
+    """Totals, period buckets and downtime per incident type, in one query on the rollup"""
+    rows = (
+        IncidentDailyRollup.objects.filter(incident_type__in=incident_types)
+        .values('incident_type')
+        .annotate(
+            total=Sum('incident_count'),
+            last_7_days=Sum('incident_count', filter=Q(day__gte=since_7)),
+            last_30_days=Sum('incident_count', filter=Q(day__gte=since_30)),
+            downtime_total=Sum('downtime_minutes'),
+            downtime_count=Sum('downtime_count'),
+        )
+        .order_by()
+    )
+    return {row['incident_type']: row for row in rows}
+
+
+def incident_stats(include_hardware=True, include_software=True):
+    """
+    Dashboard statistics, read from the daily rollup (see api.rollup).
+
+    The cost depends on the number of days with incidents, not on the
+    number of incidents. Types a role cannot see report zeros.
+    """
+    today = timezone.now().date()
+    since_7 = today - timedelta(days=7)
+    since_30 = today - timedelta(days=30)
+
+    incident_types = []
+    if include_hardware:
+        incident_types.append('hardware')
+    if include_software:
+        incident_types.append('software')
+    by_type = rollup_stats(incident_types, since_7, since_30) if incident_types else {}
+    hardware = by_type.get('hardware', {})
+    software = by_type.get('software', {})
+
+    hardware_count = hardware.get('total') or 0
+    software_count = software.get('total') or 0
+    downtime_total = hardware.get('downtime_total') or 0
+    downtime_count = hardware.get('downtime_count') or 0
+
+    return {
+        'total_incidents': hardware_count + software_count,
+        'hardware_incidents': hardware_count,
+        'software_incidents': software_count,
+        'hardware_downtime_minutes': int(downtime_total),
+        'hardware_avg_downtime_minutes': int(round(downtime_total / downtime_count)) if downtime_count else None,
+        'hardware_incidents_with_downtime': downtime_count,
+        'hardware_downtime_percentage': int(downtime_count / hardware_count * 100) if hardware_count > 0 else 0,
+        'hardware_last_7_days': hardware.get('last_7_days') or 0,
+        'hardware_last_30_days': hardware.get('last_30_days') or 0,
+        'software_last_7_days': software.get('last_7_days') or 0,
+        'software_last_30_days': software.get('last_30_days') or 0,
+    }
+
+
+def incident_facets(params, include_hardware=True, include_software=True):
+    """
+    Distinct values of the filterable columns with their incident counts.
+
+    The incident filters in ``params`` apply, so counts match what the list
+    would return. Each facet is one GROUP BY per table; partition counts
+    are merged across tables.
+    """
+    querysets = []
+    if include_hardware:
+        querysets.append(filter_incidents(HardwareIncident.objects.all(), params))
+    if include_software:
+        querysets.append(filter_incidents(SoftwareIncident.objects.all(), params))
+
+    facets = {}
+    for name, columns in INCIDENT_FACETS.items():
+        counts = {}
+        for queryset in querysets:
+            column = columns.get(queryset.model)
+            if column is None:
+                continue
+            rows = (
+                queryset.exclude(**{f'{column}__isnull': True}).exclude(**{column: ''})
+                .order_by().values(column).annotate(count=Count('id')).values_list(column, 'count')
+            )
+            for value, count in rows:
+                counts[value] = counts.get(value, 0) + count
+        facets[name] = [{'value': value, 'count': count} for value, count in sorted(counts.items())]
+    return facets
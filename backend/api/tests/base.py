@@ -0,0 +1,75 @@
+# Standard library imports
+from datetime import date, time, timedelta
+
+# Django imports
+from django.utils import timezone
+
+# Django REST Framework imports
+from rest_framework.test import APIClient, APITestCase
+
+# Local imports
+from ..cache import get_cache
+from ..catalog import equipment_catalog
+from ..models import User, HardwareIncident, SoftwareIncident
+from ..recent import recent_incidents
+
+
+def create_user(role, username=None):
+    return User.objects.create_user(username=username or role, password='motdepasse-test', role=role)
+
+
+def hardware_incident(**fields):
+    values = {
+        'date': date(2026, 3, 2),
+        'time': time(8, 30),
+        'nom_de_equipement': 'Radar primaire',
+        'partition': 'P1',
+        'description': 'Panne alimentation',
+    }
+    values.update(fields)
+    return HardwareIncident.objects.create(**values)
+
+
+def software_incident(**fields):
+    values = {
+        'date': date(2026, 3, 2),
+        'time': time(9, 0),
+        'server': 'SRV-1',
+        'description': 'Perte de piste',
+    }
+    values.update(fields)
+    return SoftwareIncident.objects.create(**values)
+
+
+def spread_created_at(incidents, start=None):
+    """Give ``incidents`` distinct created_at values, the first one oldest"""
+    start = start or timezone.now() - timedelta(days=1)
+    for offset, incident in enumerate(incidents):
+        type(incident).objects.filter(pk=incident.pk).update(created_at=start + timedelta(minutes=offset))
+        incident.refresh_from_db()
+    return incidents
+
+
+class ApiTestCase(APITestCase):
+    """
+    Test case with one user per role.
+
+    The response cache, the equipment catalog and the recent buffer live in
+    the process and outlive each test's rolled back transaction: they are
+    reset before every test.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = {role: create_user(role) for role, _ in User.ROLE_CHOICES}
+
+    def setUp(self):
+        get_cache().clear()
+        equipment_catalog.clear()
+        for incident_type in recent_incidents.versions:
+            recent_incidents.versions[incident_type] = None
+
+    def client_for(self, role):
+        client = APIClient()
+        client.force_authenticate(self.users[role])
+        return client
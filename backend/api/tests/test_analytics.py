@@ -0,0 +1,32 @@
+# Local imports
+from .base import ApiTestCase, hardware_incident, software_incident
+
+
+class IncidentPivotTests(ApiTestCase):
+
+    def setUp(self):
+        super().setUp()
+        hardware_incident(partition='P1', maintenance_type='corrective', duree_arret=20)
+        hardware_incident(partition='P1', maintenance_type='preventive')
+        software_incident(partition='P1')
+        software_incident(partition='P2')
+
+    def pivot(self, query):
+        response = self.client_for('superadmin').get(f'/api/analytics/pivot/?year=2026&{query}')
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def test_partition_rows_count_both_types(self):
+        pivot = self.pivot('rows=partition')
+        self.assertEqual(pivot['rows'], ['P1', 'P2'])
+        self.assertEqual(pivot['row_totals']['count'], [3, 1])
+        self.assertEqual(pivot['count'][0][2], 3)
+
+    def test_maintenance_type_filter_excludes_software(self):
+        pivot = self.pivot('rows=partition&maintenance_type=corrective')
+        self.assertEqual(pivot['rows'], ['P1'])
+        self.assertEqual(pivot['total'], {'count': 1, 'downtime_minutes': 20})
+
+    def test_maintenance_type_filter_leaves_software_rows_empty(self):
+        pivot = self.pivot('rows=server&maintenance_type=corrective&layout=records')
+        self.assertEqual(pivot, {'results': []})
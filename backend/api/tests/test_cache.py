@@ -0,0 +1,58 @@
+# Local imports
+from ..cache import _generation_key, bump_generation, get_cache, get_generations
+from ..models import HardwareIncident
+from .base import ApiTestCase, hardware_incident
+
+
+class ResponseCacheTests(ApiTestCase):
+
+    def get(self, url, role='superadmin'):
+        response = self.client_for(role).get(url)
+        self.assertEqual(response.status_code, 200, response.data)
+        return response
+
+    def test_second_request_is_a_hit(self):
+        self.assertEqual(self.get('/api/incidents/stats/')['X-Cache'], 'MISS')
+        self.assertEqual(self.get('/api/incidents/stats/')['X-Cache'], 'HIT')
+
+    def test_entries_are_per_role(self):
+        self.get('/api/incidents/stats/')
+        self.assertEqual(self.get('/api/incidents/stats/', role='service_maintenance')['X-Cache'], 'MISS')
+
+    def test_parameter_order_shares_an_entry(self):
+        self.get('/api/analytics/summary/?year=2026&period=week')
+        self.assertEqual(self.get('/api/analytics/summary/?period=week&year=2026')['X-Cache'], 'HIT')
+        self.assertEqual(self.get('/api/analytics/summary/?year=2025&period=week')['X-Cache'], 'MISS')
+
+    def test_write_invalidates_after_commit(self):
+        self.get('/api/incidents/stats/')
+        with self.captureOnCommitCallbacks() as callbacks:
+            hardware_incident()
+
+        # Not committed yet: the cached response is still served
+        response = self.get('/api/incidents/stats/')
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(response.data['hardware_incidents'], 0)
+
+        for callback in callbacks:
+            callback()
+        response = self.get('/api/incidents/stats/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['hardware_incidents'], 1)
+
+    def test_delete_invalidates(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            incident = hardware_incident()
+        self.assertEqual(self.get('/api/incidents/stats/').data['hardware_incidents'], 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            incident.delete()
+        response = self.get('/api/incidents/stats/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['hardware_incidents'], 0)
+
+    def test_bump_after_eviction_starts_a_new_generation(self):
+        [before] = get_generations([HardwareIncident])
+        get_cache().delete(_generation_key(HardwareIncident))
+        bump_generation(HardwareIncident)
+        [after] = get_generations([HardwareIncident])
+        self.assertNotEqual(after, before)
@@ -0,0 +1,39 @@
+# Django imports
+from django.test import TestCase
+
+# Local imports
+from ..catalog import equipment_catalog
+from ..models import Equipement
+
+
+class EquipmentCatalogTests(TestCase):
+
+    def setUp(self):
+        equipment_catalog.clear()
+        self.equipment = Equipement.objects.create(num_serie='RAD-1', nom_equipement='Radar', partition='P1')
+
+    def test_miss_and_hit_cost_one_query_each(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(equipment_catalog.resolve(' rad-1 ').pk, self.equipment.pk)
+        with self.assertNumQueries(1):
+            self.assertEqual(equipment_catalog.resolve('RAD-1').pk, self.equipment.pk)
+
+    def test_unknown_serials_are_remembered(self):
+        self.assertIsNone(equipment_catalog.resolve('INCONNU'))
+        with self.assertNumQueries(1):
+            self.assertIsNone(equipment_catalog.resolve('INCONNU'))
+
+    def test_callers_get_their_own_copy(self):
+        first = equipment_catalog.resolve('RAD-1')
+        first.nom_equipement = 'Modifié'
+        second = equipment_catalog.resolve('RAD-1')
+        self.assertIsNot(first, second)
+        self.assertEqual(second.nom_equipement, 'Radar')
+
+    def test_equipment_writes_drop_the_entries(self):
+        equipment_catalog.resolve('RAD-1')
+        Equipement.objects.filter(pk=self.equipment.pk).update(etat='ancien')
+        # update() bypasses the signals: the entry is still served
+        self.assertEqual(equipment_catalog.resolve('RAD-1').etat, 'actuel')
+        newer = Equipement.objects.create(num_serie='RAD-1', nom_equipement='Radar 2', partition='P1')
+        self.assertEqual(equipment_catalog.resolve('RAD-1').pk, newer.pk)
@@ -0,0 +1,61 @@
+# Standard library imports
+from datetime import date, datetime, time
+from zoneinfo import ZoneInfo
+
+# Django imports
+from django.conf import settings
+from django.test import TestCase
+
+# Local imports
+from ..counters import reconcile_counters
+from ..models import Equipement, HardwareIncident
+from .base import hardware_incident
+
+
+class EquipmentCounterTests(TestCase):
+
+    def setUp(self):
+        self.equipment = Equipement.objects.create(num_serie='RAD-1', nom_equipement='Radar', partition='P1')
+
+    def counters(self, equipment=None):
+        equipment = Equipement.objects.get(pk=(equipment or self.equipment).pk)
+        return (equipment.incident_count, equipment.corrective_count, equipment.total_downtime,
+                equipment.last_incident_at)
+
+    def instant(self, day, at):
+        return datetime.combine(day, at, tzinfo=ZoneInfo(settings.TIME_ZONE))
+
+    def test_incident_writes_move_the_counters(self):
+        first = hardware_incident(equipement=self.equipment, maintenance_type='corrective', duree_arret=30)
+        hardware_incident(equipement=self.equipment, date=date(2026, 3, 5), time=time(10, 0), duree_arret=-5)
+        self.assertEqual(self.counters(), (2, 1, 30, self.instant(date(2026, 3, 5), time(10, 0))))
+
+        other = Equipement.objects.create(num_serie='RAD-2', nom_equipement='Radar', partition='P2')
+        first.equipement = other
+        first.save()
+        self.assertEqual(self.counters(), (1, 0, 0, self.instant(date(2026, 3, 5), time(10, 0))))
+        self.assertEqual(self.counters(other), (1, 1, 30, self.instant(date(2026, 3, 2), time(8, 30))))
+
+        HardwareIncident.objects.filter(equipement=self.equipment).get().delete()
+        self.assertEqual(self.counters(), (0, 0, 0, None))
+        self.assertEqual(reconcile_counters(), [])
+
+    def test_string_date_and_time_are_converted(self):
+        incident = HardwareIncident.objects.create(
+            date='2026-03-04', time='07:15', nom_de_equipement='Radar', description='Panne',
+            equipement=self.equipment, duree_arret='12',
+        )
+        self.assertEqual(self.counters(), (1, 0, 12, self.instant(date(2026, 3, 4), time(7, 15))))
+
+        incident.time = '09:45'
+        incident.save()
+        self.assertEqual(self.counters(), (1, 0, 12, self.instant(date(2026, 3, 4), time(9, 45))))
+        self.assertEqual(reconcile_counters(), [])
+
+    def test_reconcile_repairs_drifted_counters(self):
+        hardware_incident(equipement=self.equipment, maintenance_type='corrective', duree_arret=30)
+        Equipement.objects.filter(pk=self.equipment.pk).update(incident_count=7, total_downtime=0)
+        self.assertEqual(reconcile_counters(dry_run=True), [self.equipment.pk])
+        self.assertEqual(self.counters()[:3], (7, 1, 0))
+        self.assertEqual(reconcile_counters(), [self.equipment.pk])
+        self.assertEqual(self.counters(), (1, 1, 30, self.instant(date(2026, 3, 2), time(8, 30))))
@@ -0,0 +1,52 @@
+# Standard library imports
+import csv
+import io
+import json
+from unittest import mock
+
+# Local imports
+from ..pagination import KeysetPagination
+from .base import ApiTestCase, hardware_incident, software_incident, spread_created_at
+
+
+class StreamExportTests(ApiTestCase):
+
+    def setUp(self):
+        super().setUp()
+        spread_created_at([
+            hardware_incident(description='h1', partition='P1'),
+            hardware_incident(description='h2', partition='P2'),
+            software_incident(description='s1'),
+            hardware_incident(description='h3', partition='P1'),
+        ])
+
+    def content(self, response):
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode('utf-8')
+
+    def test_ndjson_exports_every_row_past_the_page_size(self):
+        with mock.patch.object(KeysetPagination, 'page_size', 1):
+            response = self.client_for('service_maintenance').get('/api/incidents/?stream=ndjson')
+        self.assertTrue(response['Content-Type'].startswith('application/x-ndjson'))
+        rows = [json.loads(line) for line in self.content(response).splitlines()]
+        self.assertEqual([row['description'] for row in rows], ['h3', 'h2', 'h1'])
+
+    def test_csv_export_of_both_types_has_the_union_of_columns(self):
+        response = self.client_for('superadmin').get('/api/incidents/?stream=csv')
+        self.assertIn('attachment;', response['Content-Disposition'])
+        content = self.content(response)
+        self.assertTrue(content.startswith('\ufeff'))
+        rows = list(csv.DictReader(io.StringIO(content.lstrip('\ufeff'))))
+        self.assertEqual(len(rows), 4)
+        self.assertIn('numero_de_serie', rows[0])
+        self.assertIn('server', rows[0])
+
+    def test_filters_apply_to_the_export(self):
+        response = self.client_for('superadmin').get('/api/incidents/?type=hardware&partition=P1&stream=ndjson')
+        rows = [json.loads(line) for line in self.content(response).splitlines()]
+        self.assertEqual([row['description'] for row in rows], ['h3', 'h1'])
+
+    def test_unknown_format_is_rejected(self):
+        response = self.client_for('superadmin').get('/api/incidents/?stream=xlsx')
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,45 @@
+# Local imports
+from .base import ApiTestCase, hardware_incident, software_incident, spread_created_at
+
+
+class MergedFeedTests(ApiTestCase):
+
+    def setUp(self):
+        super().setUp()
+        # Oldest first, alternating tables
+        self.incidents = spread_created_at([
+            hardware_incident(description='h1'),
+            software_incident(description='s1'),
+            software_incident(description='s2'),
+            hardware_incident(description='h2'),
+        ])
+        self.expected = ['h2', 's2', 's1', 'h1']
+
+    def walk(self, client, url):
+        descriptions = []
+        while url:
+            response = client.get(url)
+            self.assertEqual(response.status_code, 200)
+            descriptions += [row['description'] for row in response.data['results']]
+            url = response.data['next']
+        return descriptions
+
+    def test_both_types_list_is_ordered_by_creation(self):
+        response = self.client_for('superadmin').get('/api/incidents/')
+        self.assertEqual([row['description'] for row in response.data['results']], self.expected)
+
+    def test_paginated_list_and_feed_follow_the_same_order(self):
+        client = self.client_for('chef_departement')
+        self.assertEqual(self.walk(client, '/api/incidents/?page_size=3'), self.expected)
+        self.assertEqual(self.walk(client, '/api/incidents/feed/?page_size=1'), self.expected)
+
+    def test_previous_page_returns_the_rows_before(self):
+        client = self.client_for('superadmin')
+        second = client.get(client.get('/api/incidents/feed/?page_size=2').data['next'])
+        first = client.get(second.data['previous'])
+        self.assertEqual([row['description'] for row in first.data['results']], self.expected[:2])
+        self.assertIsNone(first.data['previous'])
+
+    def test_feed_only_has_the_types_of_the_role(self):
+        client = self.client_for('service_maintenance')
+        self.assertEqual(self.walk(client, '/api/incidents/feed/?page_size=10'), ['h2', 'h1'])
@@ -0,0 +1,59 @@
+# Standard library imports
+from datetime import date
+
+# Local imports
+from .base import ApiTestCase, hardware_incident, software_incident, spread_created_at
+
+
+class IncidentFilterTests(ApiTestCase):
+
+    def setUp(self):
+        super().setUp()
+        spread_created_at([
+            hardware_incident(description='h1', date=date(2026, 1, 10), partition='P1',
+                              maintenance_type='corrective', duree_arret=30),
+            hardware_incident(description='h2', date=date(2026, 2, 10), partition='P2',
+                              maintenance_type='preventive'),
+            software_incident(description='s1', date=date(2026, 1, 15), server='SRV-1',
+                              type_d_anomalie='Piste', simulateur=True),
+            software_incident(description='s2', date=date(2026, 2, 15), server='SRV-2', partition='P1'),
+        ])
+
+    def descriptions(self, query, role='superadmin'):
+        response = self.client_for(role).get(f'/api/incidents/?{query}')
+        self.assertEqual(response.status_code, 200, response.data)
+        return [incident['description'] for incident in response.data['results']]
+
+    def test_date_range_applies_to_both_types(self):
+        self.assertEqual(self.descriptions('date_from=2026-02-01'), ['s2', 'h2'])
+        self.assertEqual(self.descriptions('date_from=2026-01-12&date_to=2026-02-12'), ['s1', 'h2'])
+
+    def test_partition_matches_both_tables(self):
+        self.assertEqual(self.descriptions('partition=P1'), ['s2', 'h1'])
+
+    def test_column_of_one_table_excludes_the_other(self):
+        self.assertEqual(self.descriptions('maintenance_type=corrective'), ['h1'])
+        self.assertEqual(self.descriptions('server=SRV-1'), ['s1'])
+        self.assertEqual(self.descriptions('type=software&type_d_anomalie=Piste'), ['s1'])
+
+    def test_boolean_filters(self):
+        self.assertEqual(self.descriptions('simulateur=true'), ['s1'])
+        self.assertEqual(self.descriptions('has_downtime=true'), ['h1'])
+        self.assertEqual(self.descriptions('type=hardware&has_downtime=false'), ['h2'])
+
+    def test_filters_combine_with_role_visibility(self):
+        self.assertEqual(self.descriptions('partition=P1', role='service_maintenance'), ['h1'])
+        self.assertEqual(self.descriptions('partition=P1', role='service_integration'), ['s2'])
+
+    def test_search_matches_every_word(self):
+        hardware_incident(description='Perte alimentation radar', anomalie_observee='Disjoncteur')
+        self.assertEqual(self.descriptions('type=hardware&q=radar disjoncteur'), ['Perte alimentation radar'])
+
+    def test_invalid_values_are_rejected(self):
+        client = self.client_for('superadmin')
+        response = client.get('/api/incidents/?date_from=10/01/2026')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('date_from', response.data)
+        response = client.get('/api/incidents/?simulateur=peut-etre')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('simulateur', response.data)
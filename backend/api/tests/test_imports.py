@@ -0,0 +1,144 @@
+# Standard library imports
+import io
+import tempfile
+from pathlib import Path
+
+# Django imports
+from django.core.management import CommandError, call_command
+
+# Local imports
+from ..imports import ImportFormatError, import_equipment, iter_import_rows
+from ..models import Equipement
+from .base import ApiTestCase
+
+
+def rows(text, import_format='csv'):
+    return iter_import_rows(io.BytesIO(text.encode('utf-8')), import_format)
+
+
+CSV = (
+    'num_serie;nom_equipement;partition\n'
+    'RAD-1;Radar primaire;P1\n'
+    ';Radar secondaire;P1\n'
+    'rad-1;Radar primaire;P2\n'
+    'RAD-2;Radar secondaire;P2\n'
+)
+
+
+class ImportValidationTests(ApiTestCase):
+
+    def test_invalid_and_repeated_rows_are_reported_and_skipped(self):
+        report = import_equipment(rows(CSV))
+        self.assertEqual((report['created'], report['updated'], report['error_count']), (2, 0, 2))
+        self.assertEqual(report['errors'], [
+            {'line': 3, 'num_serie': '', 'errors': {'num_serie': 'Le numéro de série est requis'}},
+            {'line': 4, 'num_serie': 'rad-1', 'errors': {'num_serie': 'Numéro de série déjà présent ligne 2'}},
+        ])
+        self.assertEqual(
+            sorted(Equipement.objects.values_list('num_serie', 'partition')), [('RAD-1', 'P1'), ('RAD-2', 'P2')]
+        )
+
+    def test_malformed_entries_are_reported(self):
+        report = import_equipment(rows(
+            '{"num_serie": "RAD-1", "nom_equipement": "Radar", "partition": "P1"}\n'
+            'pas du json\n'
+            '{"num_serie": ["RAD-2"], "nom_equipement": "Radar", "partition": "P1"}\n',
+            'ndjson',
+        ))
+        self.assertEqual(report['created'], 1)
+        self.assertEqual([error['line'] for error in report['errors']], [2, 3])
+        self.assertEqual(report['errors'][1]['errors'], {'num_serie': 'Texte attendu'})
+
+    def test_reimport_versions_changed_rows_only(self):
+        import_equipment(rows(CSV))
+        report = import_equipment(rows(
+            'num_serie,nom_equipement,partition\n'
+            'RAD-1,Radar primaire,P1\n'
+            'RAD-2,Radar secondaire,P3\n'
+        ))
+        self.assertEqual((report['created'], report['updated'], report['unchanged']), (0, 1, 1))
+        self.assertEqual(
+            list(Equipement.objects.filter(num_serie='RAD-2').order_by('id').values_list('partition', 'etat')),
+            [('P2', 'historique'), ('P3', 'actuel')],
+        )
+
+    def test_dry_run_counts_without_writing(self):
+        report = import_equipment(rows(CSV), dry_run=True)
+        self.assertEqual((report['created'], report['error_count'], report['dry_run']), (2, 2, True))
+        self.assertFalse(Equipement.objects.exists())
+
+    def test_small_batches_still_catch_repeated_serials(self):
+        report = import_equipment(rows(CSV), batch_size=1)
+        self.assertEqual((report['created'], report['error_count']), (2, 2))
+
+    def test_batch_size_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            import_equipment(rows(CSV), batch_size=0)
+
+    def test_unreadable_files_are_rejected(self):
+        for text, import_format in [
+            ('num_serie;partition\nRAD-1;P1\n', 'csv'),
+            ('{"num_serie": "RAD-1"}', 'json'),
+            ('[{"num_serie": "RAD-1"}', 'json'),
+        ]:
+            with self.subTest(text=text), self.assertRaises(ImportFormatError):
+                import_equipment(rows(text, import_format))
+        with self.assertRaises(ImportFormatError):
+            import_equipment(iter_import_rows(io.BytesIO('RAD-1;Écran'.encode('latin-1')), 'csv'))
+
+
+class ImportEndpointTests(ApiTestCase):
+
+    def post(self, body, content_type, role='superadmin', query=''):
+        return self.client_for(role).post(
+            f'/api/equipement/import/{query}', data=body.encode('utf-8'), content_type=content_type
+        )
+
+    def test_raw_body_is_imported(self):
+        response = self.post(CSV, 'text/csv')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual((response.data['created'], response.data['error_count']), (2, 2))
+
+    def test_dry_run_parameter(self):
+        response = self.post(CSV, 'text/csv', query='?dry_run=true')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertTrue(response.data['dry_run'])
+        self.assertFalse(Equipement.objects.exists())
+
+    def test_errors(self):
+        self.assertEqual(self.post(CSV, 'text/plain').status_code, 400)
+        response = self.post('{}', 'application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('file', response.data)
+        self.assertEqual(self.post(CSV, 'text/csv', role='chef_departement').status_code, 403)
+        self.assertEqual(self.post(CSV, 'text/csv', role='service_integration').status_code, 403)
+
+
+class ImportCommandTests(ApiTestCase):
+
+    def call(self, content, suffix='.csv', *args):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / f'equipements{suffix}'
+            path.write_text(content, encoding='utf-8')
+            out = io.StringIO()
+            call_command('import_equipment', str(path), *args, stdout=out)
+            return out.getvalue()
+
+    def test_reports_errors_and_summary(self):
+        out = self.call(CSV)
+        self.assertIn('ligne 3: num_serie: Le numéro de série est requis', out)
+        self.assertIn('2 créés, 0 nouvelles versions, 0 inchangés, 2 erreurs', out)
+        self.assertEqual(Equipement.objects.count(), 2)
+
+    def test_dry_run(self):
+        out = self.call(CSV, '.csv', '--dry-run')
+        self.assertIn('Simulation', out)
+        self.assertFalse(Equipement.objects.exists())
+
+    def test_invalid_options_and_files(self):
+        with self.assertRaisesMessage(CommandError, '--batch-size'):
+            self.call(CSV, '.csv', '--batch-size', '0')
+        with self.assertRaisesMessage(CommandError, 'Format inconnu'):
+            self.call(CSV, '.txt')
+        with self.assertRaisesMessage(CommandError, 'tableau JSON'):
+            self.call('{}', '.json')
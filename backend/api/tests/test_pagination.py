@@ -0,0 +1,83 @@
+# Standard library imports
+from datetime import timedelta
+from unittest import mock
+
+# Django imports
+from django.utils import timezone
+
+# Local imports
+from ..models import Equipement, HardwareIncident
+from ..pagination import KeysetPagination
+from .base import ApiTestCase, hardware_incident
+
+
+class KeysetPaginationTests(ApiTestCase):
+
+    def setUp(self):
+        super().setUp()
+        # Shared created_at values: ties must be broken by id
+        created_at = timezone.now() - timedelta(days=1)
+        for number in range(7):
+            incident = hardware_incident(description=f'incident {number}')
+            HardwareIncident.objects.filter(pk=incident.pk).update(created_at=created_at + timedelta(hours=number // 2))
+        self.expected = list(HardwareIncident.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        self.client = self.client_for('service_maintenance')
+
+    def test_lists_are_paginated_by_default(self):
+        with mock.patch.object(KeysetPagination, 'page_size', 3):
+            response = self.client.get('/api/incidents/')
+        self.assertEqual([row['id'] for row in response.data['results']], self.expected[:3])
+        self.assertIsNotNone(response.data['next'])
+        self.assertIsNone(response.data['previous'])
+
+    def test_cursors_walk_every_row_once(self):
+        seen = []
+        url = '/api/incidents/?page_size=2'
+        while url:
+            response = self.client.get(url)
+            seen += [row['id'] for row in response.data['results']]
+            url = response.data['next']
+        self.assertEqual(seen, self.expected)
+
+    def test_previous_cursor_returns_the_same_rows(self):
+        first = self.client.get('/api/incidents/?page_size=3')
+        second = self.client.get(first.data['next'])
+        back = self.client.get(second.data['previous'])
+        self.assertEqual(back.data['results'], first.data['results'])
+
+    def test_count_is_opt_in(self):
+        self.assertIsNone(self.client.get('/api/incidents/?page_size=2').data['count'])
+        self.assertEqual(self.client.get('/api/incidents/?page_size=2&count=exact').data['count'], 7)
+
+    def test_page_size_is_capped(self):
+        with mock.patch.object(KeysetPagination, 'max_page_size', 4):
+            response = self.client.get('/api/incidents/?page_size=1000')
+        self.assertEqual(len(response.data['results']), 4)
+
+    def test_invalid_cursor_is_not_found(self):
+        response = self.client.get('/api/incidents/?cursor=pas-un-curseur')
+        self.assertEqual(response.status_code, 404)
+
+
+class EquipmentSortTests(ApiTestCase):
+
+    def test_nullable_sort_column_keeps_nulls_last_across_pages(self):
+        now = timezone.now()
+        for number, last in enumerate([now, None, now - timedelta(days=2), None, now - timedelta(days=1)]):
+            Equipement.objects.create(
+                num_serie=f'PG-{number}', nom_equipement=f'Eq {number}', partition='P1', last_incident_at=last
+            )
+        client = self.client_for('superadmin')
+        seen = []
+        url = '/api/equipement/?sort=-last_incident_at&page_size=2'
+        while url:
+            response = client.get(url)
+            self.assertEqual(response.status_code, 200)
+            seen += [row['num_serie'] for row in response.data['results']]
+            url = response.data['next']
+        self.assertEqual(seen[:3], ['PG-0', 'PG-4', 'PG-2'])
+        self.assertEqual(sorted(seen[3:]), ['PG-1', 'PG-3'])
+
+    def test_unknown_sort_is_rejected(self):
+        response = self.client_for('superadmin').get('/api/equipement/?sort=nom_equipement')
+        self.assertEqual(response.status_code, 400)
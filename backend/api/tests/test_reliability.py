@@ -0,0 +1,48 @@
+# Standard library imports
+from datetime import date, time
+
+# Local imports
+from ..models import Equipement
+from .base import ApiTestCase, hardware_incident
+
+
+class ReliabilityLeaderboardTests(ApiTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.radar = Equipement.objects.create(num_serie='RAD-1', nom_equipement='Radar', partition='P1')
+        self.server = Equipement.objects.create(num_serie='SRV-1', nom_equipement='Serveur', partition='P2')
+        for day, downtime in ((1, 60), (3, 0), (7, 30)):
+            hardware_incident(equipement=self.radar, date=date(2026, 3, day), time=time(12, 0),
+                              maintenance_type='corrective', duree_arret=downtime)
+        hardware_incident(equipement=self.server, maintenance_type='corrective', duree_arret=10)
+        hardware_incident(equipement=self.server, maintenance_type='preventive', duree_arret=500)
+
+    def get(self, query=''):
+        response = self.client_for('chef_departement').get(
+            f'/api/equipement/reliability/?from=2026-03-01&to=2026-03-10{query}'
+        )
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def test_metrics_per_equipment(self):
+        data = self.get()
+        self.assertEqual(data['count'], 2)
+        radar, server = data['results']
+        self.assertEqual((radar['num_serie'], radar['failures']), ('RAD-1', 3))
+        self.assertEqual(radar['mtbf_hours'], 72.0)
+        self.assertEqual(radar['mttr_minutes'], 45.0)
+        self.assertEqual(radar['downtime_minutes'], 90)
+        self.assertEqual((server['num_serie'], server['failures'], server['downtime_minutes']), ('SRV-1', 1, 10))
+        self.assertIsNone(server['mtbf_hours'])
+
+    def test_pages_keep_the_total_count(self):
+        data = self.get('&page_size=1&page=2')
+        self.assertEqual([row['num_serie'] for row in data['results']], ['SRV-1'])
+        self.assertEqual(data['count'], 2)
+        self.assertIsNone(data['next'])
+
+    def test_page_past_the_end_still_counts(self):
+        data = self.get('&page_size=1&page=5')
+        self.assertEqual(data['results'], [])
+        self.assertEqual(data['count'], 2)
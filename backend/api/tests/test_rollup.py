@@ -0,0 +1,65 @@
+# Standard library imports
+from datetime import date
+
+# Django imports
+from django.test import TestCase
+
+# Local imports
+from ..models import HardwareIncident, IncidentDailyRollup
+from ..rollup import rebuild_rollup
+from .base import hardware_incident, software_incident
+
+
+class IncidentRollupTests(TestCase):
+
+    def rollup(self):
+        return list(IncidentDailyRollup.objects.order_by('day', 'incident_type', 'partition').values_list(
+            'day', 'incident_type', 'partition', 'maintenance_type',
+            'incident_count', 'downtime_minutes', 'downtime_count',
+        ))
+
+    def test_incremental_rollup_matches_a_rebuild(self):
+        first = hardware_incident(partition='P1', maintenance_type='corrective', duree_arret=30)
+        hardware_incident(partition='P1', maintenance_type='corrective', duree_arret=-4)
+        moved = hardware_incident(partition='P2')
+        software_incident(partition=None)
+        deleted = software_incident(date=date(2026, 3, 3), partition='P1')
+
+        first.duree_arret = 0
+        first.save()
+        moved.date = date(2026, 3, 1)
+        moved.partition = 'P1'
+        moved.save()
+        deleted.delete()
+
+        incremental = self.rollup()
+        self.assertEqual(incremental, [
+            (date(2026, 3, 1), 'hardware', 'P1', '', 1, 0, 0),
+            (date(2026, 3, 2), 'hardware', 'P1', 'corrective', 2, 0, 0),
+            (date(2026, 3, 2), 'software', '', '', 1, 0, 0),
+        ])
+        self.assertEqual(rebuild_rollup(), 3)
+        self.assertEqual(self.rollup(), incremental)
+
+    def test_rebuild_repairs_a_drifted_rollup(self):
+        hardware_incident(duree_arret=15)
+        IncidentDailyRollup.objects.update(incident_count=9)
+        IncidentDailyRollup.objects.create(day=date(2026, 1, 1), incident_type='software', incident_count=1)
+        rebuild_rollup()
+        self.assertEqual(self.rollup(), [(date(2026, 3, 2), 'hardware', 'P1', '', 1, 15, 1)])
+
+    def test_string_date_keys_on_the_day(self):
+        incident = HardwareIncident.objects.create(
+            date='2026-03-04', time='07:15', nom_de_equipement='Radar', description='Panne',
+            partition='P1', duree_arret='12',
+        )
+        self.assertEqual(self.rollup(), [(date(2026, 3, 4), 'hardware', 'P1', '', 1, 12, 1)])
+
+        # Saving again with the same values as strings moves nothing
+        incident.date = '2026-03-04'
+        incident.save()
+        self.assertEqual(self.rollup(), [(date(2026, 3, 4), 'hardware', 'P1', '', 1, 12, 1)])
+
+        incident.date = '2026-03-05'
+        incident.save()
+        self.assertEqual(self.rollup(), [(date(2026, 3, 5), 'hardware', 'P1', '', 1, 12, 1)])
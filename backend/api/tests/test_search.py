@@ -0,0 +1,97 @@
+# Standard library imports
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+# Local imports
+from ..models import Equipement
+from ..search import autocomplete_serials
+from .base import ApiTestCase, hardware_incident, software_incident, spread_created_at
+
+
+class RankedSearchTests(ApiTestCase):
+    """
+    Hits are ordered by relevance, oldest first here so that a newest-first
+    ordering would give the reverse.
+    """
+
+    def setUp(self):
+        super().setUp()
+        spread_created_at([
+            hardware_incident(description='Panne alimentation radar'),
+            software_incident(description='Perte de piste', commentaires='Alimentation du serveur coupée'),
+            hardware_incident(description='Arrêt radar', action_realisee='Remplacement alimentation'),
+            hardware_incident(description='Écran figé'),
+        ])
+
+    def walk(self, client, url):
+        descriptions = []
+        while url:
+            response = client.get(url)
+            self.assertEqual(response.status_code, 200, response.data)
+            descriptions.extend(incident['description'] for incident in response.data['results'])
+            url = response.data['next']
+        return descriptions
+
+    def test_ranked_order_survives_pagination(self):
+        client = self.client_for('service_maintenance')
+        self.assertEqual(
+            self.walk(client, '/api/incidents/?q=alimentation&page_size=1'),
+            ['Panne alimentation radar', 'Arrêt radar'],
+        )
+
+    def test_previous_link_walks_back_in_ranked_order(self):
+        client = self.client_for('superadmin')
+        response = client.get('/api/incidents/?type=hardware&q=alimentation&page_size=1')
+        response = client.get(response.data['next'])
+        self.assertEqual([incident['description'] for incident in response.data['results']], ['Arrêt radar'])
+        response = client.get(response.data['previous'])
+        self.assertEqual(
+            [incident['description'] for incident in response.data['results']], ['Panne alimentation radar']
+        )
+
+    def test_merged_list_and_feed_are_ranked(self):
+        client = self.client_for('superadmin')
+        expected = ['Panne alimentation radar', 'Perte de piste', 'Arrêt radar']
+        self.assertEqual(self.walk(client, '/api/incidents/?q=alimentation&page_size=2'), expected)
+        self.assertEqual(self.walk(client, '/api/incidents/feed/?q=alimentation&page_size=1'), expected)
+
+    def test_stream_export_is_ranked(self):
+        response = self.client_for('service_maintenance').get('/api/incidents/?q=alimentation&stream=ndjson')
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode('utf-8').splitlines()]
+        self.assertEqual([row['description'] for row in rows], ['Panne alimentation radar', 'Arrêt radar'])
+
+    def test_tampered_rank_in_cursor_is_rejected(self):
+        client = self.client_for('service_maintenance')
+        response = client.get('/api/incidents/?q=alimentation&page_size=1')
+        self.assertIsNotNone(response.data['next'])
+        cursor = parse_qs(urlparse(response.data['next']).query)['cursor'][0]
+        payload = json.loads(urlsafe_b64decode(cursor))
+        payload['p'][0] = 'abc'
+        tampered = urlsafe_b64encode(json.dumps(payload).encode()).decode()
+        response = client.get('/api/incidents/', {'q': 'alimentation', 'page_size': 1, 'cursor': tampered})
+        self.assertEqual(response.status_code, 404)
+
+
+class SerialTrigramSyncTests(ApiTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.equipment = Equipement.objects.create(num_serie='RAD-100', nom_equipement='Radar', partition='P1')
+
+    def test_renamed_serial_is_reindexed(self):
+        equipment = Equipement.objects.get(pk=self.equipment.pk)
+        equipment.num_serie = 'RAD-200'
+        equipment.save()
+        self.assertEqual(autocomplete_serials('RAD'), ['RAD-200'])
+
+    def test_save_without_serial_change_skips_the_sync(self):
+        equipment = Equipement.objects.get(pk=self.equipment.pk)
+        equipment.nom_equipement = 'Radar secondaire'
+        with mock.patch('api.signals.sync_serial_trigrams') as sync, \
+                mock.patch('api.signals.add_serial_trigrams') as add:
+            equipment.save()
+        sync.assert_not_called()
+        add.assert_not_called()
+        self.assertEqual(autocomplete_serials('RAD'), ['RAD-100'])
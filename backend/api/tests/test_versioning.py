@@ -0,0 +1,112 @@
+# Standard library imports
+import threading
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+
+# Django imports
+from django.db import IntegrityError, connections, transaction
+from django.test import TestCase, TransactionTestCase, skipUnlessDBFeature
+
+# Local imports
+from ..models import Equipement
+from ..versioning import create_version
+from .base import ApiTestCase, hardware_incident
+
+
+class EquipmentAsOfTests(ApiTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.registered = datetime(2026, 3, 10, tzinfo=dt_timezone.utc)
+        self.first = Equipement.objects.create(
+            num_serie='RAD-1', nom_equipement='Radar', partition='P1', valid_from=self.registered,
+        )
+        self.second = create_version('RAD-1', 'Radar', 'P2', at=self.registered + timedelta(days=5))
+
+    def as_of(self, query):
+        return self.client_for('chef_departement').get(f'/api/equipement/as-of/?{query}')
+
+    def test_version_valid_at_an_instant(self):
+        response = self.as_of('num_serie=rad-1&as_of=2026-03-12T00:00:00Z')
+        self.assertEqual(response.data['id'], self.first.pk)
+        response = self.as_of('num_serie=RAD-1')
+        self.assertEqual(response.data['id'], self.second.pk)
+
+    def test_earliest_version_covers_the_time_before_it(self):
+        response = self.as_of('num_serie=RAD-1&as_of=2026-01-01T00:00:00Z')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['id'], self.first.pk)
+        self.assertEqual(self.as_of('num_serie=INCONNU').status_code, 404)
+
+    def test_incidents_keep_the_requested_order(self):
+        before = hardware_incident(numero_de_serie='RAD-1', equipement=self.first, date=date(2026, 2, 1))
+        during = hardware_incident(numero_de_serie='RAD-1', equipement=self.second,
+                                   date=date(2026, 3, 20), time=time(12, 0))
+        response = self.as_of(f'incidents=HW-{during.pk},{before.pk},{during.pk}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(row['incident_id'], row['equipment']['id']) for row in response.data['results']],
+            [(during.pk, self.second.pk), (before.pk, self.first.pk)],
+        )
+
+
+class VersionConstraintTests(TestCase):
+
+    def test_one_actuel_version_per_serial(self):
+        Equipement.objects.create(num_serie='RAD-1', nom_equipement='Radar', partition='P1')
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Equipement.objects.create(num_serie=' rad-1', nom_equipement='Radar', partition='P2')
+        # Equipment without a serial is not versioned
+        Equipement.objects.create(num_serie='', nom_equipement='Console', partition='P1')
+        Equipement.objects.create(num_serie='', nom_equipement='Console', partition='P2')
+
+    def test_versions_are_contiguous(self):
+        for partition in ('P1', 'P2', 'P3'):
+            create_version('RAD-1', 'Radar', partition)
+        history = list(Equipement.objects.filter(serial_key='RAD-1').order_by('valid_from', 'id'))
+        self.assertEqual([equipment.etat for equipment in history], ['historique', 'historique', 'actuel'])
+        self.assertIsNone(history[-1].valid_to)
+        for equipment, successor in zip(history, history[1:]):
+            self.assertEqual(equipment.valid_to, successor.valid_from)
+
+
+@skipUnlessDBFeature('has_select_for_update')
+class ConcurrentVersioningTests(TransactionTestCase):
+    """Edits of one serial from two threads, each on its own connection"""
+
+    def edit_concurrently(self, partitions):
+        barrier = threading.Barrier(len(partitions))
+        failures = []
+
+        def edit(partition):
+            try:
+                barrier.wait()
+                create_version('RAD-1', 'Radar', partition)
+            except Exception as error:
+                failures.append(error)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=edit, args=(partition,)) for partition in partitions]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(failures, [])
+        return list(Equipement.objects.filter(serial_key='RAD-1').order_by('valid_from', 'id'))
+
+    def assertSingleCurrentVersion(self, history, versions):
+        self.assertEqual(len(history), versions)
+        self.assertEqual([equipment.etat for equipment in history].count('actuel'), 1)
+        self.assertEqual(history[-1].etat, 'actuel')
+        for equipment, successor in zip(history, history[1:]):
+            self.assertEqual(equipment.valid_to, successor.valid_from)
+
+    def test_concurrent_edits_leave_one_current_version(self):
+        create_version('RAD-1', 'Radar', 'P1')
+        history = self.edit_concurrently(['P2', 'P3'])
+        self.assertSingleCurrentVersion(history, 3)
+
+    def test_concurrent_first_versions_leave_one_current_version(self):
+        # No row to lock yet: the unique constraint rejects the slower insert, which is retried
+        history = self.edit_concurrently(['P1', 'P2'])
+        self.assertSingleCurrentVersion(history, 2)
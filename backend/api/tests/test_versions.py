@@ -0,0 +1,33 @@
+# Local imports
+from ..models import HardwareIncident
+from ..versions import get_versions
+from .base import ApiTestCase, hardware_incident
+
+
+class DataVersionTests(ApiTestCase):
+
+    def recent(self):
+        response = self.client_for('service_maintenance').get('/api/incidents/recent/')
+        self.assertEqual(response.status_code, 200)
+        return [incident['description'] for incident in response.data]
+
+    def test_incident_writes_bump_the_version_once_committed(self):
+        before, = get_versions([HardwareIncident])
+        with self.captureOnCommitCallbacks(execute=True):
+            hardware_incident(description='h1')
+            # The version row is not locked for the rest of the transaction
+            self.assertEqual(get_versions([HardwareIncident]), (before,))
+        self.assertEqual(get_versions([HardwareIncident]), (before + 1,))
+
+    def test_recent_buffer_follows_committed_writes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            first = hardware_incident(description='h1')
+        self.assertEqual(self.recent(), ['h1'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            hardware_incident(description='h2')
+        self.assertEqual(self.recent(), ['h2', 'h1'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertEqual(self.recent(), ['h2'])
@@ -0,0 +1,33 @@
+# Django imports
+from django.utils import timezone
+
+# Local imports
+from ..warmup import warm_caches
+from .base import ApiTestCase, hardware_incident
+
+
+class DashboardWarmupTests(ApiTestCase):
+    """The warmed entries are the ones the dashboard's requests read"""
+
+    def test_dashboard_requests_hit_warmed_entries(self):
+        hardware_incident()
+        warm_caches(roles=['superadmin'])
+        year = timezone.now().date().year
+        client = self.client_for('superadmin')
+        for url in [
+            '/api/analytics/years/',
+            f'/api/analytics/summary/?year={year}',
+            f'/api/analytics/by-day/?year={year}',
+            f'/api/analytics/by-period/?year={year}&period=week',
+            f'/api/analytics/software-by-anomaly/?period=year&year={year}',
+            '/api/analytics/corrective-by-server/',
+        ]:
+            response = client.get(url)
+            self.assertEqual(response.status_code, 200, response.data)
+            self.assertEqual(response['X-Cache'], 'HIT', url)
+
+    def test_other_parameters_miss(self):
+        warm_caches(roles=['superadmin'])
+        year = timezone.now().date().year
+        response = self.client_for('superadmin').get(f'/api/analytics/summary/?year={year}&period=week')
+        self.assertEqual(response['X-Cache'], 'MISS')
@@ -12,6 +12,7 @@ router.register(r'incidents', views.IncidentViewSet, basename='incident')
 router.register(r'reports', views.ReportViewSet, basename='report')
 router.register(r'equipement', views.EquipmentViewSet, basename='equipment')
 router.register(r'users', views.UserViewSet, basename='user')
+router.register(r'analytics', views.AnalyticsViewSet, basename='analytics')
 
 urlpatterns = [
     path('health/', views.health_check, name='health'),
@@ -23,6 +24,9 @@ urlpatterns = [
     path('auth/change-password/', views.change_password, name='change-password'),
     path('incidents/stats/', views.IncidentViewSet.as_view({'get': 'stats'}), name='incident-stats'),
     path('incidents/recent/', views.IncidentViewSet.as_view({'get': 'recent'}), name='incident-recent'),
+    path('incidents/facets/', views.IncidentViewSet.as_view({'get': 'facets'}), name='incident-facets'),
+    path('incidents/histogram/', views.IncidentViewSet.as_view({'get': 'histogram'}), name='incident-histogram'),
+    path('incidents/feed/', views.IncidentViewSet.as_view({'get': 'feed'}), name='incident-feed'),
     path('incidents/hardware/<int:pk>/', views.IncidentViewSet.as_view({'put': 'update_hardware'}), name='incident-hardware-update'),
     path('incidents/software/<int:pk>/', views.IncidentViewSet.as_view({'put': 'update_software'}), name='incident-software-update'),
     path('equipement/<int:pk>/history/', views.EquipmentViewSet.as_view({'get': 'history'}), name='equipment-history'),
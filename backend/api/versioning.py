@@ -0,0 +1,190 @@
+# Standard library imports
+from bisect import bisect_right
+from datetime import datetime, time
+from zoneinfo import ZoneInfo
+
+# Django imports
+from django.conf import settings
+from django.db import IntegrityError, connections, transaction
+from django.db.models import F, Func, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+# Django REST Framework imports
+from rest_framework.exceptions import ValidationError
+
+# Local imports
+from .models import Equipement, HardwareIncident, normalize_serial
+
+
+def parse_instant(name, value):
+    """An ISO date or date-time; naive values are in settings.TIME_ZONE"""
+    try:
+        instant = parse_datetime(value)
+        if instant is None:
+            day = parse_date(value)
+            instant = datetime.combine(day, time()) if day else None
+    except ValueError:
+        instant = None
+    if instant is None:
+        raise ValidationError({name: 'Date invalide. Format attendu: AAAA-MM-JJ ou AAAA-MM-JJTHH:MM'})
+    if timezone.is_naive(instant):
+        instant = instant.replace(tzinfo=ZoneInfo(settings.TIME_ZONE))
+    return instant
+
+
+def local_instant(day, at_time):
+    """A date and time of day in settings.TIME_ZONE"""
+    return datetime.combine(day, at_time, tzinfo=ZoneInfo(settings.TIME_ZONE))
+
+
+def incident_instant(incident):
+    """When a hardware incident happened (date and time are stored in settings.TIME_ZONE)"""
+    return local_instant(incident.date, incident.time)
+
+
+def create_version(num_serie, nom_equipement, partition, at=None, reuse_current=False, replacing=None):
+    """
+    Make a new current version of a serial number.
+
+    The current version is closed ('historique', valid_to=at) and the new
+    one is valid from the same instant, so the periods of a serial neither
+    overlap nor leave gaps. ``at`` may be in the past (the date of the
+    incident that reported the change); when it predates the version it
+    would close, the new version starts now instead. The current version
+    is locked with SELECT ... FOR UPDATE, so concurrent edits of a serial
+    are applied one after the other; when the serial has no current
+    version yet, the unique constraint on 'actuel' rows (migration 0014)
+    rejects the slower insert, which is then retried against the winner's
+    version. With ``reuse_current``, a current version that already has
+    this name and partition (e.g. just written by a concurrent edit) is
+    returned as is.
+
+    Equipment without a serial number has no other version to find:
+    ``replacing`` is the pk of the row being edited, closed in its place.
+    """
+    serial_key = normalize_serial(num_serie)
+    for attempt in range(2):
+        try:
+            with transaction.atomic():
+                if serial_key:
+                    current = Equipement.objects.filter(serial_key=serial_key, etat='actuel')
+                elif replacing is not None:
+                    current = Equipement.objects.filter(pk=replacing, etat='actuel')
+                else:
+                    current = Equipement.objects.none()
+                current = list(current.select_for_update().order_by('-created_at', '-id'))
+                if reuse_current and current and (
+                    current[0].nom_equipement == nom_equipement and current[0].partition == partition
+                ):
+                    return current[0]
+                # Taken once the lock is held, so versions start in commit order
+                closed_at = at or timezone.now()
+                if any(previous.valid_from > closed_at for previous in current):
+                    # Reported after a later change: history is not rewritten
+                    closed_at = timezone.now()
+                for previous in current:
+                    previous.etat = 'historique'
+                    previous.valid_to = closed_at
+                    # Not a full save: it would write back counters read before a
+                    # concurrent incident write (see api.counters)
+                    previous.save(update_fields=['etat', 'valid_to', 'updated_at'])
+                return Equipement.objects.create(
+                    num_serie=num_serie,
+                    nom_equipement=nom_equipement,
+                    partition=partition,
+                    etat='actuel',
+                    valid_from=closed_at,
+                )
+        except IntegrityError:
+            if attempt:
+                raise
+
+
+def valid_at(instant):
+    """Versions whose validity period contains ``instant``"""
+    return Q(valid_from__lte=instant) & (Q(valid_to__isnull=True) | Q(valid_to__gt=instant))
+
+
+def version_as_of(num_serie, instant, using='default'):
+    """
+    The version of a serial valid at ``instant``, or None.
+
+    On PostgreSQL the period is matched with tstzrange @> so that the GiST
+    index (migrations 0011 and 0012) answers it; elsewhere the
+    (serial_key, valid_from) B-tree index does. The earliest version also
+    covers the time before it (equipment registered after its first
+    incidents, as in versions_for_incidents).
+    """
+    versions = Equipement.objects.using(using).filter(serial_key=normalize_serial(num_serie))
+    queryset = versions
+    if connections[using].vendor == 'postgresql':
+        # Imported here: the range fields need psycopg. Same expression as
+        # the index (default '[)' bounds: valid_to excluded)
+        from django.contrib.postgres.fields import DateTimeRangeField
+        validity = Func(F('valid_from'), F('valid_to'), function='tstzrange', output_field=DateTimeRangeField())
+        queryset = queryset.annotate(validity=validity).filter(validity__contains=instant)
+    else:
+        queryset = queryset.filter(valid_at(instant))
+    version = queryset.order_by('-valid_from').first()
+    if version is None:
+        # Periods are contiguous: a version starting later means the instant predates them all
+        version = versions.filter(valid_from__gt=instant).order_by('valid_from', 'id').first()
+    return version
+
+
+def versions_for_incidents(incidents, using='default'):
+    """
+    ``{incident.pk: Equipement or None}``: each hardware incident's equipment
+    version at the time of the incident.
+
+    The serial is the incident's numero_de_serie, or the serial of its linked
+    equipment. Every version of those serials is read in one query and the
+    periods are matched here. An incident older than every version of its
+    serial (equipment registered after its first incidents) gets its linked
+    equipment.
+    """
+    serials = {}
+    for incident in incidents:
+        num_serie = incident.numero_de_serie
+        if not num_serie and incident.equipement_id:
+            num_serie = incident.equipement.num_serie
+        serials[incident.pk] = incident.serial_key or normalize_serial(num_serie)
+
+    history = {}
+    keys = {serial for serial in serials.values() if serial}
+    if keys:
+        versions = Equipement.objects.using(using).filter(serial_key__in=keys).order_by('valid_from', 'id')
+        for version in versions:
+            history.setdefault(version.serial_key, []).append(version)
+
+    starts = {serial: [version.valid_from for version in versions] for serial, versions in history.items()}
+    resolved = {}
+    for incident in incidents:
+        serial = serials[incident.pk]
+        versions = history.get(serial, [])
+        instant = incident_instant(incident)
+        # Last version that started at or before the incident
+        index = bisect_right(starts.get(serial, []), instant) - 1
+        if index < 0:
+            version = incident.equipement
+        else:
+            version = versions[index]
+            if version.valid_to is not None and version.valid_to <= instant:
+                version = None
+        resolved[incident.pk] = version
+    return resolved
+
+
+def serial_incidents(equipment, using='default'):
+    """
+    Hardware incidents of every version of an equipment's serial.
+
+    Matches incidents recorded with the serial, or linked to any version of
+    it; both conditions are equalities on indexed columns.
+    """
+    condition = Q(equipement_id=equipment.pk)
+    if equipment.serial_key:
+        versions = Equipement.objects.using(using).filter(serial_key=equipment.serial_key).values('id')
+        condition |= Q(serial_key=equipment.serial_key) | Q(equipement_id__in=versions)
+    return HardwareIncident.objects.using(using).filter(condition)
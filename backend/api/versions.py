@@ -0,0 +1,42 @@
+# Django imports
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+# Local imports
+from .models import DataVersion
+
+
+def version_name(model):
+    return model._meta.label_lower
+
+
+def get_versions(models, using='default'):
+    """Current version of each model, in one query (0 for a table never written)"""
+    names = [version_name(model) for model in models]
+    versions = dict(
+        DataVersion.objects.using(using).filter(name__in=names).values_list('name', 'version')
+    )
+    return tuple(versions.get(name, 0) for name in names)
+
+
+def bump_version(model, using='default'):
+    """
+    Increment the version of ``model`` and return the new value.
+
+    Outside a transaction it runs in a short one of its own, so the row is
+    only locked for the increment and the value read back is the one this
+    call produced.
+    Incident writes call it once committed (see api.signals): concurrent
+    writers then never queue on the row for the length of their transaction.
+    """
+    name = version_name(model)
+    rows = DataVersion.objects.using(using).filter(name=name)
+    with transaction.atomic(using=using):
+        if not rows.update(version=F('version') + 1):
+            try:
+                with transaction.atomic(using=using):
+                    DataVersion.objects.using(using).create(name=name, version=1)
+            except IntegrityError:
+                # A concurrent write created the row first
+                rows.update(version=F('version') + 1)
+        return rows.values_list('version', flat=True).get()
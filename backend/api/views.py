@@ -1,10 +1,8 @@
-# Standard library imports
-from datetime import timedelta
-
 # Django imports
 from django.contrib.auth import authenticate, get_user_model
 from django.conf import settings
-from django.db.models import Q, Count, Sum, Avg, F
+from django.db import IntegrityError, transaction
+from django.db.models import Q, F
 from django.utils import timezone
 
 # Django REST Framework imports
@@ -12,13 +10,28 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import api_view, permission_classes, action
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 from rest_framework_simplejwt.tokens import RefreshToken
 
 # Local imports
+from . import analytics, reliability
+from .cache import cached_response
+from .catalog import equipment_catalog, serial_versions
+from .exports import EXPORT_FORMATS, stream_incidents
+from .feed import hydrate_feed, project_feed
+from .filters import filter_incidents
+from .histogram import incident_histogram, parse_histogram_params
+from .imports import ImportFormatError, import_equipment, import_format_for, iter_import_rows
+from .incident_ids import get_incident
 from .models import User, HardwareIncident, SoftwareIncident, Report, Equipement
+from .pagination import EquipmentPagination, FeedPagination, HistoryPagination, KeysetPagination
+from .recent import recent_incidents
+from .search import autocomplete_serials, search_queryset
+from .stats import incident_facets, incident_stats
+from .versioning import create_version, local_instant, parse_instant, serial_incidents, version_as_of, versions_for_incidents
 from .permissions import (
     CanModifyHardwareIncidents, CanModifySoftwareIncidents,
-    CanAccessHardwareIncidents, CanAccessSoftwareIncidents
+    CanAccessHardwareIncidents, CanAccessSoftwareIncidents, incident_visibility
 )
 from .serializers import (
     UserSerializer, LoginSerializer, HardwareIncidentSerializer,
@@ -297,7 +310,7 @@ class IncidentViewSet(viewsets.ModelViewSet):
         # Superadmin can see everything
         if user_role == 'superadmin':
             if incident_type == 'hardware':
-                return HardwareIncident.objects.select_related().all()
+                return HardwareIncident.objects.select_related('equipement')
             elif incident_type == 'software':
                 return SoftwareIncident.objects.all()
             return None
@@ -305,7 +318,7 @@ class IncidentViewSet(viewsets.ModelViewSet):
         # Chef de département can see both types (read-only)
         if user_role == 'chef_departement':
             if incident_type == 'hardware':
-                return HardwareIncident.objects.select_related().all()
+                return HardwareIncident.objects.select_related('equipement')
             elif incident_type == 'software':
                 return SoftwareIncident.objects.all()
             return None
@@ -313,7 +326,7 @@ class IncidentViewSet(viewsets.ModelViewSet):
         # service_maintenance can only see hardware
         if user_role == 'service_maintenance':
             if incident_type == 'hardware' or not incident_type:
-                return HardwareIncident.objects.select_related().all()
+                return HardwareIncident.objects.select_related('equipement')
             return HardwareIncident.objects.none()
         
         # service_integration can only see software
@@ -324,48 +337,69 @@ class IncidentViewSet(viewsets.ModelViewSet):
         
         return None
     
+    def _get_stream_format(self):
+        """Return the requested streaming export format, if any"""
+        export_format = self.request.query_params.get('stream')
+        if export_format and export_format not in EXPORT_FORMATS:
+            return None, Response(
+                {'message': 'Format d\'export invalide. Utilisez "ndjson" ou "csv".'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return export_format, None
+    
+    def _list_response(self, queryset, serializer_class):
+        """Serialize an incident list, one keyset page at a time when requested"""
+        export_format, error = self._get_stream_format()
+        if error:
+            return error
+        queryset = filter_incidents(queryset, self.request.query_params)
+        if export_format:
+            return stream_incidents([(queryset, serializer_class)], export_format)
+        
+        page = self.paginate_queryset(queryset)
+        return self.get_paginated_response(serializer_class(page, many=True).data)
+    
+    def _list_both_response(self, hardware_incidents, software_incidents):
+        """Serialize hardware and software incidents as a single list"""
+        export_format, error = self._get_stream_format()
+        if error:
+            return error
+        hardware_incidents = filter_incidents(hardware_incidents, self.request.query_params)
+        software_incidents = filter_incidents(software_incidents, self.request.query_params)
+        if export_format:
+            return stream_incidents([
+                (hardware_incidents, HardwareIncidentSerializer),
+                (software_incidents, SoftwareIncidentSerializer),
+            ], export_format)
+        
+        # Pages are cut from a UNION ALL of both tables, then hydrated
+        branches = [
+            project_feed(hardware_incidents, 'hardware'),
+            project_feed(software_incidents, 'software'),
+        ]
+        paginator = FeedPagination()
+        page = paginator.paginate_querysets(branches, self.request, view=self)
+        return paginator.get_paginated_response(hydrate_feed(page))
+    
     def list(self, request):
         """List incidents with optional type filter and role-based filtering"""
         user_role = request.user.role
         incident_type = request.query_params.get('type')
         
-        # Superadmin can see everything
-        if user_role == 'superadmin':
-            if incident_type == 'hardware':
-                incidents = HardwareIncident.objects.all()
-                serializer = HardwareIncidentSerializer(incidents, many=True)
-                return Response({'results': serializer.data, 'count': len(serializer.data)})
-            elif incident_type == 'software':
-                incidents = SoftwareIncident.objects.all()
-                serializer = SoftwareIncidentSerializer(incidents, many=True)
-                return Response({'results': serializer.data, 'count': len(serializer.data)})
-            else:
-                # Get both types
-                hardware_incidents = HardwareIncident.objects.all()
-                software_incidents = SoftwareIncident.objects.all()
-                hardware_data = HardwareIncidentSerializer(hardware_incidents, many=True).data
-                software_data = SoftwareIncidentSerializer(software_incidents, many=True).data
-                all_incidents = hardware_data + software_data
-                return Response({'results': all_incidents, 'count': len(all_incidents)})
-        
-        # Chef de département can see both types (read-only)
-        if user_role == 'chef_departement':
+        # Superadmin and chef de département can see both types
+        if user_role in ['superadmin', 'chef_departement']:
             if incident_type == 'hardware':
-                incidents = HardwareIncident.objects.all()
-                serializer = HardwareIncidentSerializer(incidents, many=True)
-                return Response({'results': serializer.data, 'count': len(serializer.data)})
+                return self._list_response(
+                    HardwareIncident.objects.select_related('equipement'), HardwareIncidentSerializer
+                )
             elif incident_type == 'software':
-                incidents = SoftwareIncident.objects.all()
-                serializer = SoftwareIncidentSerializer(incidents, many=True)
-                return Response({'results': serializer.data, 'count': len(serializer.data)})
+                return self._list_response(SoftwareIncident.objects.all(), SoftwareIncidentSerializer)
             else:
                 # Get both types
-                hardware_incidents = HardwareIncident.objects.all()
-                software_incidents = SoftwareIncident.objects.all()
-                hardware_data = HardwareIncidentSerializer(hardware_incidents, many=True).data
-                software_data = SoftwareIncidentSerializer(software_incidents, many=True).data
-                all_incidents = hardware_data + software_data
-                return Response({'results': all_incidents, 'count': len(all_incidents)})
+                return self._list_both_response(
+                    HardwareIncident.objects.select_related('equipement'),
+                    SoftwareIncident.objects.all()
+                )
         
         # service_maintenance can only see hardware
         if user_role == 'service_maintenance':
@@ -374,9 +408,9 @@ class IncidentViewSet(viewsets.ModelViewSet):
                     {'error': 'Accès non autorisé aux incidents logiciels'},
                     status=status.HTTP_403_FORBIDDEN
                 )
-            incidents = HardwareIncident.objects.all()
-            serializer = HardwareIncidentSerializer(incidents, many=True)
-            return Response({'results': serializer.data, 'count': len(serializer.data)})
+            return self._list_response(
+                HardwareIncident.objects.select_related('equipement'), HardwareIncidentSerializer
+            )
         
         # service_integration can only see software
         if user_role == 'service_integration':
@@ -385,12 +419,42 @@ class IncidentViewSet(viewsets.ModelViewSet):
                     {'error': 'Accès non autorisé aux incidents matériels'},
                     status=status.HTTP_403_FORBIDDEN
                 )
-            incidents = SoftwareIncident.objects.all()
-            serializer = SoftwareIncidentSerializer(incidents, many=True)
-            return Response({'results': serializer.data, 'count': len(serializer.data)})
+            return self._list_response(SoftwareIncident.objects.all(), SoftwareIncidentSerializer)
         
         return Response({'results': [], 'count': 0})
     
+    def _link_equipment(self, request, at):
+        """
+        Id of the equipment version a hardware incident is linked to, from
+        the request's serial, or None.
+        
+        When the name or partition differ from the current version a new
+        version is created, valid from ``at`` (when the incident happened),
+        so this is only called once the incident is known to be valid: an
+        error response does not roll the view's transaction back.
+        """
+        numero_de_serie = request.data.get('numero_de_serie', '').strip() if request.data.get('numero_de_serie') else ''
+        nom_de_equipement = request.data.get('nom_de_equipement', '').strip() if request.data.get('nom_de_equipement') else ''
+        partition = request.data.get('partition', '').strip() if request.data.get('partition') else ''
+        if not numero_de_serie:
+            return None
+        
+        # 'actuel' version first, else the latest one (see api.catalog)
+        equip = equipment_catalog.resolve(numero_de_serie)
+        if equip is None:
+            return None
+        
+        # Check if equipment name or partition changed
+        if nom_de_equipement and (equip.nom_equipement != nom_de_equipement or (partition and equip.partition != partition)):
+            # Close the current version and create one with the updated name/partition
+            new_equipment = create_version(
+                numero_de_serie, nom_de_equipement, partition or equip.partition, at=at, reuse_current=True
+            )
+            return new_equipment.id
+        # No change, use existing equipment
+        return equip.id
+    
+    @transaction.atomic
     def create(self, request):
         """Create a new incident"""
         incident_type = request.data.get('incident_type')
@@ -411,52 +475,9 @@ class IncidentViewSet(viewsets.ModelViewSet):
                 )
         
         if incident_type == 'hardware':
-            # Handle equipment lookup and update if name changed
-            numero_de_serie = request.data.get('numero_de_serie', '').strip() if request.data.get('numero_de_serie') else ''
-            nom_de_equipement = request.data.get('nom_de_equipement', '').strip() if request.data.get('nom_de_equipement') else ''
-            partition = request.data.get('partition', '').strip() if request.data.get('partition') else ''
-            equipement_id = None
-            
-            if numero_de_serie:
-                # Try to find equipment with etat='actuel' first
-                equip = Equipement.objects.filter(
-                    num_serie__iexact=numero_de_serie,
-                    etat='actuel'
-                ).order_by('-created_at').first()
-                
-                if not equip:
-                    # Try without etat condition
-                    equip = Equipement.objects.filter(
-                        num_serie__iexact=numero_de_serie
-                    ).order_by('-created_at').first()
-                
-                if equip:
-                    # Check if equipment name or partition changed
-                    if nom_de_equipement and (equip.nom_equipement != nom_de_equipement or (partition and equip.partition != partition)):
-                        # Mark current equipment as historique
-                        latest_equip = Equipement.objects.filter(
-                            num_serie__iexact=numero_de_serie,
-                            etat='actuel'
-                        ).order_by('-created_at').first()
-                        
-                        if latest_equip:
-                            latest_equip.etat = 'historique'
-                            latest_equip.save()
-                        
-                        # Create new equipment with updated name/partition
-                        new_equipment = Equipement.objects.create(
-                            num_serie=numero_de_serie,
-                            nom_equipement=nom_de_equipement,
-                            partition=partition or equip.partition,
-                            etat='actuel'
-                        )
-                        equipement_id = new_equipment.id
-                    else:
-                        # No change, use existing equipment
-                        equipement_id = equip.id
-            
             data = request.data.copy()
-            data['equipement_id'] = equipement_id
+            # Set once the incident is valid (see _link_equipment)
+            data['equipement_id'] = None
             
             serializer = HardwareIncidentSerializer(data=data)
             if serializer.is_valid():
@@ -475,7 +496,8 @@ class IncidentViewSet(viewsets.ModelViewSet):
                         status=status.HTTP_400_BAD_REQUEST
                     )
                 
-                incident = serializer.save()
+                at = local_instant(serializer.validated_data['date'], serializer.validated_data['time'])
+                incident = serializer.save(equipement_id=self._link_equipment(request, at))
                 return Response(
                     HardwareIncidentSerializer(incident).data,
                     status=status.HTTP_201_CREATED
@@ -514,24 +536,35 @@ class IncidentViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
     
+    def _incident_type_hint(self, request):
+        """
+        Table to read a numeric incident id from: ?type=, or the only incident
+        type the role works with. None keeps the legacy hardware-then-software lookup.
+        """
+        if request.query_params.get('type'):
+            return request.query_params['type']
+        visibility = incident_visibility(request.user.role)
+        if not visibility['include_software']:
+            return 'hardware'
+        if not visibility['include_hardware']:
+            return 'software'
+        return None
+    
     def retrieve(self, request, pk=None):
-        """Get a single incident"""
-        # Try hardware first
-        try:
-            incident = HardwareIncident.objects.get(pk=pk)
+        """Get a single incident, by public id ("HW-12") or numeric id (optionally with ?type=)"""
+        incident = get_incident(pk, self._incident_type_hint(request))
+        if incident is None:
+            return Response(
+                {'message': 'Incident non trouvé'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        if isinstance(incident, HardwareIncident):
             serializer = HardwareIncidentSerializer(incident)
-            return Response(serializer.data)
-        except HardwareIncident.DoesNotExist:
-            try:
-                incident = SoftwareIncident.objects.get(pk=pk)
-                serializer = SoftwareIncidentSerializer(incident)
-                return Response(serializer.data)
-            except SoftwareIncident.DoesNotExist:
-                return Response(
-                    {'message': 'Incident non trouvé'},
-                    status=status.HTTP_404_NOT_FOUND
-                )
+        else:
+            serializer = SoftwareIncidentSerializer(incident)
+        return Response(serializer.data)
     
+    @transaction.atomic
     def update(self, request, pk=None):
         """Update an incident - generic handler"""
         user_role = request.user.role
@@ -543,84 +576,44 @@ class IncidentViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        # Try hardware first
-        try:
-            incident = HardwareIncident.objects.get(pk=pk)
+        incident = get_incident(pk, self._incident_type_hint(request))
+        if incident is None:
+            return Response(
+                {'message': 'Incident non trouvé'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        if isinstance(incident, HardwareIncident):
             # Check if user can modify hardware incidents
             if user_role not in ['service_maintenance', 'superadmin']:
                 return Response(
                     {'error': 'Accès non autorisé pour modifier des incidents matériels'},
                     status=status.HTTP_403_FORBIDDEN
                 )
-            # Handle equipment lookup and update if name changed
-            numero_de_serie = request.data.get('numero_de_serie', '').strip() if request.data.get('numero_de_serie') else ''
-            nom_de_equipement = request.data.get('nom_de_equipement', '').strip() if request.data.get('nom_de_equipement') else ''
-            partition = request.data.get('partition', '').strip() if request.data.get('partition') else ''
-            equipement_id = None
-            
-            if numero_de_serie:
-                # Try to find equipment with etat='actuel' first
-                equip = Equipement.objects.filter(
-                    num_serie__iexact=numero_de_serie,
-                    etat='actuel'
-                ).order_by('-created_at').first()
-                
-                if not equip:
-                    # Try without etat condition
-                    equip = Equipement.objects.filter(
-                        num_serie__iexact=numero_de_serie
-                    ).order_by('-created_at').first()
-                
-                if equip:
-                    # Check if equipment name or partition changed
-                    if nom_de_equipement and (equip.nom_equipement != nom_de_equipement or (partition and equip.partition != partition)):
-                        # Mark current equipment as historique
-                        latest_equip = Equipement.objects.filter(
-                            num_serie__iexact=numero_de_serie,
-                            etat='actuel'
-                        ).order_by('-created_at').first()
-                        
-                        if latest_equip:
-                            latest_equip.etat = 'historique'
-                            latest_equip.save()
-                        
-                        # Create new equipment with updated name/partition
-                        new_equipment = Equipement.objects.create(
-                            num_serie=numero_de_serie,
-                            nom_equipement=nom_de_equipement,
-                            partition=partition or equip.partition,
-                            etat='actuel'
-                        )
-                        equipement_id = new_equipment.id
-                    else:
-                        # No change, use existing equipment
-                        equipement_id = equip.id
-            
             data = request.data.copy()
-            data['equipement_id'] = equipement_id
+            # Set once the changes are valid (see _link_equipment)
+            data['equipement_id'] = None
             data['incident_type'] = 'hardware'
             
             serializer = HardwareIncidentSerializer(incident, data=data, partial=True)
+            if serializer.is_valid():
+                at = local_instant(
+                    serializer.validated_data.get('date', incident.date),
+                    serializer.validated_data.get('time', incident.time),
+                )
+                serializer.save(equipement_id=self._link_equipment(request, at))
+                return Response(serializer.data)
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            data = request.data.copy()
+            data['incident_type'] = 'software'
+            serializer = SoftwareIncidentSerializer(incident, data=data, partial=True)
             if serializer.is_valid():
                 serializer.save()
                 return Response(serializer.data)
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-        except HardwareIncident.DoesNotExist:
-            try:
-                incident = SoftwareIncident.objects.get(pk=pk)
-                data = request.data.copy()
-                data['incident_type'] = 'software'
-                serializer = SoftwareIncidentSerializer(incident, data=data, partial=True)
-                if serializer.is_valid():
-                    serializer.save()
-                    return Response(serializer.data)
-                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-            except SoftwareIncident.DoesNotExist:
-                return Response(
-                    {'message': 'Incident non trouvé'},
-                    status=status.HTTP_404_NOT_FOUND
-                )
     
+    @transaction.atomic
     def update_hardware(self, request, pk=None):
         """Update a hardware incident"""
         user_role = request.user.role
@@ -650,15 +643,8 @@ class IncidentViewSet(viewsets.ModelViewSet):
         equipement_id = None
         
         if numero_de_serie:
-            equip = Equipement.objects.filter(
-                num_serie__iexact=numero_de_serie,
-                etat='actuel'
-            ).order_by('-created_at').first()
-            
-            if not equip:
-                equip = Equipement.objects.filter(
-                    num_serie__iexact=numero_de_serie
-                ).order_by('-created_at').first()
+            # 'actuel' version first, else the latest one (see api.catalog)
+            equip = equipment_catalog.resolve(numero_de_serie)
             
             if equip:
                 equipement_id = equip.id
@@ -673,6 +659,7 @@ class IncidentViewSet(viewsets.ModelViewSet):
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
+    @transaction.atomic
     def update_software(self, request, pk=None):
         """Update a software incident"""
         user_role = request.user.role
@@ -705,6 +692,7 @@ class IncidentViewSet(viewsets.ModelViewSet):
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
+    @transaction.atomic
     def destroy(self, request, pk=None):
         """Delete an incident"""
         user_role = request.user.role
@@ -716,9 +704,14 @@ class IncidentViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        # Try hardware first
-        try:
-            incident = HardwareIncident.objects.get(pk=pk)
+        incident = get_incident(pk, self._incident_type_hint(request))
+        if incident is None:
+            return Response(
+                {'message': 'Incident non trouvé'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        if isinstance(incident, HardwareIncident):
             # Check if user can delete hardware incidents
             if user_role not in ['service_maintenance', 'superadmin']:
                 return Response(
@@ -727,167 +720,86 @@ class IncidentViewSet(viewsets.ModelViewSet):
                 )
             incident.delete()
             return Response({'message': 'Incident matériel supprimé avec succès'})
-        except HardwareIncident.DoesNotExist:
-            try:
-                incident = SoftwareIncident.objects.get(pk=pk)
-                # Check if user can delete software incidents
-                if user_role not in ['service_integration', 'superadmin']:
-                    return Response(
-                        {'error': 'Accès non autorisé pour supprimer des incidents logiciels'},
-                        status=status.HTTP_403_FORBIDDEN
-                    )
-                # Delete associated report if exists
-                Report.objects.filter(software_incident=incident).delete()
-                incident.delete()
-                return Response({'message': 'Incident logiciel supprimé avec succès'})
-            except SoftwareIncident.DoesNotExist:
-                return Response(
-                    {'message': 'Incident non trouvé'},
-                    status=status.HTTP_404_NOT_FOUND
-                )
+        
+        # Check if user can delete software incidents
+        if user_role not in ['service_integration', 'superadmin']:
+            return Response(
+                {'error': 'Accès non autorisé pour supprimer des incidents logiciels'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        # Delete associated report if exists
+        Report.objects.filter(software_incident=incident).delete()
+        incident.delete()
+        return Response({'message': 'Incident logiciel supprimé avec succès'})
+    
+    def _get_feed_branches(self, user_role, params=None):
+        """Feed branches visible to a role, filtered and projected onto the common columns"""
+        params = params or {}
+        branches = []
+        if user_role in ['superadmin', 'chef_departement', 'service_maintenance']:
+            hardware_incidents = filter_incidents(HardwareIncident.objects.all(), params)
+            branches.append(project_feed(hardware_incidents, 'hardware'))
+        if user_role in ['superadmin', 'chef_departement', 'service_integration']:
+            software_incidents = filter_incidents(SoftwareIncident.objects.all(), params)
+            branches.append(project_feed(software_incidents, 'software'))
+        return branches
+    
+    @action(detail=False, methods=['get'])
+    def feed(self, request):
+        """Unified incident timeline ordered and paginated in the database"""
+        branches = self._get_feed_branches(request.user.role, request.query_params)
+        if not branches:
+            return Response({'results': [], 'count': 0, 'next': None, 'previous': None})
+        
+        paginator = FeedPagination()
+        page = paginator.paginate_querysets(branches, request, view=self)
+        # ?expand=true returns the full incidents instead of the feed columns
+        if request.query_params.get('expand') in ['1', 'true']:
+            return paginator.get_paginated_response(hydrate_feed(page))
+        return paginator.get_paginated_response(page)
     
     @action(detail=False, methods=['get'])
     def stats(self, request):
         """Get incident statistics filtered by role"""
         user_role = request.user.role
         
-        # Filter based on role
-        if user_role == 'service_maintenance':
-            # Only hardware stats
-            hardware_count = HardwareIncident.objects.count()
-            hardware_downtime = HardwareIncident.objects.filter(
-                duree_arret__isnull=False,
-                duree_arret__gt=0
-            ).aggregate(
-                total=Sum('duree_arret'),
-                avg=Avg('duree_arret'),
-                count=Count('id')
-            )
-            total_downtime = hardware_downtime['total'] or 0
-            avg_downtime = hardware_downtime['avg']
-            if avg_downtime:
-                avg_downtime = int(round(avg_downtime))
-            else:
-                avg_downtime = None
-            downtime_count = hardware_downtime['count'] or 0
-            downtime_percentage = int((downtime_count / hardware_count * 100)) if hardware_count > 0 else 0
-            seven_days_ago = timezone.now().date() - timedelta(days=7)
-            thirty_days_ago = timezone.now().date() - timedelta(days=30)
-            hardware_last_7 = HardwareIncident.objects.filter(date__gte=seven_days_ago).count()
-            hardware_last_30 = HardwareIncident.objects.filter(date__gte=thirty_days_ago).count()
-            
-            return Response({
-                'total_incidents': hardware_count,
-                'hardware_incidents': hardware_count,
-                'software_incidents': 0,
-                'hardware_downtime_minutes': int(total_downtime),
-                'hardware_avg_downtime_minutes': avg_downtime,
-                'hardware_incidents_with_downtime': downtime_count,
-                'hardware_downtime_percentage': downtime_percentage,
-                'hardware_last_7_days': hardware_last_7,
-                'hardware_last_30_days': hardware_last_30,
-                'software_last_7_days': 0,
-                'software_last_30_days': 0,
-            })
-        
-        elif user_role == 'service_integration':
-            # Only software stats
-            software_count = SoftwareIncident.objects.count()
-            seven_days_ago = timezone.now().date() - timedelta(days=7)
-            thirty_days_ago = timezone.now().date() - timedelta(days=30)
-            software_last_7 = SoftwareIncident.objects.filter(date__gte=seven_days_ago).count()
-            software_last_30 = SoftwareIncident.objects.filter(date__gte=thirty_days_ago).count()
-            
-            return Response({
-                'total_incidents': software_count,
-                'hardware_incidents': 0,
-                'software_incidents': software_count,
-                'hardware_downtime_minutes': 0,
-                'hardware_avg_downtime_minutes': None,
-                'hardware_incidents_with_downtime': 0,
-                'hardware_downtime_percentage': 0,
-                'hardware_last_7_days': 0,
-                'hardware_last_30_days': 0,
-                'software_last_7_days': software_last_7,
-                'software_last_30_days': software_last_30,
-            })
-        
-        # superadmin and chef_departement see all stats
-        hardware_count = HardwareIncident.objects.count()
-        software_count = SoftwareIncident.objects.count()
-        
-        hardware_downtime = HardwareIncident.objects.filter(
-            duree_arret__isnull=False,
-            duree_arret__gt=0
-        ).aggregate(
-            total=Sum('duree_arret'),
-            avg=Avg('duree_arret'),
-            count=Count('id')
-        )
-        
-        total_downtime = hardware_downtime['total'] or 0
-        avg_downtime = hardware_downtime['avg']
-        if avg_downtime:
-            avg_downtime = int(round(avg_downtime))
-        else:
-            avg_downtime = None
-        
-        downtime_count = hardware_downtime['count'] or 0
-        downtime_percentage = int((downtime_count / hardware_count * 100)) if hardware_count > 0 else 0
-        
-        seven_days_ago = timezone.now().date() - timedelta(days=7)
-        thirty_days_ago = timezone.now().date() - timedelta(days=30)
-        
-        hardware_last_7 = HardwareIncident.objects.filter(date__gte=seven_days_ago).count()
-        hardware_last_30 = HardwareIncident.objects.filter(date__gte=thirty_days_ago).count()
-        software_last_7 = SoftwareIncident.objects.filter(date__gte=seven_days_ago).count()
-        software_last_30 = SoftwareIncident.objects.filter(date__gte=thirty_days_ago).count()
-        
-        stats = {
-            'total_incidents': hardware_count + software_count,
-            'hardware_incidents': hardware_count,
-            'software_incidents': software_count,
-            'hardware_downtime_minutes': int(total_downtime),
-            'hardware_avg_downtime_minutes': avg_downtime,
-            'hardware_incidents_with_downtime': downtime_count,
-            'hardware_downtime_percentage': downtime_percentage,
-            'hardware_last_7_days': hardware_last_7,
-            'hardware_last_30_days': hardware_last_30,
-            'software_last_7_days': software_last_7,
-            'software_last_30_days': software_last_30,
-        }
-        
-        return Response(stats)
+        # service_maintenance only sees hardware, service_integration only software
+        return cached_response(request, 'stats', [HardwareIncident, SoftwareIncident], lambda: incident_stats(
+            **incident_visibility(user_role),
+        ))
     
     @action(detail=False, methods=['get'])
-    def recent(self, request):
-        """Get recent incidents filtered by role"""
+    def facets(self, request):
+        """Distinct filter values with incident counts, for the filter dropdowns"""
         user_role = request.user.role
         
-        if user_role == 'service_maintenance':
-            # Only hardware incidents
-            hardware_recent = HardwareIncident.objects.all()[:5]
-            hardware_data = HardwareIncidentSerializer(hardware_recent, many=True).data
-            return Response(hardware_data)
-        
-        elif user_role == 'service_integration':
-            # Only software incidents
-            software_recent = SoftwareIncident.objects.all()[:5]
-            software_data = SoftwareIncidentSerializer(software_recent, many=True).data
-            return Response(software_data)
-        
-        # superadmin and chef_departement see both
-        hardware_recent = HardwareIncident.objects.all()[:5]
-        software_recent = SoftwareIncident.objects.all()[:5]
-        
-        hardware_data = HardwareIncidentSerializer(hardware_recent, many=True).data
-        software_data = SoftwareIncidentSerializer(software_recent, many=True).data
-        
-        all_incidents = hardware_data + software_data
-        # Sort by created_at descending
-        all_incidents.sort(key=lambda x: x['created_at'], reverse=True)
+        return cached_response(request, 'facets', [HardwareIncident, SoftwareIncident], lambda: incident_facets(
+            request.query_params,
+            **incident_visibility(user_role),
+        ))
+    
+    @action(detail=False, methods=['get'])
+    def histogram(self, request):
+        """Gap-filled incident counts per hour, day, week or month, in a given time zone"""
+        user_role = request.user.role
+        options = parse_histogram_params(request.query_params)
         
-        return Response(all_incidents[:5])
+        return cached_response(request, 'histogram', [HardwareIncident, SoftwareIncident], lambda: incident_histogram(
+            options,
+            **incident_visibility(user_role),
+        ))
+    
+    @action(detail=False, methods=['get'])
+    def recent(self, request):
+        """Get recent incidents filtered by role, from the in-process buffer (see api.recent)"""
+        visibility = incident_visibility(request.user.role)
+        incident_types = [
+            incident_type for incident_type, visible in (
+                ('hardware', visibility['include_hardware']),
+                ('software', visibility['include_software']),
+            ) if visible
+        ]
+        return Response(recent_incidents.latest(incident_types))
 
 
 class ReportViewSet(viewsets.ModelViewSet):
@@ -912,7 +824,7 @@ class ReportViewSet(viewsets.ModelViewSet):
         incident_id = self.request.query_params.get('incident')
         if incident_id:
             queryset = queryset.filter(software_incident_id=incident_id)
-        return queryset
+        return search_queryset(queryset, self.request.query_params.get('q'))
     
     def list(self, request):
         """List reports"""
@@ -926,8 +838,8 @@ class ReportViewSet(viewsets.ModelViewSet):
             )
         
         queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        return Response({'results': serializer.data, 'count': len(serializer.data)})
+        page = self.paginate_queryset(queryset)
+        return self.get_paginated_response(self.get_serializer(page, many=True).data)
     
     def create(self, request):
         """Create or update a report"""
@@ -987,15 +899,20 @@ class ReportViewSet(viewsets.ModelViewSet):
         return super().destroy(request, *args, **kwargs)
 
 
+# Incidents resolved by one EquipmentViewSet.as_of request
+MAX_AS_OF_INCIDENTS = 500
+
+
 class EquipmentViewSet(viewsets.ModelViewSet):
     """ViewSet for handling equipment"""
     permission_classes = [IsAuthenticated]
     serializer_class = EquipmentSerializer
+    pagination_class = EquipmentPagination
     
     def get_permissions(self):
         """Return appropriate permissions based on action"""
         from .permissions import CanModifyEquipment
-        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+        if self.action in ['create', 'update', 'partial_update', 'destroy', 'bulk_import']:
             return [IsAuthenticated(), CanModifyEquipment()]
         return [IsAuthenticated()]
     
@@ -1013,26 +930,12 @@ class EquipmentViewSet(viewsets.ModelViewSet):
         search_serie = self.request.query_params.get('search_serie')
         
         if search_serie:
-            # Return distinct serial numbers for autocomplete
-            serials = Equipement.objects.filter(
-                num_serie__icontains=search_serie,
-                num_serie__isnull=False
-            ).values_list('num_serie', flat=True).distinct()[:10]
-            return list(serials)
+            # Return distinct serial numbers for autocomplete (trigram index, see api.search)
+            return autocomplete_serials(search_serie)
         
         if num_serie:
-            # Get current equipment with this serial number
-            trimmed_serial = num_serie.strip()
-            queryset = Equipement.objects.filter(
-                num_serie__iexact=trimmed_serial,
-                etat='actuel'
-            ).order_by('-created_at')
-            
-            if not queryset.exists():
-                # Fallback without etat condition
-                queryset = Equipement.objects.filter(
-                    num_serie__iexact=trimmed_serial
-                ).order_by('-created_at')
+            # Current equipment with this serial number first, else the latest version
+            queryset = serial_versions(num_serie)
         
         return queryset
     
@@ -1052,15 +955,16 @@ class EquipmentViewSet(viewsets.ModelViewSet):
         
         if search_serie:
             # Return serial numbers list
-            serials = list(self.get_queryset())
+            serials = self.get_queryset()
             return Response({'results': serials, 'count': len(serials)})
         
         queryset = self.get_queryset()
         
         if num_serie:
             # Single result
-            if queryset.exists():
-                serializer = self.get_serializer(queryset.first())
+            equipment = queryset.first()
+            if equipment is not None:
+                serializer = self.get_serializer(equipment)
                 return Response(serializer.data)
             else:
                 return Response(
@@ -1068,9 +972,9 @@ class EquipmentViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_404_NOT_FOUND
                 )
         else:
-            # Multiple results
-            serializer = self.get_serializer(queryset, many=True)
-            return Response({'results': serializer.data, 'count': len(serializer.data)})
+            # Multiple results, sorted on ?sort= (e.g. -incident_count, -last_incident_at)
+            page = self.paginate_queryset(queryset)
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
     
     def create(self, request):
         """Create equipment"""
@@ -1106,7 +1010,15 @@ class EquipmentViewSet(viewsets.ModelViewSet):
             if 'etat' not in serializer.validated_data or not serializer.validated_data.get('etat'):
                 serializer.validated_data['etat'] = 'actuel'
             
-            equipment = serializer.save()
+            try:
+                with transaction.atomic():
+                    equipment = serializer.save()
+            except IntegrityError:
+                # At most one 'actuel' version per serial (see api.versioning)
+                return Response(
+                    {'num_serie': 'Un équipement actuel existe déjà avec ce numéro de série. Modifiez-le pour créer une nouvelle version.'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
             return Response(
                 EquipmentSerializer(equipment).data,
                 status=status.HTTP_201_CREATED
@@ -1153,32 +1065,189 @@ class EquipmentViewSet(viewsets.ModelViewSet):
             
             num_serie = serializer.validated_data.get('num_serie') or existing_equipment.num_serie
             
-            # Find latest equipment with same serial and etat='actuel'
-            latest_equip = Equipement.objects.filter(
-                num_serie=num_serie,
-                etat='actuel'
-            ).order_by('-created_at').first()
-            
-            if latest_equip:
-                # Mark as historique
-                latest_equip.etat = 'historique'
-                latest_equip.save()
-            
-            # Create new equipment with updated data
-            new_equipment = Equipement.objects.create(
-                num_serie=num_serie,
-                nom_equipement=serializer.validated_data['nom_equipement'],
-                partition=serializer.validated_data['partition'],
-                etat='actuel'
+            # Close the current version and create the new one (see api.versioning)
+            new_equipment = create_version(
+                num_serie,
+                serializer.validated_data['nom_equipement'],
+                serializer.validated_data['partition'],
+                replacing=existing_equipment.pk,
             )
             
             return Response(EquipmentSerializer(new_equipment).data)
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
+    @action(detail=False, methods=['post'], url_path='import')
+    def bulk_import(self, request):
+        """
+        Import equipment from a CSV, JSON or NDJSON file (see api.imports).
+
+        The file is sent as the ``file`` field of a multipart form, or as the
+        raw body with a ``text/csv``, ``application/json`` or
+        ``application/x-ndjson`` content type. ``?dry_run=true`` validates
+        without writing.
+        """
+        user_role = request.user.role
+        
+        # Check permissions
+        if user_role == 'chef_departement':
+            return Response(
+                {'error': 'Accès en lecture seule. Import non autorisé.'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        if user_role not in ['service_maintenance', 'superadmin']:
+            return Response(
+                {'error': 'Accès non autorisé pour importer des équipements'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        # The body is read as a stream: request.data is never parsed
+        if (request.content_type or '').startswith('multipart/form-data'):
+            upload = request.FILES.get('file')
+            if upload is None:
+                return Response(
+                    {'file': 'Le fichier est requis'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            stream = upload
+            import_format = import_format_for(upload.name, upload.content_type)
+        else:
+            stream = request.stream
+            import_format = import_format_for(content_type=request.content_type)
+        if import_format is None:
+            return Response(
+                {'file': 'Format non pris en charge. Formats acceptés: CSV, JSON, NDJSON'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if stream is None:
+            return Response(
+                {'file': 'Le fichier est vide'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        dry_run = request.query_params.get('dry_run', '').lower() in ('1', 'true')
+        try:
+            report = import_equipment(iter_import_rows(stream, import_format), dry_run=dry_run)
+        except ImportFormatError as exc:
+            return Response({'file': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        except IntegrityError:
+            return Response(
+                {'error': 'Des équipements du fichier ont été créés en parallèle. Relancez l\'import.'},
+                status=status.HTTP_409_CONFLICT
+            )
+        return Response(report)
+    
+    @action(detail=False, methods=['get'])
+    def reliability(self, request):
+        """
+        Corrective failure leaderboard: MTBF, MTTR and availability per equipment.
+
+        ``group=serial`` merges every version of a serial number. Sorted with
+        ``sort`` (e.g. ``-failures``, ``mtbf_hours``) and paginated with
+        ``page`` / ``page_size``.
+        """
+        if request.user.role == 'service_integration':
+            return Response(
+                {'error': 'Accès non autorisé aux équipements'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        options = reliability.parse_reliability_params(request.query_params)
+        paginator = KeysetPagination()
+        page_size = paginator.get_page_size(request)
+        try:
+            page_number = max(int(request.query_params.get('page', 1)), 1)
+        except ValueError:
+            page_number = 1
+        
+        def build():
+            results, count = reliability.reliability_leaderboard(
+                options, limit=page_size, offset=(page_number - 1) * page_size
+            )
+            url = request.build_absolute_uri()
+            has_next = page_number * page_size < count
+            return {
+                'results': results,
+                'count': count,
+                'next': replace_query_param(url, 'page', page_number + 1) if has_next else None,
+                'previous': replace_query_param(url, 'page', page_number - 1) if page_number > 1 else None,
+            }
+        
+        return cached_response(request, 'reliability', [HardwareIncident, Equipement], build)
+    
+    @action(detail=False, methods=['get'], url_path='as-of')
+    def as_of(self, request):
+        """
+        Equipment version valid at an instant.
+
+        ``?num_serie=...&as_of=...`` returns the version of a serial at
+        ``as_of`` (default: now). ``?incidents=12,HW-13`` resolves, for each
+        hardware incident, the version in place when it happened.
+        """
+        if request.user.role == 'service_integration':
+            return Response(
+                {'error': 'Accès non autorisé aux équipements'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        incident_ids = request.query_params.get('incidents')
+        if incident_ids:
+            ids = []
+            for value in incident_ids.split(','):
+                value = value.strip()
+                if value.upper().startswith(HardwareIncident.public_id_prefix + '-'):
+                    value = value[len(HardwareIncident.public_id_prefix) + 1:]
+                if not (value.isascii() and value.isdigit()):
+                    return Response(
+                        {'incidents': 'Identifiants invalides. Format attendu: 12,HW-13'},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
+                ids.append(int(value))
+            if len(ids) > MAX_AS_OF_INCIDENTS:
+                return Response(
+                    {'incidents': f'Au plus {MAX_AS_OF_INCIDENTS} incidents par requête'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            incidents = list(HardwareIncident.objects.select_related('equipement').filter(pk__in=ids))
+            positions = {pk: position for position, pk in enumerate(dict.fromkeys(ids))}
+            incidents.sort(key=lambda incident: positions[incident.id])
+            versions = versions_for_incidents(incidents)
+            results = [
+                {
+                    'incident_id': incident.id,
+                    'public_id': incident.public_id,
+                    'equipment': EquipmentSerializer(versions[incident.id]).data if versions[incident.id] else None,
+                }
+                for incident in incidents
+            ]
+            return Response({'results': results, 'count': len(results)})
+        
+        num_serie = (request.query_params.get('num_serie') or '').strip()
+        if not num_serie:
+            return Response(
+                {'num_serie': 'Le numéro de série ou la liste d\'incidents est requis'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        instant = (
+            parse_instant('as_of', request.query_params['as_of']) if request.query_params.get('as_of')
+            else timezone.now()
+        )
+        equipment = version_as_of(num_serie, instant)
+        if equipment is None:
+            return Response(
+                {'message': 'Aucune version de cet équipement à cette date'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return Response(EquipmentSerializer(equipment).data)
+    
     @action(detail=True, methods=['get'])
     def history(self, request, pk=None):
-        """Get all incidents related to a specific equipment"""
+        """
+        Incidents of every version of an equipment's serial, newest first.
+
+        Cursor-paginated (``page_size``, ``cursor``); ``?count=exact`` adds
+        the total.
+        """
         try:
             equipment = Equipement.objects.get(pk=pk)
         except Equipement.DoesNotExist:
@@ -1187,21 +1256,16 @@ class EquipmentViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        # Get all hardware incidents for this equipment (by equipement_id or serial number)
-        hardware_incidents = HardwareIncident.objects.filter(
-            Q(equipement_id=equipment.id) | 
-            Q(numero_de_serie__iexact=equipment.num_serie)
-        ).order_by('-date', '-time')
-        
-        hardware_data = HardwareIncidentSerializer(hardware_incidents, many=True).data
-        
-        # Get equipment info
-        equipment_data = EquipmentSerializer(equipment).data
+        hardware_incidents = serial_incidents(equipment).select_related('equipement')
+        paginator = HistoryPagination()
+        page = paginator.paginate_querysets([hardware_incidents], request, view=self)
         
         return Response({
-            'equipment': equipment_data,
-            'incidents': hardware_data,
-            'count': len(hardware_data)
+            'equipment': EquipmentSerializer(equipment).data,
+            'incidents': HardwareIncidentSerializer(page, many=True).data,
+            'count': paginator.count,
+            'next': paginator.get_next_link(),
+            'previous': paginator.get_previous_link(),
         })
 
 
@@ -1232,8 +1296,8 @@ class UserViewSet(viewsets.ModelViewSet):
             return check_result
         
         queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        return Response({'results': serializer.data, 'count': len(serializer.data)})
+        page = self.paginate_queryset(queryset)
+        return self.get_paginated_response(self.get_serializer(page, many=True).data)
     
     def create(self, request):
         """Create a new user"""
@@ -1279,3 +1343,76 @@ class UserViewSet(viewsets.ModelViewSet):
         
         return super().destroy(request, *args, **kwargs)
 
+
+class AnalyticsViewSet(viewsets.ViewSet):
+    """
+    Dashboard aggregates computed in SQL (see api.analytics).
+
+    Every endpoint accepts ``year``, ``partition``, ``maintenance_type`` and
+    ``period`` (week, month, year). Incident types the role cannot access
+    come back empty.
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def _respond(self, request, name, build):
+        """Validate the parameters and return the cached aggregate"""
+        user_role = request.user.role
+        filters = analytics.parse_analytics_params(request.query_params)
+        return cached_response(request, f'analytics-{name}', [HardwareIncident, SoftwareIncident], lambda: build(
+            filters,
+            **incident_visibility(user_role),
+        ))
+    
+    @action(detail=False, methods=['get'])
+    def years(self, request):
+        """Years with incidents, most recent first"""
+        return self._respond(request, 'years', analytics.available_years)
+    
+    @action(detail=False, methods=['get'])
+    def summary(self, request):
+        """Partition and server breakdowns, maintenance types, downtime count"""
+        return self._respond(request, 'summary', analytics.summary)
+    
+    @action(detail=False, methods=['get'], url_path='by-day')
+    def by_day(self, request):
+        """Daily counts over the last 30 days"""
+        return self._respond(request, 'by-day', analytics.incidents_by_day)
+    
+    @action(detail=False, methods=['get'], url_path='by-period')
+    def by_period(self, request):
+        """Counts per week, month or year"""
+        return self._respond(request, 'by-period', analytics.incidents_by_period)
+    
+    @action(detail=False, methods=['get'], url_path='monthly-trend')
+    def monthly_trend(self, request):
+        """Counts for the last 6 months with incidents"""
+        return self._respond(request, 'monthly-trend', analytics.monthly_trend)
+    
+    @action(detail=False, methods=['get'], url_path='by-equipment')
+    def by_equipment(self, request):
+        """Top 15 equipment by hardware incident count"""
+        return self._respond(request, 'by-equipment', analytics.incidents_by_equipment)
+    
+    @action(detail=False, methods=['get'], url_path='software-by-anomaly')
+    def software_by_anomaly(self, request):
+        """Software incidents per anomaly type and period"""
+        return self._respond(request, 'software-by-anomaly', analytics.software_by_anomaly)
+    
+    @action(detail=False, methods=['get'])
+    def pivot(self, request):
+        """Partition (or server / nom_radar) x month matrix of counts and downtime"""
+        options = analytics.parse_pivot_params(request.query_params)
+        return self._respond(
+            request, 'pivot',
+            lambda filters, **visibility: analytics.incident_pivot(filters, options, **visibility)
+        )
+    
+    @action(detail=False, methods=['get'], url_path='corrective-by-year')
+    def corrective_by_year(self, request):
+        """Corrective hardware incidents per year, all years"""
+        return self._respond(request, 'corrective-by-year', analytics.corrective_by_year)
+    
+    @action(detail=False, methods=['get'], url_path='corrective-by-server')
+    def corrective_by_server(self, request):
+        """Corrective hardware incidents per partition, all years"""
+        return self._respond(request, 'corrective-by-server', analytics.corrective_by_partition)
@@ -0,0 +1,196 @@
+# Standard library imports
+import logging
+import os
+import threading
+import time
+
+# Django imports
+from django.conf import settings
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import close_old_connections
+from django.utils import timezone
+
+# Local imports
+from . import analytics
+from .cache import canonical_query, get_cache, get_or_build
+from .models import User, HardwareIncident, SoftwareIncident
+from .permissions import incident_visibility
+from .recent import recent_incidents
+from .stats import incident_facets, incident_stats
+
+logger = logging.getLogger(__name__)
+
+INCIDENT_MODELS = [HardwareIncident, SoftwareIncident]
+
+# Analytics endpoint name -> builder, as routed by AnalyticsViewSet
+ANALYTICS_TARGETS = {
+    'years': analytics.available_years,
+    'summary': analytics.summary,
+    'by-day': analytics.incidents_by_day,
+    'by-period': analytics.incidents_by_period,
+    'monthly-trend': analytics.monthly_trend,
+    'by-equipment': analytics.incidents_by_equipment,
+    'software-by-anomaly': analytics.software_by_anomaly,
+    'corrective-by-year': analytics.corrective_by_year,
+    'corrective-by-server': analytics.corrective_by_partition,
+}
+
+
+def cache_is_process_local():
+    """Whether entries stored by this process are invisible to the others"""
+    return isinstance(get_cache(), (LocMemCache, DummyCache))
+
+
+# Analytics endpoints the dashboard sends the selected period to; the others
+# take the year only, or nothing for the ones spanning every year
+PERIOD_TARGETS = ('by-period', 'software-by-anomaly')
+ALL_YEARS_TARGETS = ('years', 'corrective-by-year', 'corrective-by-server')
+
+
+def dashboard_params(name):
+    """
+    Parameter sets the dashboard sends to the analytics endpoint ``name``.
+
+    useDashboardAnalytics (src/hooks/useDashboardAnalytics.ts) starts on the
+    current year, for which it sends no maintenance type, and only passes
+    ``period`` to the endpoints grouping by it.
+    """
+    if name in ALL_YEARS_TARGETS:
+        return [{}]
+    year = timezone.now().date().year
+    if name in PERIOD_TARGETS:
+        return [{'year': year, 'period': period} for period in analytics.PERIOD_TRUNCS]
+    return [{'year': year}]
+
+
+def _visible_types(role):
+    visibility = incident_visibility(role)
+    return [
+        incident_type for incident_type, visible in (
+            ('hardware', visibility['include_hardware']),
+            ('software', visibility['include_software']),
+        ) if visible
+    ]
+
+
+def _analytics(build):
+    def build_for_role(role, params):
+        return build(analytics.parse_analytics_params(params), **incident_visibility(role))
+    return build_for_role
+
+
+def warm_targets():
+    """
+    ``(name, models, param sets, build(role, params))`` for every response worth precomputing.
+
+    Names and models match the ones the views pass to cached_response and
+    the parameter sets the ones the frontend sends, so a warmed entry is
+    exactly what its requests read. ``recent`` has no models: it is served
+    from the per-process buffer of api.recent, which warming loads.
+    """
+    no_params = [{}]
+    targets = [
+        ('stats', INCIDENT_MODELS, no_params, lambda role, params: incident_stats(**incident_visibility(role))),
+        ('facets', INCIDENT_MODELS, no_params, lambda role, params: incident_facets(params, **incident_visibility(role))),
+        ('recent', None, no_params, lambda role, params: recent_incidents.latest(_visible_types(role))),
+    ]
+    targets += [
+        (f'analytics-{name}', INCIDENT_MODELS, dashboard_params(name), _analytics(build))
+        for name, build in ANALYTICS_TARGETS.items()
+    ]
+    return targets
+
+
+def warm_caches(roles=None, names=None):
+    """
+    Rebuild and store the responses the frontend requests, for every role.
+
+    Entries are recomputed even when already cached, so the warmer also
+    refreshes data close to expiry. Returns ``(name, role, seconds)`` for
+    each warmed item, the name carrying its query string.
+    """
+    roles = roles or [role for role, _ in User.ROLE_CHOICES]
+    timings = []
+    for name, models, param_sets, build in warm_targets():
+        if names and name not in names:
+            continue
+        for params in param_sets:
+            query = canonical_query(params)
+            for role in roles:
+                started = time.perf_counter()
+                if models is None:
+                    build(role, params)
+                else:
+                    get_or_build(name, role, query, models, lambda: build(role, params), refresh=True)
+                timings.append((f'{name}?{query}' if query else name, role, time.perf_counter() - started))
+    return timings
+
+
+class CacheWarmer(threading.Thread):
+    """Daemon thread calling warm_caches() every ``interval`` seconds"""
+
+    def __init__(self, interval):
+        super().__init__(name='api-cache-warmer', daemon=True)
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.is_set():
+            try:
+                timings = warm_caches()
+                logger.info(
+                    'Warmed %d cache entries in %.2fs',
+                    len(timings), sum(seconds for _, _, seconds in timings)
+                )
+                for name, role, seconds in sorted(timings, key=lambda timing: -timing[2])[:5]:
+                    logger.debug('  %s (%s): %.3fs', name, role, seconds)
+            except Exception:
+                logger.exception('Cache warm-up failed')
+            finally:
+                # The thread owns its connection; do not keep it open between runs
+                close_old_connections()
+            self.stopped.wait(self.interval)
+
+    def stop(self):
+        self.stopped.set()
+
+
+_warmer = None
+_warmer_lock = threading.Lock()
+
+
+def start_warmer(interval):
+    """Start the process-wide warmer once; later calls are no-ops"""
+    global _warmer
+    with _warmer_lock:
+        if _warmer is None:
+            _warmer = CacheWarmer(interval)
+            _warmer.start()
+    return _warmer
+
+
+def _restart_after_fork():
+    # Threads do not survive fork(): a server that loads the application
+    # before forking its workers (gunicorn --preload) gets one per worker
+    global _warmer, _warmer_lock
+    _warmer_lock = threading.Lock()
+    if _warmer is not None:
+        interval = _warmer.interval
+        _warmer = None
+        start_warmer(interval)
+
+
+def start_warmer_at_boot():
+    """
+    Start the warmer if API_CACHE_WARM_INTERVAL is set.
+
+    Called from the WSGI and ASGI modules, which only web server processes
+    import, so management commands (migrate, shell...) never run it.
+    """
+    if settings.API_CACHE_WARM_INTERVAL <= 0:
+        return None
+    return start_warmer(settings.API_CACHE_WARM_INTERVAL)
+
+
+os.register_at_fork(after_in_child=_restart_after_fork)
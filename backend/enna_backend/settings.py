@@ -260,9 +260,31 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
-    'DEFAULT_PAGINATION_CLASS': None,
+    # Keyset (cursor) pagination, opt-in per request via ?cursor= / ?page_size=
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.KeysetPagination',
+    'PAGE_SIZE': 50,
 }
 
+# Cache settings
+# Local memory by default (per process). Point CACHE_BACKEND / CACHE_LOCATION at a
+# shared backend (e.g. django.core.cache.backends.redis.RedisCache) when running
+# several workers, so that invalidations reach all of them.
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='enna-api'),
+    }
+}
+
+# Cached API responses (stats, recent, facets), invalidated by model signals
+API_CACHE_ALIAS = 'default'
+API_CACHE_TIMEOUT = config('API_CACHE_TIMEOUT', default=300, cast=int)
+# Seconds between two runs of the in-process cache warmer (api.warmup); 0 disables
+# it. Keep it below API_CACHE_TIMEOUT so warmed entries never expire.
+API_CACHE_WARM_INTERVAL = config('API_CACHE_WARM_INTERVAL', default=0, cast=int)
+# Incidents of each type kept in memory for /api/incidents/recent/ (api.recent)
+API_RECENT_BUFFER_SIZE = config('API_RECENT_BUFFER_SIZE', default=20, cast=int)
+
 # JWT Settings
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=1),  # Reduced from 24h to 1h for security
@@ -287,6 +309,7 @@ CORS_ALLOWED_ORIGINS = [
 # In production, only allow specific origins
 CORS_ALLOW_ALL_ORIGINS = DEBUG
 CORS_ALLOW_CREDENTIALS = True
+CORS_EXPOSE_HEADERS = ['X-Cache']
 
 # Additional CORS settings for production
 if not DEBUG:
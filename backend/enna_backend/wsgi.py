@@ -15,3 +15,9 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'enna_backend.settings')
 
 application = get_wsgi_application()
 
+# Optional in-process cache warmer (API_CACHE_WARM_INTERVAL), started as the
+# worker boots; imported once the application has set Django up
+from api.warmup import start_warmer_at_boot  # noqa: E402
+
+start_warmer_at_boot()
+
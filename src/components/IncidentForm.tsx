@@ -136,6 +136,8 @@ export function IncidentForm({ onSubmit, type, title, initialData }: IncidentFor
   const [equipmentHistory, setEquipmentHistory] = useState<Incident[]>([]);
   const [historyEquipment, setHistoryEquipment] = useState<Equipment | null>(null);
   const [loadingHistory, setLoadingHistory] = useState(false);
+  const [historyCount, setHistoryCount] = useState<number | null>(null);
+  const [historyNext, setHistoryNext] = useState<string | null>(null);
   // Get default date and time (GMT/UTC)
   const getDefaultDate = () => {
     if (initialData?.date) return initialData.date;
@@ -434,6 +436,8 @@ export function IncidentForm({ onSubmit, type, title, initialData }: IncidentFor
       const history = await apiClient.getEquipmentHistory(equipmentId);
       setEquipmentHistory(history.incidents);
       setHistoryEquipment(history.equipment);
+      setHistoryCount(history.count);
+      setHistoryNext(history.next);
       setHistoryDialogOpen(true);
     } catch (error: any) {
       toast.error(error.message || "Erreur lors du chargement de l'historique");
@@ -442,6 +446,20 @@ export function IncidentForm({ onSubmit, type, title, initialData }: IncidentFor
     }
   };
 
+  const handleLoadMoreHistory = async () => {
+    if (!historyEquipment || !historyNext) return;
+    try {
+      setLoadingHistory(true);
+      const history = await apiClient.getEquipmentHistory(historyEquipment.id, historyNext);
+      setEquipmentHistory(prev => [...prev, ...history.incidents]);
+      setHistoryNext(history.next);
+    } catch (error: any) {
+      toast.error(error.message || "Erreur lors du chargement de l'historique");
+    } finally {
+      setLoadingHistory(false);
+    }
+  };
+
   return (
     <Card>
       <CardHeader>
@@ -1043,12 +1061,12 @@ export function IncidentForm({ onSubmit, type, title, initialData }: IncidentFor
                 <div className="mt-2 space-y-1">
                   <p><strong>Numéro de série:</strong> {historyEquipment.num_serie || "N/A"}</p>
                   <p><strong>Partition:</strong> {historyEquipment.partition}</p>
-                  <p><strong>Total d'incidents:</strong> {equipmentHistory.length}</p>
+                  <p><strong>Total d'incidents:</strong> {historyCount ?? equipmentHistory.length}</p>
                 </div>
               )}
             </DialogDescription>
           </DialogHeader>
-          {loadingHistory ? (
+          {loadingHistory && equipmentHistory.length === 0 ? (
             <div className="flex items-center justify-center py-8">
               <div className="text-muted-foreground">Chargement de l'historique...</div>
             </div>
@@ -1057,7 +1075,16 @@ export function IncidentForm({ onSubmit, type, title, initialData }: IncidentFor
               Aucun incident enregistré pour cet équipement
             </div>
           ) : (
-            <IncidentTable incidents={equipmentHistory} />
+            <>
+              <IncidentTable incidents={equipmentHistory} />
+              {historyNext && (
+                <div className="flex justify-center pt-4">
+                  <Button variant="outline" onClick={handleLoadMoreHistory} disabled={loadingHistory}>
+                    {loadingHistory ? "Chargement..." : "Charger plus"}
+                  </Button>
+                </div>
+              )}
+            </>
           )}
         </DialogContent>
       </Dialog>
@@ -0,0 +1,192 @@
+import { useState, useEffect } from "react";
+import {
+  apiClient,
+  AnalyticsSummary,
+  Incident,
+  IncidentStats,
+  NamedCount,
+  PeriodCounts,
+  SoftwareAnomalyAnalytics,
+} from "@/services/api";
+import { useAuth } from "@/hooks/useAuth";
+import { usePermissions } from "@/hooks/usePermissions";
+
+export type PeriodType = 'week' | 'month' | 'year';
+
+type DailyCounts = Omit<PeriodCounts, 'period'> & { date: string };
+
+// Rows of the "recent incidents" lists
+const RECENT_LIMIT = 10;
+
+const EMPTY_SUMMARY: AnalyticsSummary = {
+  hardware_by_partition: [],
+  software_by_server: [],
+  maintenance_types: { preventive: 0, corrective: 0 },
+  hardware_incidents_with_downtime: 0,
+};
+
+const EMPTY_ANOMALIES: SoftwareAnomalyAnalytics = {
+  chart_data: [],
+  anomaly_types: [],
+  anomaly_counts: [],
+};
+
+/**
+ * Dashboard data, aggregated server-side (/api/analytics/).
+ *
+ * Each endpoint only receives the parameters it depends on, so switching the
+ * period does not refetch the yearly figures and the requests hit the
+ * entries the cache warmer precomputes (see backend/api/warmup.py).
+ */
+export function useDashboardAnalytics(
+  year: number,
+  period: PeriodType,
+  maintenanceType?: 'preventive' | 'corrective'
+) {
+  const { isAuthenticated, loading: authLoading } = useAuth();
+  const permissions = usePermissions();
+  const ready = !authLoading && isAuthenticated;
+
+  const [years, setYears] = useState<number[]>([]);
+  const [stats, setStats] = useState<IncidentStats | null>(null);
+  const [correctiveByYear, setCorrectiveByYear] = useState<Array<{ year: number; count: number }>>([]);
+  const [correctiveByServer, setCorrectiveByServer] = useState<Array<{ server: string; count: number }>>([]);
+
+  const [summary, setSummary] = useState<AnalyticsSummary>(EMPTY_SUMMARY);
+  const [byDay, setByDay] = useState<DailyCounts[]>([]);
+  const [monthlyTrend, setMonthlyTrend] = useState<PeriodCounts[]>([]);
+  const [byEquipment, setByEquipment] = useState<NamedCount[]>([]);
+  const [recentHardware, setRecentHardware] = useState<Incident[]>([]);
+  const [recentSoftware, setRecentSoftware] = useState<Incident[]>([]);
+
+  const [byPeriod, setByPeriod] = useState<PeriodCounts[]>([]);
+  const [softwareByAnomaly, setSoftwareByAnomaly] = useState<SoftwareAnomalyAnalytics>(EMPTY_ANOMALIES);
+
+  const [loading, setLoading] = useState(true);
+  const [error, setError] = useState<string | null>(null);
+
+  const fail = (err: any) => {
+    setError(err.message || "Erreur lors du chargement du tableau de bord");
+    console.error("Error loading dashboard analytics:", err);
+  };
+
+  // Figures independent of the selected year
+  useEffect(() => {
+    if (!ready) {
+      return;
+    }
+    let cancelled = false;
+    Promise.all([
+      apiClient.getAnalyticsYears(),
+      apiClient.getIncidentStats(),
+      apiClient.getCorrectiveIncidentsByYear(),
+      apiClient.getCorrectiveIncidentsByServer(),
+    ])
+      .then(([yearsData, statsData, byYearData, byServerData]) => {
+        if (cancelled) {
+          return;
+        }
+        setYears(yearsData);
+        setStats(statsData);
+        setCorrectiveByYear(byYearData);
+        setCorrectiveByServer(byServerData);
+      })
+      .catch(err => !cancelled && fail(err));
+    return () => {
+      cancelled = true;
+    };
+  }, [ready]);
+
+  // Yearly figures
+  useEffect(() => {
+    if (authLoading) {
+      return;
+    }
+    if (!isAuthenticated) {
+      setLoading(false);
+      return;
+    }
+    let cancelled = false;
+    const params = { year, maintenance_type: maintenanceType };
+    // The recent lists are read straight from the incidents, one short page each
+    const recent = (type: 'hardware' | 'software', allowed: boolean) =>
+      allowed
+        ? apiClient.getIncidents({
+            type,
+            date_from: `${year}-01-01`,
+            date_to: `${year}-12-31`,
+            maintenance_type: type === 'hardware' ? maintenanceType : undefined,
+            page_size: RECENT_LIMIT,
+          }).then(page => page.results)
+        : Promise.resolve([]);
+
+    setLoading(true);
+    setError(null);
+    Promise.all([
+      apiClient.getAnalyticsSummary(params),
+      apiClient.getIncidentsByDay(params),
+      apiClient.getMonthlyTrend(params),
+      apiClient.getIncidentsByEquipment(params),
+      recent('hardware', permissions.canAccessHardwareIncidents),
+      recent('software', permissions.canAccessSoftwareIncidents),
+    ])
+      .then(([summaryData, byDayData, trendData, equipmentData, hardwareData, softwareData]) => {
+        if (cancelled) {
+          return;
+        }
+        setSummary(summaryData);
+        setByDay(byDayData);
+        setMonthlyTrend(trendData);
+        setByEquipment(equipmentData);
+        setRecentHardware(hardwareData);
+        setRecentSoftware(softwareData);
+      })
+      .catch(err => !cancelled && fail(err))
+      .finally(() => !cancelled && setLoading(false));
+    return () => {
+      cancelled = true;
+    };
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [year, maintenanceType, isAuthenticated, authLoading]);
+
+  // Figures grouped by the selected period
+  useEffect(() => {
+    if (!ready) {
+      return;
+    }
+    let cancelled = false;
+    const params = { year, period, maintenance_type: maintenanceType };
+    Promise.all([
+      apiClient.getIncidentsByPeriod(params),
+      apiClient.getSoftwareIncidentsByAnomaly(params),
+    ])
+      .then(([periodData, anomalyData]) => {
+        if (cancelled) {
+          return;
+        }
+        setByPeriod(periodData);
+        setSoftwareByAnomaly(anomalyData);
+      })
+      .catch(err => !cancelled && fail(err));
+    return () => {
+      cancelled = true;
+    };
+  }, [ready, year, period, maintenanceType]);
+
+  return {
+    years,
+    stats,
+    summary,
+    byDay,
+    byPeriod,
+    monthlyTrend,
+    byEquipment,
+    softwareByAnomaly,
+    correctiveByYear,
+    correctiveByServer,
+    recentHardware,
+    recentSoftware,
+    loading,
+    error,
+  };
+}
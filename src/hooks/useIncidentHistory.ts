@@ -0,0 +1,88 @@
+import { useState, useEffect, useRef } from "react";
+import { apiClient, Incident, IncidentListParams } from "@/services/api";
+import { useAuth } from "@/hooks/useAuth";
+
+// Wait for the user to stop typing before querying the backend
+const FILTER_DELAY_MS = 300;
+
+export function useIncidentHistory(params: IncidentListParams, enabled = true) {
+  const { isAuthenticated, loading: authLoading } = useAuth();
+  const [incidents, setIncidents] = useState<Incident[]>([]);
+  const [count, setCount] = useState<number | null>(null);
+  const [next, setNext] = useState<string | null>(null);
+  const [loading, setLoading] = useState(true);
+  const [error, setError] = useState<string | null>(null);
+  // Responses of superseded filters are dropped
+  const requestId = useRef(0);
+
+  const paramsKey = JSON.stringify(params);
+
+  // Filters are applied server-side: reload the first page when they change
+  useEffect(() => {
+    if (authLoading) {
+      return;
+    }
+    if (!isAuthenticated || !enabled) {
+      setLoading(false);
+      return;
+    }
+    const timeoutId = setTimeout(() => {
+      loadPage(null);
+    }, FILTER_DELAY_MS);
+    return () => clearTimeout(timeoutId);
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [paramsKey, isAuthenticated, authLoading, enabled]);
+
+  const loadPage = async (cursor: string | null) => {
+    const currentRequest = ++requestId.current;
+    try {
+      setLoading(true);
+      setError(null);
+
+      const page = await apiClient.getIncidents({
+        ...params,
+        cursor,
+        // Total of the matching incidents, only needed once per filter
+        count: cursor ? undefined : 'exact',
+      });
+      if (currentRequest !== requestId.current) {
+        return;
+      }
+      setIncidents(prev => (cursor ? [...prev, ...page.results] : page.results));
+      if (!cursor) {
+        setCount(page.count);
+      }
+      setNext(page.next);
+    } catch (err: any) {
+      if (currentRequest !== requestId.current) {
+        return;
+      }
+      setError(err.message || "Erreur lors du chargement des incidents");
+      console.error("Error loading incidents:", err);
+      if (!cursor) {
+        setIncidents([]);
+        setCount(0);
+        setNext(null);
+      }
+    } finally {
+      if (currentRequest === requestId.current) {
+        setLoading(false);
+      }
+    }
+  };
+
+  const loadMore = () => {
+    if (next && !loading) {
+      loadPage(next);
+    }
+  };
+
+  return {
+    incidents,
+    count,
+    hasMore: next !== null,
+    loading,
+    error,
+    loadMore,
+  };
+}
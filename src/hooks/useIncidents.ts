@@ -33,17 +33,17 @@ export function useIncidents() {
       setError(null);
 
       // Only load incidents that the user has permission to access
-      const loadPromises: Promise<any>[] = [];
+      // Each list is read one cursor page at a time (see apiClient.getAllIncidents)
+      const loadPromises: Promise<Incident[]>[] = [];
 
       if (permissions.canAccessHardwareIncidents) {
         loadPromises.push(
-          apiClient.getIncidents({ type: 'hardware' }).catch(err => {
+          apiClient.getAllIncidents({ type: 'hardware' }).catch(err => {
             // If 403, user doesn't have access - return empty
-            if (err.status === 403) {
-              return { results: [], count: 0 };
+            if (err.status !== 403) {
+              console.error("Error loading hardware incidents:", err);
             }
-            console.error("Error loading hardware incidents:", err);
-            return { results: [], count: 0 };
+            return [];
           })
         );
       } else {
@@ -53,13 +53,12 @@ export function useIncidents() {
 
       if (permissions.canAccessSoftwareIncidents) {
         loadPromises.push(
-          apiClient.getIncidents({ type: 'software' }).catch(err => {
+          apiClient.getAllIncidents({ type: 'software' }).catch(err => {
             // If 403, user doesn't have access - return empty
-            if (err.status === 403) {
-              return { results: [], count: 0 };
+            if (err.status !== 403) {
+              console.error("Error loading software incidents:", err);
             }
-            console.error("Error loading software incidents:", err);
-            return { results: [], count: 0 };
+            return [];
           })
         );
       } else {
@@ -74,11 +73,11 @@ export function useIncidents() {
         // Set results based on what was loaded
         let responseIndex = 0;
         if (permissions.canAccessHardwareIncidents) {
-          setHardwareIncidents(responses[responseIndex]?.results || []);
+          setHardwareIncidents(responses[responseIndex] || []);
           responseIndex++;
         }
         if (permissions.canAccessSoftwareIncidents) {
-          setSoftwareIncidents(responses[responseIndex]?.results || []);
+          setSoftwareIncidents(responses[responseIndex] || []);
         }
       }
     } catch (err: any) {
@@ -201,7 +200,7 @@ export function useIncidents() {
 
   const deleteHardwareIncident = async (id: number) => {
     try {
-      await apiClient.deleteIncident(id);
+      await apiClient.deleteIncident(id, 'hardware');
       setHardwareIncidents(prev => prev.filter(i => i.id !== id));
       loadStats(); // Refresh stats
     } catch (err: any) {
@@ -272,7 +271,7 @@ export function useIncidents() {
 
   const deleteSoftwareIncident = async (id: number) => {
     try {
-      await apiClient.deleteIncident(id);
+      await apiClient.deleteIncident(id, 'software');
       setSoftwareIncidents(prev => prev.filter(i => i.id !== id));
       setReports(prev => prev.filter(r => r.incident !== id));
       loadStats(); // Refresh stats
@@ -4,62 +4,67 @@ import { StatCard } from "@/components/StatCard";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from "@/components/ui/select";
 import { Label } from "@/components/ui/label";
-import { useIncidents } from "@/hooks/useIncidents";
+import { useDashboardAnalytics, PeriodType } from "@/hooks/useDashboardAnalytics";
 import { LineChart, Line, BarChart, Bar, PieChart, Pie, Cell, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer } from "recharts";
 
-type PeriodType = 'week' | 'month' | 'year';
+// Helper function to parse the YYYY-MM-DD dates of the analytics endpoints as local dates
+const parseDay = (day: string): Date => {
+  const [year, month, date] = day.split('-').map(Number);
+  return new Date(year, month - 1, date);
+};
+
+// Helper function to get week number
+const getWeekNumber = (date: Date): number => {
+  const d = new Date(Date.UTC(date.getFullYear(), date.getMonth(), date.getDate()));
+  const dayNum = d.getUTCDay() || 7;
+  d.setUTCDate(d.getUTCDate() + 4 - dayNum);
+  const yearStart = new Date(Date.UTC(d.getUTCFullYear(), 0, 1));
+  return Math.ceil((((d.getTime() - yearStart.getTime()) / 86400000) + 1) / 7);
+};
+
+// Helper function to get the label of a period from its first day (a Monday for weeks)
+const getPeriodLabel = (start: string, period: PeriodType): string => {
+  const date = parseDay(start);
+  if (period === 'week') {
+    const week = getWeekNumber(date);
+    const month = date.toLocaleDateString('fr-FR', { month: 'short' });
+    return `${date.getFullYear()}-S${week.toString().padStart(2, '0')} (${month})`;
+  } else if (period === 'month') {
+    return date.toLocaleDateString('fr-FR', { month: 'short', year: 'numeric' });
+  } else {
+    return date.getFullYear().toString();
+  }
+};
 
 export default function AdminDashboard() {
-  const { hardwareIncidents, softwareIncidents, stats, loading } = useIncidents();
-  
   const [hardwareSortBy, setHardwareSortBy] = useState<string>("date-desc");
   const [softwareSortBy, setSoftwareSortBy] = useState<string>("date-desc");
   const [periodType, setPeriodType] = useState<PeriodType>('month');
   const [selectedYear, setSelectedYear] = useState<number>(new Date().getFullYear());
   
-  // Get available years from incidents
-  const availableYears = useMemo(() => {
-    const years = new Set<number>();
-    [...hardwareIncidents, ...softwareIncidents].forEach(incident => {
-      const date = new Date(incident.date || incident.created_at || Date.now());
-      years.add(date.getFullYear());
-    });
-    return Array.from(years).sort((a, b) => b - a); // Most recent first
-  }, [hardwareIncidents, softwareIncidents]);
-  
   const currentYear = new Date().getFullYear();
   const isCurrentYear = selectedYear === currentYear;
   
-  // Filter incidents by selected year and maintenance type
-  const filteredHardwareIncidents = useMemo(() => {
-    return hardwareIncidents.filter(incident => {
-      const incidentDate = new Date(incident.date || incident.created_at || Date.now());
-      const incidentYear = incidentDate.getFullYear();
-      
-      // Filter by year
-      if (incidentYear !== selectedYear) {
-        return false;
-      }
-      
-      // For previous years, only show corrective maintenance
-      if (!isCurrentYear && incident.maintenance_type !== 'corrective') {
-        return false;
-      }
-      
-      return true;
-    });
-  }, [hardwareIncidents, selectedYear, isCurrentYear]);
-  
-  const filteredSoftwareIncidents = useMemo(() => {
-    return softwareIncidents.filter(incident => {
-      const incidentDate = new Date(incident.date || incident.created_at || Date.now());
-      const incidentYear = incidentDate.getFullYear();
-      return incidentYear === selectedYear;
-    });
-  }, [softwareIncidents, selectedYear]);
+  // Aggregates are computed server-side; for previous years, only corrective
+  // maintenance is counted for hardware incidents
+  const {
+    years: availableYears,
+    stats,
+    summary,
+    byDay,
+    byPeriod,
+    monthlyTrend: trend,
+    byEquipment: incidentsByEquipment,
+    softwareByAnomaly,
+    correctiveByYear: correctiveIncidentsByYear,
+    correctiveByServer: correctiveIncidentsByServer,
+    recentHardware,
+    recentSoftware,
+  } = useDashboardAnalytics(selectedYear, periodType, isCurrentYear ? undefined : 'corrective');
   
+  // The recent lists hold a single short page: sorting them stays client-side
   const sortedHardwareIncidents = useMemo(() => {
-    return [...filteredHardwareIncidents].sort((a, b) => {
+    return [...recentHardware].sort((a, b) => {
       switch (hardwareSortBy) {
         case "date-desc":
           return new Date(b.created_at || b.date).getTime() - new Date(a.created_at || a.date).getTime();
@@ -85,10 +90,10 @@ export default function AdminDashboard() {
           return 0;
       }
     });
-  }, [filteredHardwareIncidents, hardwareSortBy]);
+  }, [recentHardware, hardwareSortBy]);
   
   const sortedSoftwareIncidents = useMemo(() => {
-    return [...filteredSoftwareIncidents].sort((a, b) => {
+    return [...recentSoftware].sort((a, b) => {
       switch (softwareSortBy) {
         case "date-desc":
           return new Date(b.created_at || b.date).getTime() - new Date(a.created_at || a.date).getTime();
@@ -114,307 +119,47 @@ export default function AdminDashboard() {
           return 0;
       }
     });
-  }, [filteredSoftwareIncidents, softwareSortBy]);
-  
-  // Calculate statistics using filtered incidents
-  const incidentsWithDowntime = useMemo(() => {
-    return filteredHardwareIncidents.filter(i => i.duree_arret && i.duree_arret > 0);
-  }, [filteredHardwareIncidents]);
+  }, [recentSoftware, softwareSortBy]);
   
-  const serverStats = useMemo(() => {
-    const stats: Record<string, number> = {};
-    filteredSoftwareIncidents.forEach(inc => {
-      if (inc.server) {
-        stats[inc.server] = (stats[inc.server] || 0) + 1;
-      }
-    });
-    return Object.entries(stats).sort((a, b) => b[1] - a[1]);
-  }, [filteredSoftwareIncidents]);
-  
-  const hardwareServerStats = useMemo(() => {
-    const stats: Record<string, number> = {};
-    filteredHardwareIncidents.forEach(inc => {
-      // For hardware, we can use partition as server equivalent, or extract server from equipment name
-      const server = inc.partition || 'Non spécifié';
-      stats[server] = (stats[server] || 0) + 1;
-    });
-    return Object.entries(stats).sort((a, b) => b[1] - a[1]);
-  }, [filteredHardwareIncidents]);
-
-  const softwareServerStats = useMemo(() => {
-    const stats: Record<string, number> = {};
-    filteredSoftwareIncidents.forEach(inc => {
-      if (inc.server) {
-        stats[inc.server] = (stats[inc.server] || 0) + 1;
-      }
-    });
-    return Object.entries(stats).sort((a, b) => b[1] - a[1]);
-  }, [filteredSoftwareIncidents]);
+  // Labels of the period and day series
+  const incidentsByPeriod = useMemo(() => {
+    return byPeriod.map(entry => ({ ...entry, period: getPeriodLabel(entry.period, periodType) }));
+  }, [byPeriod, periodType]);
 
-  const maintenanceTypeStats = useMemo(() => {
-    const stats = { preventive: 0, corrective: 0 };
-    filteredHardwareIncidents.forEach(inc => {
-      if (inc.maintenance_type === 'preventive') {
-        stats.preventive++;
-      } else if (inc.maintenance_type === 'corrective') {
-        stats.corrective++;
-      }
-    });
-    return stats;
-  }, [filteredHardwareIncidents]);
-  
-  // Prepare data for charts
   const incidentsByDay = useMemo(() => {
-    const last30Days = Array.from({ length: 30 }, (_, i) => {
-      const date = new Date();
-      date.setDate(date.getDate() - (29 - i));
-      const dateStr = date.toISOString().split('T')[0];
-      return {
-        date: dateStr,
-        day: date.toLocaleDateString('fr-FR', { day: 'numeric', month: 'short' }),
-        hardware: 0,
-        software: 0,
-        total: 0
-      };
-    });
-
-    filteredHardwareIncidents.forEach(incident => {
-      const incidentDate = incident.date || incident.created_at?.split('T')[0];
-      if (incidentDate) {
-        const dayData = last30Days.find(d => d.date === incidentDate);
-        if (dayData) {
-          dayData.hardware++;
-          dayData.total++;
-        }
-      }
-    });
-    
-    filteredSoftwareIncidents.forEach(incident => {
-      const incidentDate = incident.date || incident.created_at?.split('T')[0];
-      if (incidentDate) {
-        const dayData = last30Days.find(d => d.date === incidentDate);
-        if (dayData) {
-          dayData.software++;
-          dayData.total++;
-        }
-      }
-    });
-
-    return last30Days;
-  }, [filteredHardwareIncidents, filteredSoftwareIncidents]);
-
-  // Bar chart data for top servers (separated by hardware/software)
-  const topHardwareServersData = useMemo(() => {
-    const servers: Record<string, number> = {};
-    filteredHardwareIncidents.forEach(inc => {
-      const server = inc.partition || 'Non spécifié';
-      servers[server] = (servers[server] || 0) + 1;
-    });
-    return Object.entries(servers)
-      .sort((a, b) => b[1] - a[1])
-      .slice(0, 10)
-      .map(([name, value]) => ({ name, value }));
-  }, [filteredHardwareIncidents]);
+    return byDay.map(entry => ({
+      ...entry,
+      day: parseDay(entry.date).toLocaleDateString('fr-FR', { day: 'numeric', month: 'short' }),
+    }));
+  }, [byDay]);
 
-  const topSoftwareServersData = useMemo(() => {
-    const servers: Record<string, number> = {};
-    filteredSoftwareIncidents.forEach(inc => {
-      if (inc.server) {
-        servers[inc.server] = (servers[inc.server] || 0) + 1;
-      }
-    });
-    return Object.entries(servers)
-      .sort((a, b) => b[1] - a[1])
-      .slice(0, 10)
-      .map(([name, value]) => ({ name, value }));
-  }, [filteredSoftwareIncidents]);
-
-  // Monthly trend data
   const monthlyTrend = useMemo(() => {
-    const months: Record<string, { hardware: number; software: number }> = {};
-    filteredHardwareIncidents.forEach(incident => {
-      const date = new Date(incident.date || incident.created_at || Date.now());
-      const monthKey = date.toLocaleDateString('fr-FR', { month: 'short', year: 'numeric' });
-      if (!months[monthKey]) {
-        months[monthKey] = { hardware: 0, software: 0 };
-      }
-      months[monthKey].hardware++;
-    });
-    filteredSoftwareIncidents.forEach(incident => {
-      const date = new Date(incident.date || incident.created_at || Date.now());
-      const monthKey = date.toLocaleDateString('fr-FR', { month: 'short', year: 'numeric' });
-      if (!months[monthKey]) {
-        months[monthKey] = { hardware: 0, software: 0 };
-      }
-      months[monthKey].software++;
-    });
-    return Object.entries(months)
-      .map(([month, data]) => ({ month, ...data, total: data.hardware + data.software }))
-      .slice(-6); // Last 6 months
-  }, [filteredHardwareIncidents, filteredSoftwareIncidents]);
+    return trend.map(entry => ({ ...entry, month: getPeriodLabel(entry.period, 'month') }));
+  }, [trend]);
+
+  const softwareIncidentsByAnomaly = useMemo(() => ({
+    chartData: softwareByAnomaly.chart_data.map(entry => ({
+      ...entry,
+      period: getPeriodLabel(String(entry.period), periodType),
+    })),
+    anomalyTypes: softwareByAnomaly.anomaly_types,
+    anomalyCounts: softwareByAnomaly.anomaly_counts,
+  }), [softwareByAnomaly, periodType]);
+
+  // Totals of the selected year
+  const hardwareTotal = useMemo(() => byPeriod.reduce((sum, entry) => sum + entry.hardware, 0), [byPeriod]);
+  const softwareTotal = useMemo(() => byPeriod.reduce((sum, entry) => sum + entry.software, 0), [byPeriod]);
+  const maintenanceTypeStats = summary.maintenance_types;
+  const incidentsWithDowntime = summary.hardware_incidents_with_downtime;
+
+  // Breakdowns by partition (hardware) and server (software), largest first
+  const topHardwareServersData = summary.hardware_by_partition.slice(0, 10);
+  const topSoftwareServersData = summary.software_by_server.slice(0, 10);
+  const hardwareServerStats = summary.hardware_by_partition;
+  const softwareServerStats = summary.software_by_server;
 
   const COLORS = ['#3b82f6', '#f59e0b', '#10b981', '#ef4444', '#8b5cf6', '#ec4899'];
 
-  // Helper function to get period key from date
-  const getPeriodKey = (date: Date, period: PeriodType): string => {
-    if (period === 'week') {
-      const year = date.getFullYear();
-      const week = getWeekNumber(date);
-      // Get the Monday of the week for better sorting
-      const monday = getMondayOfWeek(date);
-      const month = monday.toLocaleDateString('fr-FR', { month: 'short' });
-      return `${year}-S${week.toString().padStart(2, '0')} (${month})`;
-    } else if (period === 'month') {
-      return date.toLocaleDateString('fr-FR', { month: 'short', year: 'numeric' });
-    } else {
-      return date.getFullYear().toString();
-    }
-  };
-
-  // Helper function to get Monday of the week
-  const getMondayOfWeek = (date: Date): Date => {
-    const d = new Date(date);
-    const day = d.getDay();
-    const diff = d.getDate() - day + (day === 0 ? -6 : 1); // Adjust when day is Sunday
-    return new Date(d.setDate(diff));
-  };
-
-  // Helper function to get week number
-  const getWeekNumber = (date: Date): number => {
-    const d = new Date(Date.UTC(date.getFullYear(), date.getMonth(), date.getDate()));
-    const dayNum = d.getUTCDay() || 7;
-    d.setUTCDate(d.getUTCDate() + 4 - dayNum);
-    const yearStart = new Date(Date.UTC(d.getUTCFullYear(), 0, 1));
-    return Math.ceil((((d.getTime() - yearStart.getTime()) / 86400000) + 1) / 7);
-  };
-
-  // Total incidents by period
-  const incidentsByPeriod = useMemo(() => {
-    const periodMap: Record<string, { total: number; hardware: number; software: number }> = {};
-    
-    filteredHardwareIncidents.forEach(incident => {
-      const incidentDate = new Date(incident.date || incident.created_at || Date.now());
-      const periodKey = getPeriodKey(incidentDate, periodType);
-      
-      if (!periodMap[periodKey]) {
-        periodMap[periodKey] = { total: 0, hardware: 0, software: 0 };
-      }
-      
-      periodMap[periodKey].total++;
-      periodMap[periodKey].hardware++;
-    });
-    
-    filteredSoftwareIncidents.forEach(incident => {
-      const incidentDate = new Date(incident.date || incident.created_at || Date.now());
-      const periodKey = getPeriodKey(incidentDate, periodType);
-      
-      if (!periodMap[periodKey]) {
-        periodMap[periodKey] = { total: 0, hardware: 0, software: 0 };
-      }
-      
-      periodMap[periodKey].total++;
-      periodMap[periodKey].software++;
-    });
-
-    return Object.entries(periodMap)
-      .map(([period, data]) => ({ period, ...data }))
-      .sort((a, b) => {
-        // Sort by period key (works for year, month, and week formats)
-        return a.period.localeCompare(b.period);
-      });
-  }, [filteredHardwareIncidents, filteredSoftwareIncidents, periodType]);
-
-  // Incidents by equipment
-  const incidentsByEquipment = useMemo(() => {
-    const equipmentMap: Record<string, number> = {};
-    
-    filteredHardwareIncidents.forEach(incident => {
-      const equipmentName = incident.nom_de_equipement || 'Non spécifié';
-      equipmentMap[equipmentName] = (equipmentMap[equipmentName] || 0) + 1;
-    });
-
-    return Object.entries(equipmentMap)
-      .sort((a, b) => b[1] - a[1])
-      .slice(0, 15) // Top 15 equipment
-      .map(([name, value]) => ({ name, value }));
-  }, [filteredHardwareIncidents]);
-
-  // Software incidents by anomaly type (grouped by period)
-  const softwareIncidentsByAnomaly = useMemo(() => {
-    const anomalyMap: Record<string, Record<string, number>> = {};
-    
-    filteredSoftwareIncidents.forEach(incident => {
-      const anomalyType = incident.type_d_anomalie || 'Non spécifié';
-      const incidentDate = new Date(incident.date || incident.created_at || Date.now());
-      const periodKey = getPeriodKey(incidentDate, periodType);
-      
-      if (!anomalyMap[anomalyType]) {
-        anomalyMap[anomalyType] = {};
-      }
-      
-      anomalyMap[anomalyType][periodKey] = (anomalyMap[anomalyType][periodKey] || 0) + 1;
-    });
-
-    // Get all unique periods
-    const allPeriods = new Set<string>();
-    Object.values(anomalyMap).forEach(periodData => {
-      Object.keys(periodData).forEach(period => allPeriods.add(period));
-    });
-    const sortedPeriods = Array.from(allPeriods).sort();
-
-    // Transform to chart data format
-    const chartData = sortedPeriods.map(period => {
-      const data: Record<string, any> = { period };
-      Object.keys(anomalyMap).forEach(anomalyType => {
-        data[anomalyType] = anomalyMap[anomalyType][period] || 0;
-      });
-      return data;
-    });
-
-    return {
-      chartData,
-      anomalyTypes: Object.keys(anomalyMap).sort(),
-      anomalyCounts: Object.entries(anomalyMap).map(([type, periods]) => ({
-        type,
-        total: Object.values(periods).reduce((sum, count) => sum + count, 0)
-      })).sort((a, b) => b.total - a.total)
-    };
-  }, [filteredSoftwareIncidents, periodType]);
-
-  // Corrective incidents comparison across years (using ALL incidents, not filtered)
-  const correctiveIncidentsByYear = useMemo(() => {
-    const yearMap: Record<number, number> = {};
-    
-    hardwareIncidents.forEach(incident => {
-      if (incident.maintenance_type === 'corrective') {
-        const incidentDate = new Date(incident.date || incident.created_at || Date.now());
-        const year = incidentDate.getFullYear();
-        yearMap[year] = (yearMap[year] || 0) + 1;
-      }
-    });
-
-    return Object.entries(yearMap)
-      .map(([year, count]) => ({ year: parseInt(year), count }))
-      .sort((a, b) => a.year - b.year);
-  }, [hardwareIncidents]);
-
-  // Corrective incidents comparison across servers (using ALL incidents, not filtered)
-  const correctiveIncidentsByServer = useMemo(() => {
-    const serverMap: Record<string, number> = {};
-    
-    hardwareIncidents.forEach(incident => {
-      if (incident.maintenance_type === 'corrective') {
-        const server = incident.partition || 'Non spécifié';
-        serverMap[server] = (serverMap[server] || 0) + 1;
-      }
-    });
-
-    return Object.entries(serverMap)
-      .map(([server, count]) => ({ server, count }))
-      .sort((a, b) => b.count - a.count)
-      .slice(0, 15); // Top 15 servers
-  }, [hardwareIncidents]);
-
   return (
     <div className="space-y-6">
       <div>
@@ -439,7 +184,7 @@ export default function AdminDashboard() {
         <div className="grid gap-6 md:grid-cols-2 lg:grid-cols-4">
           <StatCard
             title="Total Incidents Matériels"
-            value={filteredHardwareIncidents.length}
+            value={hardwareTotal}
             icon={Cpu}
             variant="accent"
             trend={!isCurrentYear ? "Uniquement maintenance corrective" : undefined}
@@ -460,13 +205,13 @@ export default function AdminDashboard() {
           />
           <StatCard
             title="Incidents avec arrêt"
-            value={stats?.hardware_incidents_with_downtime || incidentsWithDowntime.length}
+            value={stats?.hardware_incidents_with_downtime || incidentsWithDowntime}
             icon={AlertTriangle}
             variant="primary"
             trend={stats?.hardware_downtime_percentage !== undefined 
               ? `${stats.hardware_downtime_percentage}% des incidents matériels` 
-              : hardwareIncidents.length > 0
-                ? `${Math.round((incidentsWithDowntime.length / hardwareIncidents.length) * 100)}% des incidents`
+              : hardwareTotal > 0
+                ? `${Math.round((incidentsWithDowntime / hardwareTotal) * 100)}% des incidents`
                 : undefined}
           />
         </div>
@@ -485,7 +230,7 @@ export default function AdminDashboard() {
               value={maintenanceTypeStats.preventive}
               icon={TrendingUp}
               variant="accent"
-              trend={`${filteredHardwareIncidents.length > 0 ? Math.round((maintenanceTypeStats.preventive / filteredHardwareIncidents.length) * 100) : 0}% des incidents matériels`}
+              trend={`${hardwareTotal > 0 ? Math.round((maintenanceTypeStats.preventive / hardwareTotal) * 100) : 0}% des incidents matériels`}
             />
           )}
           <StatCard
@@ -493,7 +238,7 @@ export default function AdminDashboard() {
             value={maintenanceTypeStats.corrective}
             icon={AlertTriangle}
             variant="warning"
-            trend={`${filteredHardwareIncidents.length > 0 ? Math.round((maintenanceTypeStats.corrective / filteredHardwareIncidents.length) * 100) : 0}% des incidents matériels`}
+            trend={`${hardwareTotal > 0 ? Math.round((maintenanceTypeStats.corrective / hardwareTotal) * 100) : 0}% des incidents matériels`}
           />
         </div>
       </div>
@@ -511,7 +256,7 @@ export default function AdminDashboard() {
         <div className="grid gap-6 md:grid-cols-2 lg:grid-cols-3">
           <StatCard
             title="Total Incidents Logiciels"
-            value={filteredSoftwareIncidents.length}
+            value={softwareTotal}
             icon={HardDrive}
             variant="warning"
           />
@@ -982,7 +727,7 @@ export default function AdminDashboard() {
               <div>
                 <h4 className="text-sm font-semibold mb-2">Répartition par serveur</h4>
                 <div className="grid grid-cols-2 gap-2">
-                  {hardwareServerStats.slice(0, 6).map(([server, count]) => (
+                  {hardwareServerStats.slice(0, 6).map(({ name: server, value: count }) => (
                     <div key={server} className="text-center p-2 rounded-lg border border-border bg-muted/30">
                       <div className="text-lg font-bold">{count}</div>
                       <div className="text-xs text-muted-foreground">{server}</div>
@@ -1009,7 +754,7 @@ export default function AdminDashboard() {
               <div>
                 <h4 className="text-sm font-semibold mb-2">Répartition par serveur</h4>
                 <div className="grid grid-cols-2 gap-2">
-                  {softwareServerStats.slice(0, 6).map(([server, count]) => (
+                  {softwareServerStats.slice(0, 6).map(({ name: server, value: count }) => (
                     <div key={server} className="text-center p-2 rounded-lg border border-border bg-muted/30">
                       <div className="text-lg font-bold">{count}</div>
                       <div className="text-xs text-muted-foreground">{server}</div>
@@ -1,18 +1,19 @@
-import { useState, useMemo, useEffect } from "react";
+import { useState, useEffect } from "react";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
+import { Button } from "@/components/ui/button";
 import { Input } from "@/components/ui/input";
 import { Label } from "@/components/ui/label";
+import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from "@/components/ui/select";
 import { Tabs, TabsContent, TabsList, TabsTrigger } from "@/components/ui/tabs";
 import { IncidentTable } from "@/components/IncidentTable";
-import { useIncidents } from "@/hooks/useIncidents";
+import { useIncidentHistory } from "@/hooks/useIncidentHistory";
 import { usePermissions } from "@/hooks/usePermissions";
 import { Search, Cpu, HardDrive } from "lucide-react";
 
 export default function History() {
-  const { hardwareIncidents, softwareIncidents } = useIncidents();
   const permissions = usePermissions();
   const [activeTab, setActiveTab] = useState<"hardware" | "software">("hardware");
-  
+
   // Set initial tab based on permissions
   useEffect(() => {
     if (!permissions.canAccessHardwareIncidents && permissions.canAccessSoftwareIncidents) {
@@ -21,40 +22,36 @@ export default function History() {
       setActiveTab("hardware");
     }
   }, [permissions]);
-  
+
   const [hardwareFilters, setHardwareFilters] = useState({
-    search: "",
+    q: "",
+    date_from: "",
+    date_to: "",
+    partition: "",
+    maintenance_type: "" as "" | "preventive" | "corrective",
   });
 
   const [softwareFilters, setSoftwareFilters] = useState({
-    search: "",
+    q: "",
+    date_from: "",
+    date_to: "",
+    server: "",
+    type_d_anomalie: "",
   });
 
-  const filteredHardwareIncidents = useMemo(() => {
-    return hardwareIncidents.filter((incident) => {
-      const searchText = hardwareFilters.search.toLowerCase();
-      const matchesSearch =
-        (incident.description || '').toLowerCase().includes(searchText) ||
-        (incident.nom_de_equipement || '').toLowerCase().includes(searchText) ||
-        (incident.numero_de_serie || '').toLowerCase().includes(searchText) ||
-        (incident.partition || '').toLowerCase().includes(searchText);
-
-      return matchesSearch;
-    });
-  }, [hardwareIncidents, hardwareFilters.search]);
-
-  const filteredSoftwareIncidents = useMemo(() => {
-    return softwareIncidents.filter((incident) => {
-      const searchText = softwareFilters.search.toLowerCase();
-      const matchesSearch =
-        (incident.description || '').toLowerCase().includes(searchText) ||
-        (incident.sujet || '').toLowerCase().includes(searchText) ||
-        (incident.server || '').toLowerCase().includes(searchText) ||
-        (incident.type_d_anomalie || '').toLowerCase().includes(searchText);
-
-      return matchesSearch;
-    });
-  }, [softwareIncidents, softwareFilters.search]);
+  // Filtering happens server-side, one page at a time
+  const hardware = useIncidentHistory(
+    {
+      type: "hardware",
+      ...hardwareFilters,
+      maintenance_type: hardwareFilters.maintenance_type || undefined,
+    },
+    permissions.canAccessHardwareIncidents
+  );
+  const software = useIncidentHistory(
+    { type: "software", ...softwareFilters },
+    permissions.canAccessSoftwareIncidents
+  );
 
   return (
     <div className="space-y-6">
@@ -70,13 +67,13 @@ export default function History() {
           {permissions.canAccessHardwareIncidents && (
             <TabsTrigger value="hardware" className="flex items-center gap-2">
               <Cpu className="h-4 w-4" />
-              Incidents Matériels ({hardwareIncidents.length})
+              Incidents Matériels ({hardware.count ?? hardware.incidents.length})
             </TabsTrigger>
           )}
           {permissions.canAccessSoftwareIncidents && (
             <TabsTrigger value="software" className="flex items-center gap-2">
               <HardDrive className="h-4 w-4" />
-              Incidents Logiciels ({softwareIncidents.length})
+              Incidents Logiciels ({software.count ?? software.incidents.length})
             </TabsTrigger>
           )}
         </TabsList>
@@ -87,22 +84,76 @@ export default function History() {
               <CardTitle>Filtres de recherche - Matériel</CardTitle>
             </CardHeader>
             <CardContent>
-              <div className="grid gap-4 md:grid-cols-1">
-                <div className="space-y-2">
+              <div className="grid gap-4 md:grid-cols-2">
+                <div className="space-y-2 md:col-span-2">
                   <Label htmlFor="hardware-search">Recherche</Label>
                   <div className="relative">
                     <Search className="absolute left-3 top-3 h-4 w-4 text-muted-foreground" />
                     <Input
                       id="hardware-search"
-                      placeholder="Rechercher par description, équipement, numéro de série, partition..."
+                      placeholder="Rechercher dans la description, l'anomalie observée, l'action réalisée..."
                       className="pl-9"
-                      value={hardwareFilters.search}
+                      value={hardwareFilters.q}
                       onChange={(e) =>
-                        setHardwareFilters({ ...hardwareFilters, search: e.target.value })
+                        setHardwareFilters({ ...hardwareFilters, q: e.target.value })
                       }
                     />
                   </div>
                 </div>
+                <div className="space-y-2">
+                  <Label htmlFor="hardware-date-from">Du</Label>
+                  <Input
+                    id="hardware-date-from"
+                    type="date"
+                    value={hardwareFilters.date_from}
+                    onChange={(e) =>
+                      setHardwareFilters({ ...hardwareFilters, date_from: e.target.value })
+                    }
+                  />
+                </div>
+                <div className="space-y-2">
+                  <Label htmlFor="hardware-date-to">Au</Label>
+                  <Input
+                    id="hardware-date-to"
+                    type="date"
+                    value={hardwareFilters.date_to}
+                    onChange={(e) =>
+                      setHardwareFilters({ ...hardwareFilters, date_to: e.target.value })
+                    }
+                  />
+                </div>
+                <div className="space-y-2">
+                  <Label htmlFor="hardware-partition">Partition</Label>
+                  <Input
+                    id="hardware-partition"
+                    placeholder="Partition exacte"
+                    value={hardwareFilters.partition}
+                    onChange={(e) =>
+                      setHardwareFilters({ ...hardwareFilters, partition: e.target.value })
+                    }
+                  />
+                </div>
+                <div className="space-y-2">
+                  <Label htmlFor="hardware-maintenance-type">Type de maintenance</Label>
+                  <Select
+                    value={hardwareFilters.maintenance_type || "all"}
+                    onValueChange={(value) =>
+                      setHardwareFilters({
+                        ...hardwareFilters,
+                        maintenance_type: value === "all" ? "" : value as "preventive" | "corrective",
+                      })
+                    }
+                  >
+                    <SelectTrigger id="hardware-maintenance-type">
+                      <SelectValue />
+                    </SelectTrigger>
+                    <SelectContent>
+                      <SelectItem value="all">Tous</SelectItem>
+                      <SelectItem value="preventive">Préventive</SelectItem>
+                      <SelectItem value="corrective">Corrective</SelectItem>
+                    </SelectContent>
+                  </Select>
+                </div>
               </div>
             </CardContent>
           </Card>
@@ -110,11 +161,18 @@ export default function History() {
           <Card>
             <CardHeader>
               <CardTitle>
-                Incidents Matériels ({filteredHardwareIncidents.length})
+                Incidents Matériels ({hardware.count ?? hardware.incidents.length})
               </CardTitle>
             </CardHeader>
             <CardContent>
-              <IncidentTable incidents={filteredHardwareIncidents} />
+              <IncidentTable incidents={hardware.incidents} />
+              {hardware.hasMore && (
+                <div className="flex justify-center pt-4">
+                  <Button variant="outline" onClick={hardware.loadMore} disabled={hardware.loading}>
+                    {hardware.loading ? "Chargement..." : "Charger plus"}
+                  </Button>
+                </div>
+              )}
             </CardContent>
           </Card>
         </TabsContent>
@@ -125,22 +183,66 @@ export default function History() {
               <CardTitle>Filtres de recherche - Logiciel</CardTitle>
             </CardHeader>
             <CardContent>
-              <div className="grid gap-4 md:grid-cols-1">
-                <div className="space-y-2">
+              <div className="grid gap-4 md:grid-cols-2">
+                <div className="space-y-2 md:col-span-2">
                   <Label htmlFor="software-search">Recherche</Label>
                   <div className="relative">
                     <Search className="absolute left-3 top-3 h-4 w-4 text-muted-foreground" />
                     <Input
                       id="software-search"
-                      placeholder="Rechercher par description, sujet, serveur, type d'anomalie..."
+                      placeholder="Rechercher dans la description, les commentaires..."
                       className="pl-9"
-                      value={softwareFilters.search}
+                      value={softwareFilters.q}
                       onChange={(e) =>
-                        setSoftwareFilters({ ...softwareFilters, search: e.target.value })
+                        setSoftwareFilters({ ...softwareFilters, q: e.target.value })
                       }
                     />
                   </div>
                 </div>
+                <div className="space-y-2">
+                  <Label htmlFor="software-date-from">Du</Label>
+                  <Input
+                    id="software-date-from"
+                    type="date"
+                    value={softwareFilters.date_from}
+                    onChange={(e) =>
+                      setSoftwareFilters({ ...softwareFilters, date_from: e.target.value })
+                    }
+                  />
+                </div>
+                <div className="space-y-2">
+                  <Label htmlFor="software-date-to">Au</Label>
+                  <Input
+                    id="software-date-to"
+                    type="date"
+                    value={softwareFilters.date_to}
+                    onChange={(e) =>
+                      setSoftwareFilters({ ...softwareFilters, date_to: e.target.value })
+                    }
+                  />
+                </div>
+                <div className="space-y-2">
+                  <Label htmlFor="software-server">Serveur</Label>
+                  <Input
+                    id="software-server"
+                    placeholder="Serveur exact"
+                    value={softwareFilters.server}
+                    onChange={(e) =>
+                      setSoftwareFilters({ ...softwareFilters, server: e.target.value })
+                    }
+                  />
+                </div>
+                <div className="space-y-2">
+                  <Label htmlFor="software-anomaly-type">Type d'anomalie</Label>
+                  <Input
+                    id="software-anomaly-type"
+                    placeholder="Type d'anomalie exact"
+                    value={softwareFilters.type_d_anomalie}
+                    onChange={(e) =>
+                      setSoftwareFilters({ ...softwareFilters, type_d_anomalie: e.target.value })
+                    }
+                  />
+                </div>
               </div>
             </CardContent>
           </Card>
@@ -148,11 +250,18 @@ export default function History() {
           <Card>
             <CardHeader>
               <CardTitle>
-                Incidents Logiciels ({filteredSoftwareIncidents.length})
+                Incidents Logiciels ({software.count ?? software.incidents.length})
               </CardTitle>
             </CardHeader>
             <CardContent>
-              <IncidentTable incidents={filteredSoftwareIncidents} />
+              <IncidentTable incidents={software.incidents} />
+              {software.hasMore && (
+                <div className="flex justify-center pt-4">
+                  <Button variant="outline" onClick={software.loadMore} disabled={software.loading}>
+                    {software.loading ? "Chargement..." : "Charger plus"}
+                  </Button>
+                </div>
+              )}
             </CardContent>
           </Card>
         </TabsContent>
@@ -1,38 +1,31 @@
 // React imports
-import { useState, useMemo } from "react";
+import { useState } from "react";
 
 // Third-party imports
 import { Search, Cpu } from "lucide-react";
 
 // Local hook imports
-import { useIncidents } from "@/hooks/useIncidents";
+import { useIncidentHistory } from "@/hooks/useIncidentHistory";
 
 // Local component imports
 import { IncidentTable } from "@/components/IncidentTable";
 
 // UI component imports
+import { Button } from "@/components/ui/button";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Input } from "@/components/ui/input";
 import { Label } from "@/components/ui/label";
 
 export default function HistoryHardware() {
-  const { hardwareIncidents } = useIncidents();
   const [filters, setFilters] = useState({
-    search: "",
+    q: "",
   });
 
-  const filteredIncidents = useMemo(() => {
-    return hardwareIncidents.filter((incident) => {
-      const searchText = filters.search.toLowerCase();
-      const matchesSearch =
-        (incident.description || '').toLowerCase().includes(searchText) ||
-        (incident.nom_de_equipement || '').toLowerCase().includes(searchText) ||
-        (incident.numero_de_serie || '').toLowerCase().includes(searchText) ||
-        (incident.partition || '').toLowerCase().includes(searchText);
-
-      return matchesSearch;
-    });
-  }, [hardwareIncidents, filters.search]);
+  // Filtering happens server-side, one page at a time
+  const { incidents, count, hasMore, loading, loadMore } = useIncidentHistory({
+    type: "hardware",
+    q: filters.q,
+  });
 
   return (
     <div className="space-y-6">
@@ -55,11 +48,11 @@ export default function HistoryHardware() {
                 <Search className="absolute left-3 top-3 h-4 w-4 text-muted-foreground" />
                 <Input
                   id="search"
-                  placeholder="Rechercher par description, équipement, numéro de série, partition..."
+                  placeholder="Rechercher dans la description, l'anomalie observée, l'action réalisée..."
                   className="pl-9"
-                  value={filters.search}
+                  value={filters.q}
                   onChange={(e) =>
-                    setFilters({ ...filters, search: e.target.value })
+                    setFilters({ ...filters, q: e.target.value })
                   }
                 />
               </div>
@@ -71,11 +64,18 @@ export default function HistoryHardware() {
       <Card>
         <CardHeader>
           <CardTitle>
-            Incidents Matériels ({filteredIncidents.length})
+            Incidents Matériels ({count ?? incidents.length})
           </CardTitle>
         </CardHeader>
         <CardContent>
-          <IncidentTable incidents={filteredIncidents} />
+          <IncidentTable incidents={incidents} />
+          {hasMore && (
+            <div className="flex justify-center pt-4">
+              <Button variant="outline" onClick={loadMore} disabled={loading}>
+                {loading ? "Chargement..." : "Charger plus"}
+              </Button>
+            </div>
+          )}
         </CardContent>
       </Card>
     </div>
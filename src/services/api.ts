@@ -47,6 +47,8 @@ export interface User {
 
 export interface Incident {
   id: number;
+  // Type-prefixed id, unique across both incident tables ("HW-12", "SW-12")
+  public_id?: string;
   incident_type: 'hardware' | 'software';
   date: string;
   time: string;
@@ -106,10 +108,67 @@ export interface Equipment {
   nom_equipement: string;
   partition: string;
   etat?: string;
+  // Period during which this version was current (valid_to is null for the current one)
+  valid_from?: string;
+  valid_to?: string | null;
+  // Hardware incidents linked to this version
+  incident_count?: number;
+  corrective_count?: number;
+  total_downtime?: number;
+  last_incident_at?: string | null;
   created_at: string;
   updated_at: string;
 }
 
+// One page of a cursor-paginated list; `next` is null on the last page
+export interface Page<T> {
+  results: T[];
+  count: number | null;
+  next: string | null;
+  previous: string | null;
+}
+
+export type IncidentListParams = {
+  type?: 'hardware' | 'software';
+  date_from?: string;
+  date_to?: string;
+  partition?: string;
+  maintenance_type?: 'preventive' | 'corrective';
+  server?: string;
+  type_d_anomalie?: string;
+  nom_radar?: string;
+  simulateur?: boolean;
+  salle_operationnelle?: boolean;
+  has_downtime?: boolean;
+  // Full-text search over the incident narratives
+  q?: string;
+};
+
+// Largest page the backend serves (KeysetPagination.max_page_size)
+const MAX_PAGE_SIZE = 500;
+
+function cursorOf(link: string | null): string | null {
+  return link ? new URL(link).searchParams.get('cursor') : null;
+}
+
+function toSearchParams(params?: object): URLSearchParams {
+  const searchParams = new URLSearchParams();
+  Object.entries(params ?? {}).forEach(([key, value]) => {
+    if (value !== undefined && value !== null && value !== '') {
+      searchParams.set(key, String(value));
+    }
+  });
+  return searchParams;
+}
+
+export interface EquipmentHistoryPage {
+  equipment: Equipment;
+  incidents: Incident[];
+  count: number | null;
+  next: string | null;
+  previous: string | null;
+}
+
 export interface LoginRequest {
   username: string;
   password: string;
@@ -138,6 +197,64 @@ export interface IncidentStats {
   maintenance_corrective_count?: number;
 }
 
+export interface AnalyticsParams {
+  year?: number;
+  partition?: string;
+  maintenance_type?: 'preventive' | 'corrective';
+  period?: 'week' | 'month' | 'year';
+}
+
+export interface NamedCount {
+  name: string;
+  value: number;
+}
+
+export interface PeriodCounts {
+  period: string;
+  hardware: number;
+  software: number;
+  total: number;
+}
+
+export interface AnalyticsSummary {
+  hardware_by_partition: NamedCount[];
+  software_by_server: NamedCount[];
+  maintenance_types: { preventive: number; corrective: number };
+  hardware_incidents_with_downtime: number;
+}
+
+export interface IncidentPivot {
+  rows: string[];
+  columns: string[];
+  count: number[][];
+  downtime_minutes: number[][];
+  row_totals: { count: number[]; downtime_minutes: number[] };
+  column_totals: { count: number[]; downtime_minutes: number[] };
+  total: { count: number; downtime_minutes: number };
+}
+
+export interface HistogramBucket {
+  start: string;
+  hardware: number;
+  software: number;
+  total: number;
+  hardware_downtime_minutes: number;
+}
+
+export interface IncidentHistogram {
+  bucket: 'hour' | 'day' | 'week' | 'month';
+  tz: string;
+  from: string;
+  to: string;
+  results: HistogramBucket[];
+}
+
+export interface SoftwareAnomalyAnalytics {
+  chart_data: Array<Record<string, string | number>>;
+  anomaly_types: string[];
+  anomaly_counts: Array<{ type: string; total: number }>;
+}
+
 // ============================================================================
 // API Client
 // ============================================================================
@@ -172,6 +289,20 @@ class ApiClient {
     }
   }
 
+  // List endpoints return one page at a time: follow the cursors to the last one
+  private async collectPages<T>(path: string, searchParams: URLSearchParams = new URLSearchParams()): Promise<T[]> {
+    const results: T[] = [];
+    searchParams.set('page_size', String(MAX_PAGE_SIZE));
+    let cursor: string | null = null;
+    do {
+      if (cursor) searchParams.set('cursor', cursor);
+      const page: Page<T> = await this.request<Page<T>>(`${path}?${searchParams.toString()}`);
+      results.push(...page.results);
+      cursor = cursorOf(page.next);
+    } while (cursor);
+    return results;
+  }
+
   private async request<T>(
     endpoint: string,
     options: RequestInit = {}
@@ -426,20 +557,30 @@ class ApiClient {
   // Incident Methods
   // ========================================================================
   
-  async getIncidents(params?: {
-    type?: 'hardware' | 'software';
-  }): Promise<{ results: Incident[]; count: number }> {
-    const searchParams = new URLSearchParams();
-    if (params?.type) searchParams.set('type', params.type);
+  async getIncidents(params?: IncidentListParams & {
+    page_size?: number;
+    // Cursor of the page to load: the `next` or `previous` link of another page
+    cursor?: string | null;
+    count?: 'exact' | 'estimate';
+  }): Promise<Page<Incident>> {
+    // Filters are applied server-side, only the matching slice is returned
+    const { cursor, ...filters } = params ?? {};
+    const searchParams = toSearchParams({ ...filters, cursor: cursorOf(cursor ?? null) });
     
     const queryString = searchParams.toString();
     const endpoint = queryString ? `/incidents/?${queryString}` : '/incidents/';
     
-    return this.request<{ results: Incident[]; count: number }>(endpoint);
+    return this.request<Page<Incident>>(endpoint);
+  }
+
+  async getAllIncidents(params?: IncidentListParams): Promise<Incident[]> {
+    return this.collectPages<Incident>('/incidents/', toSearchParams(params));
   }
 
-  async getIncident(id: number): Promise<Incident> {
-    return this.request<Incident>(`/incidents/${id}/`);
+  async getIncident(id: number | string, incidentType?: 'hardware' | 'software'): Promise<Incident> {
+    // Numeric ids need the type: hardware and software ids overlap
+    const query = incidentType && typeof id === 'number' ? `?type=${incidentType}` : '';
+    return this.request<Incident>(`/incidents/${id}/${query}`);
   }
 
   async createIncident(incidentData: Omit<Incident, 'id' | 'created_at' | 'updated_at'>): Promise<Incident> {
@@ -461,8 +602,9 @@ class ApiClient {
     });
   }
 
-  async deleteIncident(id: number): Promise<void> {
-    await this.request(`/incidents/${id}/`, {
+  async deleteIncident(id: number | string, incidentType?: 'hardware' | 'software'): Promise<void> {
+    const query = incidentType && typeof id === 'number' ? `?type=${incidentType}` : '';
+    await this.request(`/incidents/${id}/${query}`, {
       method: 'DELETE',
     });
   }
@@ -475,6 +617,19 @@ class ApiClient {
     return this.request<Incident[]>('/incidents/recent/');
   }
 
+  async getIncidentHistogram(params?: {
+    bucket?: 'hour' | 'day' | 'week' | 'month';
+    tz?: string;
+    from?: string;
+    to?: string;
+    partition?: string;
+  }): Promise<IncidentHistogram> {
+    const queryString = toSearchParams(params).toString();
+    return this.request<IncidentHistogram>(
+      queryString ? `/incidents/histogram/?${queryString}` : '/incidents/histogram/'
+    );
+  }
+
   // ========================================================================
   // Report Methods
   // ========================================================================
@@ -483,10 +638,8 @@ class ApiClient {
     const searchParams = new URLSearchParams();
     if (params?.incident) searchParams.set('incident', params.incident.toString());
     
-    const queryString = searchParams.toString();
-    const endpoint = queryString ? `/reports/?${queryString}` : '/reports/';
-    
-    return this.request<{ results: Report[]; count: number }>(endpoint);
+    const results = await this.collectPages<Report>('/reports/', searchParams);
+    return { results, count: results.length };
   }
 
   async getReport(id: number): Promise<Report> {
@@ -517,13 +670,20 @@ class ApiClient {
   // Equipment Methods
   // ========================================================================
   
-  async getEquipment(params?: { num_serie?: string; search_serie?: string }): Promise<{ results: Equipment[]; count: number } | Equipment | { results: string[]; count: number }> {
+  async getEquipment(params?: { num_serie?: string; search_serie?: string; sort?: string }): Promise<{ results: Equipment[]; count: number } | Equipment | { results: string[]; count: number }> {
     const searchParams = new URLSearchParams();
     if (params?.num_serie) searchParams.set('num_serie', params.num_serie);
     if (params?.search_serie) searchParams.set('search_serie', params.search_serie);
+    if (params?.sort) searchParams.set('sort', params.sort);
+    
+    if (!params?.num_serie && !params?.search_serie) {
+      // The full list comes one page at a time
+      const results = await this.collectPages<Equipment>('/equipement/', searchParams);
+      return { results, count: results.length };
+    }
     
     const queryString = searchParams.toString();
-    const endpoint = queryString ? `/equipement/?${queryString}` : '/equipement/';
+    const endpoint = `/equipement/?${queryString}`;
     
     return this.request<{ results: Equipment[]; count: number } | Equipment | { results: string[]; count: number }>(endpoint);
   }
@@ -552,8 +712,63 @@ class ApiClient {
     });
   }
 
-  async getEquipmentHistory(id: number): Promise<{ equipment: Equipment; incidents: Incident[]; count: number }> {
-    return this.request<{ equipment: Equipment; incidents: Incident[]; count: number }>(`/equipement/${id}/history/`);
+  async getEquipmentHistory(id: number, next?: string | null): Promise<EquipmentHistoryPage> {
+    // Cursor-paginated: the first page carries the total, later pages follow `next`
+    const cursor = cursorOf(next ?? null);
+    const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '?count=exact';
+    return this.request<EquipmentHistoryPage>(`/equipement/${id}/history/${query}`);
+  }
+
+  // ========================================================================
+  // Analytics Methods (aggregated server-side)
+  // ========================================================================
+
+  private getAnalytics<T>(name: string, params?: object): Promise<T> {
+    const queryString = toSearchParams(params).toString();
+    return this.request<T>(queryString ? `/analytics/${name}/?${queryString}` : `/analytics/${name}/`);
+  }
+
+  async getAnalyticsYears(): Promise<number[]> {
+    return this.getAnalytics<number[]>('years');
+  }
+
+  async getAnalyticsSummary(params?: AnalyticsParams): Promise<AnalyticsSummary> {
+    return this.getAnalytics<AnalyticsSummary>('summary', params);
+  }
+
+  async getIncidentsByDay(params?: AnalyticsParams): Promise<Array<Omit<PeriodCounts, 'period'> & { date: string }>> {
+    return this.getAnalytics<Array<Omit<PeriodCounts, 'period'> & { date: string }>>('by-day', params);
+  }
+
+  async getIncidentsByPeriod(params?: AnalyticsParams): Promise<PeriodCounts[]> {
+    return this.getAnalytics<PeriodCounts[]>('by-period', params);
+  }
+
+  async getMonthlyTrend(params?: AnalyticsParams): Promise<PeriodCounts[]> {
+    return this.getAnalytics<PeriodCounts[]>('monthly-trend', params);
+  }
+
+  async getIncidentsByEquipment(params?: AnalyticsParams): Promise<NamedCount[]> {
+    return this.getAnalytics<NamedCount[]>('by-equipment', params);
+  }
+
+  async getSoftwareIncidentsByAnomaly(params?: AnalyticsParams): Promise<SoftwareAnomalyAnalytics> {
+    return this.getAnalytics<SoftwareAnomalyAnalytics>('software-by-anomaly', params);
+  }
+
+  async getIncidentPivot(params?: AnalyticsParams & {
+    rows?: 'partition' | 'server' | 'nom_radar';
+    incident_type?: 'hardware' | 'software';
+  }): Promise<IncidentPivot> {
+    return this.getAnalytics<IncidentPivot>('pivot', params);
+  }
+
+  async getCorrectiveIncidentsByYear(params?: AnalyticsParams): Promise<Array<{ year: number; count: number }>> {
+    return this.getAnalytics<Array<{ year: number; count: number }>>('corrective-by-year', params);
+  }
+
+  async getCorrectiveIncidentsByServer(params?: AnalyticsParams): Promise<Array<{ server: string; count: number }>> {
+    return this.getAnalytics<Array<{ server: string; count: number }>>('corrective-by-server', params);
   }
 
   // ========================================================================
@@ -561,7 +776,8 @@ class ApiClient {
   // ========================================================================
   
   async getUsers(): Promise<{ results: User[]; count: number }> {
-    return this.request<{ results: User[]; count: number }>('/users/');
+    const results = await this.collectPages<User>('/users/');
+    return { results, count: results.length };
   }
 
   async getUser(id: number): Promise<User> {